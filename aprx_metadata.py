@@ -10,8 +10,31 @@
 #
 # NOTES
 #   1) This script is designed to be run as an ArcGIS Pro Toolbox Script.
-#   2) There is one optional argument:
+#   2) There are eight optional arguments:
 #       - Output CSV directory
+#       - Columns to compute, as a semicolon-delimited list or a JSON
+#         config file (see scan_config.py). Default is all columns.
+#       - JSON config file with layer exclusion rules (see scan_config.py),
+#         per-host I/O limits (see host_limits.py), raster statistics
+#         options (see raster_stats.py), and optional feature layer profiling
+#         (see layer_profile.py). Default excludes World_Imagery layers.
+#       - Semicolon-delimited search root directories used to suggest repair
+#         paths for broken layers (see repair_index.py).
+#       - Repair index database path. Default is repair_index.sqlite in the
+#         user's home directory.
+#       - Data source usage index database path (see usage_index.py). Each
+#         scan replaces this project's rows in the index.
+#       - Output format: CSV (default, one row per layer and mapframe),
+#         CSV_TABLES (normalized projects, maps, mapframes, layers, and
+#         fields CSVs), SQLITE (the same tables loaded into
+#         scan_inventory.sqlite in the output directory), PARQUET, or ARROW
+#         (typed columnar versions of the CSV output, which require pyarrow),
+#         or GPKG (each layer's extent as a polygon with the layer's
+#         attributes, in scan_extents.gpkg in the output directory).
+#       - Seconds to wait for the server of each layer's data source to
+#         respond before its ListFields, Describe, and Raster calls (see
+#         source_watchdog.py). Default is 30. Layers whose server does not
+#         respond are marked in the probeStatus column.
 #   3) The output CSV file is given same name as the input APRX file.
 #
 # HISTORY
@@ -22,12 +45,41 @@
 #                   Update function docstrings. CG.
 # =========================================================================
 
-import csv
 import datetime
+import functools
 import getpass
+import json
 import os
-import re
 import sys
+from collections import ChainMap
+from types import MappingProxyType
+
+from scan_config import ExclusionRules, parse_columns, wants
+from repair_index import open_index
+from scan_output import (
+    COLUMNAR_FORMATS,
+    EXTENTS_GPKG,
+    INVENTORY_DB,
+    GeoPackageWriter,
+    StringPool,
+    TableKey,
+    output_name,
+    split_fields,
+    write_columnar,
+    write_csv,
+    write_csv_tables,
+    write_sqlite,
+)
+from scan_engine import (
+    ScanContext,
+    describe_dataset,
+    iter_layers,
+    raster_properties,
+    spatial_reference,
+)
+from source_health import SourceHealth
+from source_watchdog import STATUS_OK, TIMEOUT
+from usage_index import record_usage
 
 # Check if ArcGIS License can be utilized for ArcPy
 # This shouldnt be an issue since the user will already have ArcGIS Pro open.
@@ -40,6 +92,71 @@ OS_USER = getpass.getuser()
 USER = "".join([i for i in OS_USER if not i.isdigit()])
 RUN_TIME = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S %p")
 
+# Layers excluded when no exclusion rules are configured.
+DEFAULT_EXCLUSIONS = {"longName": [r"World_Imagery\\"]}
+# Output columns produced by each group of arcpy calls. A group is skipped
+# when none of its columns are selected.
+EXTENT_COLUMNS = ["XMax", "XMin", "YMax", "YMin"]
+SPATIAL_COLUMNS = [
+    "coordType",
+    "GCSCode",
+    "GCSName",
+    "PCSCode",
+    "PCSName",
+    "linearUnitName",
+    "spheroidName",
+]
+DESCRIBE_COLUMNS = (
+    ["dataType", "datasetType", "hasZ"]
+    + ["layer" + col for col in EXTENT_COLUMNS]
+    + ["layer" + col for col in SPATIAL_COLUMNS]
+)
+# Columns needed to write layer footprints to a GeoPackage.
+FOOTPRINT_COLUMNS = ["layer" + col for col in EXTENT_COLUMNS] + [
+    "layerGCSCode",
+    "layerPCSCode",
+    "layercoordType",
+]
+HEALTH_COLUMNS = ["dataSourceExists", "dataSourceSize", "dataSourceModified"]
+# Keys of the normalized output tables.
+TABLE_KEYS = [
+    TableKey("projects", "project_id", [], "filePath"),
+    TableKey("maps", "map_id", [("project_id", "projects")], None),
+    TableKey(
+        "mapframes",
+        "mapframe_id",
+        [("project_id", "projects"), ("map_id", "maps")],
+        None,
+    ),
+    TableKey("layers", "layer_id", [("map_id", "maps")], None),
+    TableKey("fields", "field_id", [("layer_id", "layers")], None),
+]
+RASTER_COLUMNS = [
+    "bandCount",
+    "format",
+    "compressionType",
+    "bandNames",
+    "height",
+    "width",
+    "minimum",
+    "maximum",
+    "mean",
+    "nodataFraction",
+]
+# Columns filled by the optional layer profile (see layer_profile.py).
+PROFILE_COLUMNS = ["rowCount", "fieldProfile"]
+# Raster columns read from stored statistics, or computed block by block.
+STATISTICS_COLUMNS = ["minimum", "maximum", "mean", "nodataFraction"]
+# Columns added after the original output layout. They are written after
+# the original columns, so that readers of earlier outputs keep their
+# column positions.
+ADDED_COLUMNS = (
+    ["probeStatus", "repairCandidates"]
+    + HEALTH_COLUMNS
+    + PROFILE_COLUMNS
+    + ["nodataFraction"]
+)
+
 
 def spatialExtent(obj: dict) -> dict:
     """Return spatial boundary for a map object
@@ -63,15 +180,8 @@ def spatialSystem(obj: dict) -> dict:
     Returns:
         dict: compiled spatial details of interest
     """
-    return {
-        "coordType": obj.type,
-        "GCSCode": obj.GCSCode,
-        "GCSName": obj.GCSName,
-        "PCSCode": obj.PCSCode,
-        "PCSName": obj.PCSName,
-        "linearUnitName": obj.linearUnitName,
-        "spheroidName": obj.spheroidName,
-    }
+    sr = spatial_reference(obj)
+    return {key: sr[key] for key in SPATIAL_COLUMNS if key in sr}
 
 
 def dict_keys(obj: dict) -> list:
@@ -95,132 +205,248 @@ def flatten_dict(obj: dict) -> list:
     """Transform a nested dictionary into a 'flat'
     list of dictionaries, equivilant to a list of table rows.
 
+    Rows are ChainMaps over the layer dict and read-only views of the map
+    and project attributes, which are shared by every row instead of being
+    copied into each one.
+
     Args:
         obj (dict): Nested dictionary returned from the describe_data() method.
 
     Returns:
-        list: List of record dictionaries
+        list: List of record mappings
     """
     rows = []
-    desc = {key: val for (key, val) in obj.items() if type(val) != list}
+    desc = MappingProxyType(
+        {key: val for (key, val) in obj.items() if type(val) != list}
+    )
     for view in range(len(obj["maps"])):
-        map_desc = {
-            key: val for (key, val) in obj["maps"][view].items() if type(val) != list
-        }
-        for layer in range(len(obj["maps"][view]["layers"])):
-            layer_desc = {
-                key: val for (key, val) in obj["maps"][view]["layers"][layer].items()
-            }
-            rows.append({**desc, **map_desc, **layer_desc})
+        map_desc = MappingProxyType(
+            {key: val for (key, val) in obj["maps"][view].items() if type(val) != list}
+        )
+        for layer_desc in obj["maps"][view]["layers"]:
+            rows.append(ChainMap(layer_desc, map_desc, desc))
     return rows
 
 
-def describe_data(aprx: str) -> dict:
+def list_fields(l) -> dict:
+    """List the field names of a layer's data source.
+
+    Args:
+        l (Layer): Layer.
+
+    Returns:
+        dict: Layer attributes.
+    """
+    return {"fields": ";".join([f.name for f in arcpy.ListFields(l.dataSource)])}
+
+
+def describe_layer(l) -> dict:
+    """Describe a layer's data type, extent, and spatial reference.
+
+    Args:
+        l (Layer): Layer.
+
+    Returns:
+        dict: Layer attributes.
+    """
+    d = describe_dataset(arcpy.Describe(l))
+    lyr_data = {key: d[key] for key in ["dataType", "datasetType", "hasZ"] if key in d}
+    for group, keys in [
+        (d["extent"], EXTENT_COLUMNS),
+        (d["spatialReference"], SPATIAL_COLUMNS),
+    ]:
+        lyr_data.update({"layer" + key: group[key] for key in keys if key in group})
+    return lyr_data
+
+
+def describe_raster(l) -> dict:
+    """Describe the raster of a raster layer.
+
+    Args:
+        l (Layer): Raster layer.
+
+    Returns:
+        dict: Layer attributes.
+    """
+    r = raster_properties(arcpy.Raster(l.dataSource))
+    return {key: r[key] for key in RASTER_COLUMNS if key in r}
+
+
+def raster_statistics(l, raster_stats) -> dict:
+    """Read the stored statistics of a raster layer, or compute them.
+
+    Args:
+        l (Layer): Raster layer.
+        raster_stats (RasterStats): Raster statistics.
+
+    Returns:
+        dict: Layer attributes.
+    """
+    r = raster_stats.statistics(arcpy.Raster(l.dataSource), l.dataSource)
+    return {key: r[key] for key in STATISTICS_COLUMNS if key in r}
+
+
+def profile_layer(l, profiler) -> dict:
+    """Profile the table of a feature layer.
+
+    Args:
+        l (Layer): Feature layer.
+        profiler (LayerProfiler): Profiler.
+
+    Returns:
+        dict: Layer attributes. The field profile is JSON text.
+    """
+    profile = profiler.profile(l.dataSource)
+    return {
+        "rowCount": profile["rowCount"],
+        "fieldProfile": json.dumps(profile["fields"]),
+    }
+
+
+def describe_data(
+    aprx: str,
+    columns: set = None,
+    context: ScanContext = None,
+) -> dict:
     """Retrieve project, map, and layer attributes for a single APRX file.
 
     Args:
         aprx (str): APRX file path.
+        columns (set, optional): Columns to compute. Layer attributes that
+            are not selected are not read. Defaults to None (all columns).
+        context (ScanContext, optional): Exclusion rules, checked before any
+            attribute is read, and the repair index, watchdog, raster
+            statistics, and profiler used for each layer. Defaults to
+            DEFAULT_EXCLUSIONS and the default components.
 
     Returns:
         dict: Summary of metadata for maps in an APRX.
     """
+    if context is None:
+        context = ScanContext(ExclusionRules(DEFAULT_EXCLUSIONS))
     data = {}
     maps = []
+    strings = StringPool()
     for m in aprx.listMaps():
         arcpy.AddMessage(f"Compiling metadata for map: {m.name}")
         mapdata = {}
         mapdata["mapName"] = m.name
-        mapdata.update(spatialExtent(m.defaultCamera.getExtent()))
-        mapdata.update(spatialSystem(m.defaultCamera.getExtent().spatialReference))
+        if wants(columns, EXTENT_COLUMNS + SPATIAL_COLUMNS):
+            extent = m.defaultCamera.getExtent()
+            mapdata.update(spatialExtent(extent))
+            mapdata.update(spatialSystem(extent.spatialReference))
         lyrs = []
-        for l in m.listLayers():
+        for l in iter_layers(m.listLayers(), context.rules, groups=True):
             lyr_data = {}
             if l.supports("NAME"):
                 lyr_data["layerName"] = l.name
             else:
                 continue
-            if l.supports("LONGNAME"):
-                if re.search(r"World_Imagery\\", l.longName):
-                    continue
+            if l.supports("LONGNAME") and wants(columns, ["longName"]):
                 lyr_data["longName"] = l.longName
-            if l.supports("visible"):
+            if l.supports("visible") and wants(columns, ["visible"]):
                 lyr_data["visible"] = l.visible
-            lyr_data["isBroken"] = l.isBroken
-            if l.supports("DATASOURCE"):
+            if wants(columns, ["isBroken"]):
+                lyr_data["isBroken"] = l.isBroken
+            if l.supports("DATASOURCE") and wants(
+                columns, ["dataSource"] + HEALTH_COLUMNS
+            ):
                 lyr_data["dataSource"] = l.dataSource
-            lyr_data["isGroupLayer"] = l.isGroupLayer
-            lyr_data["isFeatureLayer"] = l.isFeatureLayer
-            lyr_data["isRasterLayer"] = l.isRasterLayer
-            lyr_data["isBasemapLayer"] = l.isBasemapLayer
-            lyr_data["isWebLayer"] = l.isWebLayer
-            if l.supports("DEFINITIONQUERY"):
+            for attr in [
+                "isGroupLayer",
+                "isFeatureLayer",
+                "isRasterLayer",
+                "isBasemapLayer",
+                "isWebLayer",
+            ]:
+                if wants(columns, [attr]):
+                    lyr_data[attr] = getattr(l, attr)
+            if l.supports("DEFINITIONQUERY") and wants(columns, ["definitionQuery"]):
                 lyr_data["definitionQuery"] = l.definitionQuery
-            if l.supports("DATASOURCE"):
+            # Each probe is only run if one of its columns is selected.
+            probes = []
+            if l.supports("DATASOURCE") and wants(columns, ["fields"]):
+                probes.append(list_fields)
+            if wants(columns, DESCRIBE_COLUMNS):
+                probes.append(describe_layer)
+            if l.isRasterLayer and wants(columns, RASTER_COLUMNS):
+                probes.append(describe_raster)
+            # Statistics and profiles read the whole raster or table, which
+            # can take longer than the probe deadline on a healthy server, so
+            # they run without it.
+            reads = []
+            if l.isRasterLayer and wants(columns, STATISTICS_COLUMNS):
+                reads.append(
+                    functools.partial(
+                        raster_statistics, raster_stats=context.raster_stats
+                    )
+                )
+            if (
+                context.profiler is not None
+                and l.isFeatureLayer
+                and l.supports("DATASOURCE")
+                and wants(columns, PROFILE_COLUMNS)
+            ):
+                reads.append(
+                    functools.partial(profile_layer, profiler=context.profiler)
+                )
+            source = l.dataSource if l.supports("DATASOURCE") else None
+            probe_status = STATUS_OK
+            for probe, call in [(p, context.probe) for p in probes] + [
+                (r, context.run) for r in reads
+            ]:
                 try:
-                    if l.supports("DATASOURCE"):
-                        lyr_data["fields"] = ";".join(
-                            [f.name for f in arcpy.ListFields(l.dataSource)]
-                        )
+                    values, probe_status = call(source, probe, l)
                 except Exception:
-                    pass
-            try:
-                d = arcpy.Describe(l)
-                if hasattr(d, "dataType"):
-                    lyr_data["dataType"] = d.dataType
-                if hasattr(d, "datasetType"):
-                    lyr_data["datasetType"] = d.datasetType
-                if hasattr(d, "hasZ"):
-                    lyr_data["hasZ"] = d.hasZ
-                if hasattr(d, "extent"):
-                    if d.extent:
-                        lyr_data.update(
-                            {
-                                "layer" + key: value
-                                for key, value in spatialExtent(d.extent).items()
-                            }
-                        )
-                if hasattr(d, "spatialReference"):
-                    if d.spatialReference:
-                        lyr_data.update(
-                            {
-                                "layer" + key: value
-                                for key, value in spatialSystem(
-                                    d.spatialReference
-                                ).items()
-                            }
-                        )
-            except Exception:
-                pass
-            try:
-                if l.isRasterLayer:
-                    r = arcpy.Raster(l.name)
-                    if hasattr(r, "bandCound"):
-                        lyr_data["bandCount"] = r.bandCount
-                    if hasattr(r, "format"):
-                        lyr_data["format"] = r.format
-                    if hasattr(r, "compressionType"):
-                        lyr_data["compressionType"] = r.compressionType
-                    if hasattr(r, "bandNames"):
-                        lyr_data["bandNames"] = r.bandNames
-                    if hasattr(r, "height"):
-                        lyr_data["height"] = r.height
-                    if hasattr(r, "width"):
-                        lyr_data["width"] = r.width
-                    if hasattr(r, "minimum"):
-                        lyr_data["minimum"] = r.minimum
-                    if hasattr(r, "maximum"):
-                        lyr_data["maximum"] = r.maximum
-                    if hasattr(r, "mean"):
-                        lyr_data["mean"] = r.maximum
-            except Exception:
-                pass
-            lyrs.append(lyr_data)
+                    continue
+                if probe_status != STATUS_OK:
+                    break
+                lyr_data.update(values)
+            if wants(columns, ["probeStatus"]):
+                lyr_data["probeStatus"] = probe_status
+            if (
+                context.repair is not None
+                and wants(columns, ["repairCandidates"])
+                and l.supports("DATASOURCE")
+                and l.isBroken
+            ):
+                lyr_data["repairCandidates"] = ";".join(
+                    context.repair.suggest(l.dataSource)
+                )
+            lyrs.append(strings.intern_row(lyr_data))
         mapdata["layers"] = lyrs
-        maps.append(mapdata)
+        maps.append(strings.intern_row(mapdata))
     data.update({"maps": maps})
     return data
 
 
+def source_health(rows: list, columns: set = None, health=None) -> None:
+    """Add the existence, size, and modified time of each layer data source
+    on disk to layer rows. Each data source directory is listed once.
+
+    Args:
+        rows (list): Layer dicts from describe_data().
+        columns (set, optional): Selected columns. The check is skipped if
+            none of HEALTH_COLUMNS are selected.
+        health (SourceHealth, optional): Directory listings of the scan run.
+            Defaults to a new SourceHealth.
+    """
+    if not wants(columns, HEALTH_COLUMNS):
+        return
+    arcpy.AddMessage("Checking data sources on disk")
+    results = (health or SourceHealth()).check([row.get("dataSource") for row in rows])
+    for row in rows:
+        result = results.get(row.get("dataSource"))
+        if result is not None:
+            row.update(
+                {
+                    "dataSourceExists": result["exists"],
+                    "dataSourceSize": result["size"],
+                    "dataSourceModified": result["modified"],
+                }
+            )
+
+
 def get_layouts(aprx: str) -> list:
     """Get a list of layouts in the APRX and their mapframe elements.
 
@@ -249,49 +475,172 @@ def get_layouts(aprx: str) -> list:
     return layouts
 
 
-def join_metadata(aprx: str, meta: dict, layouts: dict) -> list:
-    """Join metadata information together into a list of dict records.
+def project_info(aprx) -> dict:
+    """Get the project level attributes of an APRX.
 
     Args:
-        aprx (str): APRX path.
-        meta (dict): Metadata dict returned from describe_data()
-        layouts (dict): Layout dict returned from get_layouts()
+        aprx (ArcGISProject): Project.
 
     Returns:
-        list: List of dictionaries containing record rows.
+        dict: Project attributes.
     """
-    mapinfo = {
+    return {
         "homeFolder": aprx.homeFolder,
         "filePath": aprx.filePath,
         "defaultGeodatabase": aprx.defaultGeodatabase,
         "dateSaved": aprx.dateSaved.strftime("%Y-%m-%d %H:%M:%S"),
     }
-    rows = []
-    for row in meta:
-        inLayout = False
-        for lyt in layouts:
-            if row["mapName"] == lyt["mapName"]:
-                rows.append(
+
+
+def relational_tables(aprx, meta: dict, layouts: list) -> dict:
+    """Split metadata into normalized tables, so that project and map
+    attributes are stored once instead of on every layer row.
+
+    Args:
+        aprx (ArcGISProject): Project.
+        meta (dict): Metadata dict returned from describe_data()
+        layouts (list): Layout list returned from get_layouts()
+
+    Returns:
+        dict: Row dicts for each table in TABLE_KEYS, keyed by table name.
+    """
+    tables = {key.table: [] for key in TABLE_KEYS}
+    tables["projects"].append(
+        {
+            "project_id": 1,
+            **project_info(aprx),
+            "Script_User": USER,
+            "Script_Run_Time": RUN_TIME,
+        }
+    )
+    map_ids = {}
+    for mapdata in meta["maps"]:
+        map_id = len(tables["maps"]) + 1
+        map_ids.setdefault(mapdata["mapName"], map_id)
+        tables["maps"].append(
+            {
+                "map_id": map_id,
+                "project_id": 1,
+                **{k: v for k, v in mapdata.items() if k != "layers"},
+            }
+        )
+        for lyr in mapdata["layers"]:
+            layer_id = len(tables["layers"]) + 1
+            tables["layers"].append(
+                {
+                    "layer_id": layer_id,
+                    "map_id": map_id,
+                    **{
+                        k: v
+                        for k, v in lyr.items()
+                        if k not in ("fields", "fieldProfile")
+                    },
+                }
+            )
+            profile = json.loads(lyr.get("fieldProfile") or "{}")
+            for position, name in split_fields(lyr.get("fields")):
+                tables["fields"].append(
                     {
-                        **mapinfo,
-                        **{key: lyt[key] for key in lyt if key != "mapName"},
-                        **row,
+                        "field_id": len(tables["fields"]) + 1,
+                        "layer_id": layer_id,
+                        "position": position,
+                        "fieldName": name,
+                        **profile.get(name, {}),
                     }
                 )
+    for lyt in layouts:
+        tables["mapframes"].append(
+            {
+                "mapframe_id": len(tables["mapframes"]) + 1,
+                "project_id": 1,
+                "map_id": map_ids.get(lyt["mapName"]),
+                **{key: lyt[key] for key in lyt if key != "mapName"},
+            }
+        )
+    return tables
+
+
+def write_tables(
+    output_dir, tables: dict, aprx_path: str, output_format: str, name: str = None
+) -> list:
+    """Export normalized tables to CSV files or a SQLite inventory.
+
+    Args:
+        output_dir: Output directory.
+        tables (dict): Tables returned from relational_tables().
+        aprx_path (str): APRX file path.
+        output_format (str): CSV_TABLES or SQLITE.
+        name (str, optional): CSV file name prefix. Defaults to the APRX
+            name.
+
+    Returns:
+        list: Output files created.
+    """
+    arcpy.AddMessage("Generating output")
+    if not output_dir:
+        output_dir = os.path.dirname(aprx_path)
+    try:
+        if output_format == "SQLITE":
+            return [
+                write_sqlite(tables, TABLE_KEYS, os.path.join(output_dir, INVENTORY_DB))
+            ]
+        return write_csv_tables(tables, output_dir, name or output_name(aprx_path))
+    except Exception as e:
+        arcpy.AddError(e)
+        raise
+
+
+def join_metadata(aprx: str, meta: dict, layouts: dict) -> list:
+    """Join metadata information together into a list of dict records.
+
+    Args:
+        aprx (str): APRX path.
+        meta (dict): Metadata dict returned from describe_data()
+        layouts (dict): Layout dict returned from get_layouts()
+
+    Returns:
+        list: List of ChainMaps containing record rows. The project and
+            layout attributes are shared between rows.
+    """
+    mapinfo = MappingProxyType(project_info(aprx))
+    frames = [
+        (
+            lyt["mapName"],
+            MappingProxyType({key: lyt[key] for key in lyt if key != "mapName"}),
+        )
+        for lyt in layouts
+    ]
+    rows = []
+    for row in meta:
+        inLayout = False
+        for mapName, frame in frames:
+            if row["mapName"] == mapName:
+                rows.append(ChainMap(row, frame, mapinfo))
                 inLayout = True
         if not inLayout:
-            rows.append({**mapinfo, **row})
+            rows.append(ChainMap(row, mapinfo))
     return rows
 
 
-def write_output(output_dir, rows: list, cols: list, aprx_path: str) -> str:
-    """Export data to CSV file.
+def write_output(
+    output_dir,
+    rows: list,
+    cols: list,
+    aprx_path: str,
+    output_format: str = "CSV",
+    name: str = None,
+) -> str:
+    """Export data to CSV file, or to a Parquet or Arrow IPC file with typed
+    columns.
 
     Args:
         output_dir: Output directory.
-        rows (list): Data rows.
+        rows (list): Data rows, the ChainMaps returned from
+            join_metadata(). They are read as mappings and never copied.
         cols (list): Column headers.
         aprx_path (str): APRX file path.
+        output_format (str, optional): CSV, PARQUET, or ARROW. Defaults to CSV.
+        name (str, optional): Output file name. Defaults to the APRX name.
 
     Returns:
         str: Output file created.
@@ -301,60 +650,178 @@ def write_output(output_dir, rows: list, cols: list, aprx_path: str) -> str:
     for row in rows:
         row.update({"Script_User": USER, "Script_Run_Time": RUN_TIME})
 
-    aprxName = os.path.splitext(os.path.basename(aprx_path))[0]
+    aprxName = name or output_name(aprx_path)
+    extension = COLUMNAR_FORMATS.get(output_format, ".csv")
     if output_dir is None or output_dir == "":
-        output_path = os.path.join(os.path.dirname(aprx_path), f"{aprxName}.csv")
+        output_path = os.path.join(os.path.dirname(aprx_path), f"{aprxName}{extension}")
     else:
-        output_path = os.path.join(output_dir, f"{aprxName}.csv")
-    if os.path.exists(output_path):
+        output_path = os.path.join(output_dir, f"{aprxName}{extension}")
+    if output_format in COLUMNAR_FORMATS:
         try:
-            os.remove(output_path)
+            return write_columnar(rows, cols, output_path, output_format)
         except Exception as e:
             arcpy.AddError(e)
             raise
     try:
-        with open(output_path, "w", newline="") as f:
-            writer = csv.writer(
-                f, delimiter=",", quotechar='"', quoting=csv.QUOTE_MINIMAL
-            )
-            writer.writerow(cols)
-            for row in rows:
-                r = []
-                for col in cols:
-                    if col in row:
-                        r.append(str(row[col]))
-                    else:
-                        r.append(None)
-                writer.writerow(r)
+        return write_csv(rows, cols, output_path)
     except Exception as e:
         arcpy.AddError(e)
         raise
+
+
+def srs_definition(code: int) -> tuple:
+    """Get the name and WKT definition of a coordinate system.
+
+    Args:
+        code (int): Coordinate system factory code (WKID).
+
+    Returns:
+        tuple: (name, WKT).
+    """
+    sr = arcpy.SpatialReference(code)
+    # exportToString() appends the XY, Z, and M domains after the WKT.
+    return sr.name, sr.exportToString().split(";")[0]
+
+
+def write_footprints(output_dir, meta: list, aprx_path: str) -> str:
+    """Write each layer's extent as a polygon feature, with the layer's
+    attributes, to the GeoPackage in the output directory. This project's
+    existing features are replaced.
+
+    Args:
+        output_dir: Output directory.
+        meta (list): Rows returned from flatten_dict().
+        aprx_path (str): APRX file path.
+
+    Returns:
+        str: Output file created.
+    """
+    arcpy.AddMessage("Generating output")
+    if not output_dir:
+        output_dir = os.path.dirname(aprx_path)
+    output_path = os.path.join(output_dir, EXTENTS_GPKG)
+    skipped = 0
+    try:
+        with GeoPackageWriter(output_path, srs_definition) as gpkg:
+            gpkg.replace("filePath", aprx_path)
+            for row in meta:
+                attributes = {"filePath": aprx_path, "mapName": row["mapName"]}
+                attributes.update(row.maps[0])
+                extent = [
+                    row.get("layer" + col) for col in ["XMin", "YMin", "XMax", "YMax"]
+                ]
+                srs_id = row.get("layerPCSCode") or row.get("layerGCSCode")
+                if not srs_id:
+                    # Undefined geographic (0) or Cartesian (-1) system.
+                    srs_id = 0 if row.get("layercoordType") == "Geographic" else -1
+                if not gpkg.write(srs_id, extent, attributes):
+                    skipped += 1
+    except Exception as e:
+        arcpy.AddError(e)
+        raise
+    if skipped:
+        arcpy.AddMessage(f"Skipped {skipped} layer(s) without an extent")
     return output_path
 
 
-def main(aprx, output_dir):
-    """Main function"""
+def main(
+    aprx,
+    output_dir,
+    columns=None,
+    context=None,
+    usage_path=None,
+    output_format="CSV",
+    unique_names=False,
+) -> list:
+    """Main function
+
+    Args:
+        aprx (ArcGISProject): Project.
+        output_dir: Output directory.
+        columns (set, optional): Columns to compute. Defaults to None (all
+            columns).
+        context (ScanContext, optional): Scan components. Defaults to
+            DEFAULT_EXCLUSIONS and the default components.
+        usage_path (str, optional): Usage index database path. Defaults to
+            None (not recorded).
+        output_format (str, optional): Output format. Defaults to CSV.
+        unique_names (bool, optional): Add a hash of the APRX path to the
+            output file names (see scan_output.output_name()). Defaults to
+            False.
+
+    Returns:
+        list: Output files created.
+    """
     aprx_path = aprx.filePath
+    name = output_name(aprx_path, unique_names)
     arcpy.AddMessage(
         f"Started at {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S %p')}"
     )
     arcpy.AddMessage(f"APRX: {aprx_path}")
-    meta = describe_data(aprx)
-    meta = flatten_dict(meta)
+    if context is None:
+        context = ScanContext(ExclusionRules(DEFAULT_EXCLUSIONS))
+    meta = describe_data(aprx, columns, context)
+    source_health(
+        [lyr for m in meta["maps"] for lyr in m["layers"]], columns, context.health
+    )
+    for line in context.summary():
+        arcpy.AddMessage(line)
     layouts = get_layouts(aprx)
-    rows = join_metadata(aprx, meta, layouts)
-    cols = dict_keys(rows)
-    output_path = write_output(output_dir, rows, cols, aprx_path)
-    arcpy.AddMessage(f"Output created: {output_path}")
+    if output_format in ("CSV_TABLES", "SQLITE"):
+        tables = relational_tables(aprx, meta, layouts)
+    meta = flatten_dict(meta)
+    if usage_path:
+        count = record_usage(
+            usage_path,
+            aprx_path,
+            [
+                (row.get("mapName"), row.get("layerName"), row.get("dataSource"))
+                for row in meta
+            ],
+        )
+        arcpy.AddMessage(f"Recorded {count} data source(s) in usage index")
+    if output_format in ("CSV_TABLES", "SQLITE"):
+        outputs = write_tables(output_dir, tables, aprx_path, output_format, name)
+    elif output_format == "GPKG":
+        outputs = [write_footprints(output_dir, meta, aprx_path)]
+    else:
+        rows = join_metadata(aprx, meta, layouts)
+        cols = dict_keys(rows)
+        cols = [col for col in cols if col not in ADDED_COLUMNS] + [
+            col for col in ADDED_COLUMNS if col in cols
+        ]
+        outputs = [write_output(output_dir, rows, cols, aprx_path, output_format, name)]
+    for output_path in outputs:
+        arcpy.AddMessage(f"Output created: {output_path}")
     arcpy.AddMessage(
         f"Completed at {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S %p')}"
     )
+    return outputs
 
 
 if __name__ == "__main__":
     output_dir = arcpy.GetParameterAsText(0)
+    columns = parse_columns(arcpy.GetParameterAsText(1))
     try:
         aprx = arcpy.mp.ArcGISProject("CURRENT")
     except Exception:
         raise
-    main(aprx, output_dir)
+    usage_path = arcpy.GetParameterAsText(5)
+    if usage_path and columns is not None:
+        columns.add("dataSource")
+    output_format = arcpy.GetParameterAsText(6) or "CSV"
+    if output_format == "GPKG" and columns is not None:
+        columns.update(FOOTPRINT_COLUMNS)
+    repair = None
+    if wants(columns, ["repairCandidates"]):
+        repair = open_index(arcpy.GetParameterAsText(3), arcpy.GetParameterAsText(4))
+    context = ScanContext.from_value(
+        arcpy.GetParameterAsText(2),
+        DEFAULT_EXCLUSIONS,
+        float(arcpy.GetParameterAsText(7) or TIMEOUT),
+        repair,
+    )
+    try:
+        main(aprx, output_dir, columns, context, usage_path, output_format)
+    finally:
+        context.close()
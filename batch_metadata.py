@@ -0,0 +1,260 @@
+# PURPOSE
+#   Scan every APRX (ArcGIS Pro) or MXD (ArcMap) under a folder with
+#   aprx_metadata.py or mxd_metadata.py, checkpointing each completed
+#   project to a local journal so that an interrupted batch can resume.
+#
+# NOTES
+#   1) This script is designed to be run as an ArcGIS Pro or ArcMap Toolbox
+#      Script, and must stay compatible with Python 2.7 and 3. APRX files
+#      are scanned under ArcGIS Pro and MXD files under ArcMap.
+#   2) Arguments:
+#       - Folder to search, or semicolon-delimited project paths
+#       - Output directory
+#       - *Job id. Rerunning with the same job id skips the projects that
+#         were completed and scans only the remaining ones. Default is a new
+#         job id based on the current time, which is reported at the start.
+#       - *Journal database path. Default is scan_journal.sqlite in the
+#         user's home directory.
+#       - *Columns to compute (see scan_config.py).
+#       - *JSON config file with layer exclusion rules (see scan_config.py)
+#         and the other scanner options (see scan_engine.py).
+#       - *Output format (CSV, CSV_TABLES, SQLITE, PARQUET, ARROW, or
+#         GPKG).
+#   3) A project is recorded as done only after its output has been moved
+#      into place, and outputs are written atomically (see scan_output.py),
+#      so a crash leaves either a complete output or none.
+#   4) Projects that fail are recorded with the error and retried on the
+#      next run of the job.
+#   5) Projects with the same name can sit in different folders, so each
+#      project's output files are named with a short hash of its full path
+#      (see scan_output.output_name()).
+#   6) One scan context is shared by every project of the batch, so per-host
+#      limits, blacklisted hosts, raster statistics, and profiles carry over
+#      from one project to the next.
+#
+# HISTORY
+#   DATE            REVISION
+#   ----------      -------------------------------------------------------
+#   2026-10-19      Created.
+# =========================================================================
+
+import datetime
+import os
+import sqlite3
+import sys
+
+from scan_config import parse_columns
+from scan_engine import ScanContext
+
+try:
+    import arcpy
+except RuntimeError as e:
+    print("RuntimeError:", e)
+    sys.exit()
+
+DEFAULT_JOURNAL = os.path.join(os.path.expanduser("~"), "scan_journal.sqlite")
+
+
+class ScanJournal(object):
+    """Journal of the projects completed by a batch scan job.
+
+    Args:
+        path (str): SQLite database path. Created if it does not exist.
+        job_id (str): Batch job id.
+    """
+
+    def __init__(self, path, job_id):
+        self.job_id = job_id
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS journal ("
+            "job_id TEXT NOT NULL, "
+            "project TEXT NOT NULL, "
+            "status TEXT NOT NULL, "
+            "outputs TEXT, "
+            "error TEXT, "
+            "finished TEXT NOT NULL, "
+            "PRIMARY KEY (job_id, project))"
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def completed(self):
+        """Get the projects this job has already completed.
+
+        Returns:
+            set: Project paths.
+        """
+        return set(
+            r[0]
+            for r in self.conn.execute(
+                "SELECT project FROM journal WHERE job_id = ? AND status = 'done'",
+                (self.job_id,),
+            )
+        )
+
+    def record(self, project, outputs=None, error=None):
+        """Checkpoint the result of one project.
+
+        Args:
+            project (str): Project path.
+            outputs (list, optional): Output files created.
+            error (str, optional): Error message if the scan failed.
+        """
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO journal "
+                "(job_id, project, status, outputs, error, finished) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self.job_id,
+                    project,
+                    "failed" if error else "done",
+                    ";".join(outputs or []),
+                    error,
+                    datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                ),
+            )
+
+
+def find_projects(value, extension):
+    """Find the projects to scan.
+
+    Args:
+        value (str): Folder to search recursively, or semicolon-delimited
+            project paths.
+        extension (str): Project file extension (".aprx" or ".mxd").
+
+    Returns:
+        list: Sorted project paths.
+    """
+    if os.path.isdir(value):
+        projects = []
+        for dirpath, dirnames, filenames in os.walk(value):
+            for name in filenames:
+                if name.lower().endswith(extension):
+                    projects.append(os.path.join(dirpath, name))
+        return sorted(projects)
+    return sorted(
+        path.strip()
+        for path in value.split(";")
+        if path.strip().lower().endswith(extension)
+    )
+
+
+def scan_aprx(path, output_dir, columns, context, output_format):
+    """Scan one APRX with aprx_metadata.py (ArcGIS Pro).
+
+    Returns:
+        list: Output files created.
+    """
+    import aprx_metadata
+
+    aprx = arcpy.mp.ArcGISProject(path)
+    try:
+        return aprx_metadata.main(
+            aprx,
+            output_dir,
+            columns,
+            context,
+            output_format=output_format,
+            unique_names=True,
+        )
+    finally:
+        del aprx
+
+
+def scan_mxd(path, output_dir, columns, context, output_format):
+    """Scan one MXD with mxd_metadata.py (ArcMap).
+
+    Returns:
+        list: Output files created.
+    """
+    import mxd_metadata
+
+    mxd = arcpy.mapping.MapDocument(path)
+    try:
+        meta = mxd_metadata.mainFunction(mxd, columns, context)
+        return mxd_metadata.export(
+            path, meta, output_dir, columns, output_format, unique_names=True
+        )
+    finally:
+        del mxd
+
+
+def main(
+    value,
+    output_dir,
+    job_id,
+    journal_path=None,
+    columns=None,
+    config=None,
+    output_format="CSV",
+):
+    """Scan the projects of a batch job that are not yet completed.
+
+    Returns:
+        dict: Number of projects 'done', 'skipped', and 'failed'.
+    """
+    if hasattr(arcpy, "mp"):
+        import aprx_metadata as scanner
+
+        extension, scan = ".aprx", scan_aprx
+    else:
+        import mxd_metadata as scanner
+
+        extension, scan = ".mxd", scan_mxd
+    if output_format == "GPKG" and columns is not None:
+        columns = set(columns) | set(scanner.FOOTPRINT_COLUMNS)
+    context = ScanContext.from_value(config, scanner.DEFAULT_EXCLUSIONS)
+    journal = ScanJournal(journal_path or DEFAULT_JOURNAL, job_id)
+    counts = {"done": 0, "skipped": 0, "failed": 0}
+    try:
+        completed = journal.completed()
+        projects = find_projects(value, extension)
+        arcpy.AddMessage(
+            "Job {}: {} project(s), {} already completed".format(
+                job_id,
+                len(projects),
+                len([p for p in projects if p in completed]),
+            )
+        )
+        for project in projects:
+            if project in completed:
+                counts["skipped"] += 1
+                continue
+            try:
+                outputs = scan(project, output_dir, columns, context, output_format)
+            except Exception as e:
+                arcpy.AddWarning("Failed to scan {}: {}".format(project, e))
+                journal.record(project, error=str(e))
+                counts["failed"] += 1
+                continue
+            journal.record(project, outputs)
+            counts["done"] += 1
+    finally:
+        journal.close()
+        context.close()
+    arcpy.AddMessage(
+        "Job {}: {done} done, {skipped} skipped, {failed} failed".format(
+            job_id, **counts
+        )
+    )
+    return counts
+
+
+if __name__ == "__main__":
+    job_id = arcpy.GetParameterAsText(2)
+    if not job_id:
+        job_id = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+    main(
+        arcpy.GetParameterAsText(0),
+        arcpy.GetParameterAsText(1),
+        job_id,
+        arcpy.GetParameterAsText(3),
+        parse_columns(arcpy.GetParameterAsText(4)),
+        arcpy.GetParameterAsText(5),
+        arcpy.GetParameterAsText(6) or "CSV",
+    )
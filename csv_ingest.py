@@ -0,0 +1,496 @@
+# PURPOSE
+#   Helpers for locating, reading, and validating CSV files ahead of an
+#   import with import_csv.py.
+#
+# NOTES
+#   1) This module does not import arcpy so that its functions can be run
+#      in worker processes. The workers are started with spawn, which also
+#      imports the main script again as __mp_main__, so import_csv.py skips
+#      its arcpy import in that case.
+#
+# HISTORY
+#   DATE            REVISION
+#   ----------      -------------------------------------------------------
+#   2026-10-19      Created.
+# =========================================================================
+
+import bz2
+import csv
+import glob
+import gzip
+import hashlib
+import io
+import lzma
+import math
+import os
+import re
+import sqlite3
+import zipfile
+from datetime import datetime
+
+# Compressed CSV files are read as streams with the matching opener.
+COMPRESSED_OPENERS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+CSV_EXTENSIONS = (".csv",) + tuple(f".csv{ext}" for ext in COMPRESSED_OPENERS)
+# CSV members of a zip archive are addressed as <archive>.zip/<member>.csv
+ZIP_MEMBER = re.compile(r"^(?P<archive>.+?\.zip)[\\/](?P<member>.+)$", re.IGNORECASE)
+SAMPLE_ROWS = 10000
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%m/%d/%Y",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %I:%M:%S %p",
+)
+# Field types ordered from narrowest to widest. A column is widened to the
+# next type that can hold every value seen.
+FIELD_TYPES = ("SHORT", "LONG", "DOUBLE", "DATE", "TEXT")
+ROW_HASH_SIZE = 8
+# Plain decimal numbers. Values with leading zeros (identifiers such as zip
+# codes), digit separators, or non-finite words such as "nan" and "inf" are
+# not treated as numbers.
+NUMBER = re.compile(r"^[+-]?((0|[1-9][0-9]*)(\.[0-9]*)?|\.[0-9]+)([eE][+-]?[0-9]+)?$")
+INTEGER = re.compile(r"^[+-]?(0|[1-9][0-9]*)$")
+SHORT_RANGE = (-(2**15), 2**15 - 1)
+LONG_RANGE = (-(2**31), 2**31 - 1)
+
+
+def expand_inputs(in_path: str) -> list:
+    """Resolve a CSV input into a list of CSV file paths.
+
+    Args:
+        in_path (str): A CSV file, a folder containing CSV files, a glob
+            pattern, or a semicolon-delimited list of any of these (the
+            format used by multivalue toolbox parameters).
+
+    Returns:
+        list: Sorted, de-duplicated list of CSV file paths.
+    """
+    paths = []
+    for item in in_path.split(";"):
+        item = item.strip().strip("'\"")
+        if item == "":
+            continue
+        if os.path.isdir(item):
+            candidates = [os.path.join(item, name) for name in os.listdir(item)]
+        elif glob.has_magic(item):
+            candidates = glob.glob(item)
+        else:
+            candidates = [item]
+        # Zip archives are replaced by their CSV members.
+        members = []
+        for path in candidates:
+            if path.lower().endswith(".zip") and zipfile.is_zipfile(path):
+                members.extend(zip_members(path))
+            else:
+                members.append(path)
+        for path in members:
+            if is_csv(path) and exists(path) and path not in paths:
+                paths.append(path)
+    return sorted(paths)
+
+
+def zip_members(archive: str) -> list:
+    """List the CSV members of a zip archive as <archive>/<member> paths.
+
+    Args:
+        archive (str): Zip file path.
+
+    Returns:
+        list: CSV member paths.
+    """
+    with zipfile.ZipFile(archive) as z:
+        return [
+            f"{archive}/{name}"
+            for name in z.namelist()
+            if name.lower().endswith(".csv")
+        ]
+
+
+def exists(path: str) -> bool:
+    """Check that a CSV file, or a CSV member of a zip archive, exists.
+
+    Args:
+        path (str): File path or <archive>.zip/<member> path.
+
+    Returns:
+        bool: True if the file or member exists.
+    """
+    if os.path.isfile(path):
+        return True
+    match = ZIP_MEMBER.match(path)
+    if match is None or not os.path.isfile(match["archive"]):
+        return False
+    with zipfile.ZipFile(match["archive"]) as z:
+        return match["member"] in z.namelist()
+
+
+def is_compressed(path: str) -> bool:
+    """Check whether a CSV path is compressed or a zip archive member.
+
+    Args:
+        path (str): File path.
+
+    Returns:
+        bool: True if the file has to be decompressed to be read.
+    """
+    if os.path.splitext(path)[-1].lower() in COMPRESSED_OPENERS:
+        return True
+    return not os.path.isfile(path) and ZIP_MEMBER.match(path) is not None
+
+
+def is_csv(path: str) -> bool:
+    """Check whether a path has a supported CSV file extension.
+
+    Args:
+        path (str): File path.
+
+    Returns:
+        bool: True if the file extension is supported.
+    """
+    return path.lower().endswith(CSV_EXTENSIONS)
+
+
+def open_csv(path: str):
+    """Open a CSV file for reading. Files compressed with gzip, bz2, or xz
+    and CSV members of zip archives are decompressed as a stream. Plain
+    files are read with open(), whose buffered reader already decodes and
+    splits lines in large blocks, so a memory map saves nothing for
+    csv.reader(), which needs decoded text.
+
+    Args:
+        path (str): CSV file path, or <archive>.zip/<member> path.
+
+    Returns:
+        file: Text file object suitable for csv.reader().
+    """
+    ext = os.path.splitext(path)[-1].lower()
+    if ext in COMPRESSED_OPENERS:
+        return COMPRESSED_OPENERS[ext](path, "rt", newline="", encoding="utf-8-sig")
+    match = ZIP_MEMBER.match(path)
+    if not os.path.isfile(path) and match is not None:
+        # The member stream keeps the archive file open after the ZipFile
+        # itself is closed.
+        with zipfile.ZipFile(match["archive"]) as z:
+            return io.TextIOWrapper(
+                z.open(match["member"]), encoding="utf-8-sig", newline=""
+            )
+    return open(path, "r", newline="", encoding="utf-8-sig")
+
+
+def read_header(path: str) -> list:
+    """Read the column names from the first line of a CSV file.
+
+    Args:
+        path (str): CSV file path.
+
+    Returns:
+        list: Column names. Empty if the file has no header.
+    """
+    with open_csv(path) as f:
+        return next(csv.reader(f), [])
+
+
+def validate_csv(path: str, x_field: str, y_field: str) -> dict:
+    """Check that a CSV file can be imported as points.
+
+    The file is read in full to count rows and rows where either
+    coordinate is missing or not numeric.
+
+    Args:
+        path (str): CSV file path.
+        x_field (str): Name of the X coordinate column.
+        y_field (str): Name of the Y coordinate column.
+
+    Returns:
+        dict: Validation summary with keys 'path', 'rows', 'badCoords',
+            and 'error'. 'error' is None when the file can be imported.
+    """
+    result = {"path": path, "rows": 0, "badCoords": 0, "error": None}
+    try:
+        with open_csv(path) as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            missing = [fld for fld in (x_field, y_field) if fld not in header]
+            if missing:
+                result["error"] = f"Missing coordinate column(s): {', '.join(missing)}"
+                return result
+            x_idx = header.index(x_field)
+            y_idx = header.index(y_field)
+            for row in reader:
+                if not row:
+                    continue
+                result["rows"] += 1
+                try:
+                    float(row[x_idx])
+                    float(row[y_idx])
+                except (IndexError, ValueError):
+                    result["badCoords"] += 1
+    except (
+        OSError,
+        EOFError,
+        UnicodeDecodeError,
+        csv.Error,
+        lzma.LZMAError,
+        zipfile.BadZipFile,
+    ) as e:
+        result["error"] = str(e)
+        return result
+    if result["rows"] == 0:
+        result["error"] = "No data rows"
+    return result
+
+
+def _value_type(value: str) -> tuple:
+    """Find the narrowest field type for a single CSV value.
+
+    Args:
+        value (str): CSV value. Must not be empty.
+
+    Returns:
+        tuple: Field type and, for DATE values, the matching date format.
+    """
+    if INTEGER.match(value):
+        number = int(value)
+        if SHORT_RANGE[0] <= number <= SHORT_RANGE[1]:
+            return "SHORT", None
+        if LONG_RANGE[0] <= number <= LONG_RANGE[1]:
+            return "LONG", None
+        return "DOUBLE", None
+    if NUMBER.match(value):
+        if math.isfinite(float(value)):
+            return "DOUBLE", None
+        return "TEXT", None
+    for fmt in DATE_FORMATS:
+        try:
+            datetime.strptime(value, fmt)
+            return "DATE", fmt
+        except ValueError:
+            pass
+    return "TEXT", None
+
+
+def _widen(field: dict, value_type: str, date_format: str) -> None:
+    """Widen a field definition so that it can hold a new value type.
+
+    Args:
+        field (dict): Field definition from infer_schema().
+        value_type (str): Field type of the new value.
+        date_format (str): Date format of the new value, if it is a DATE.
+    """
+    current = field["type"]
+    if current is None:
+        field["type"] = value_type
+        field["format"] = date_format
+    elif current == value_type:
+        if value_type == "DATE" and field["format"] != date_format:
+            field["type"] = "TEXT"
+    elif "DATE" in (current, value_type) or "TEXT" in (current, value_type):
+        field["type"] = "TEXT"
+    else:
+        field["type"] = max(current, value_type, key=FIELD_TYPES.index)
+
+
+def infer_schema(path: str, sample_rows: int = SAMPLE_ROWS) -> list:
+    """Infer the narrowest field type and text length for each CSV column.
+
+    Args:
+        path (str): CSV file path.
+        sample_rows (int, optional): Number of rows to read. Use None to
+            read the whole file. Defaults to SAMPLE_ROWS.
+
+    Returns:
+        list: Field definitions as dicts with keys 'name', 'type' (SHORT,
+            LONG, DOUBLE, DATE, or TEXT), 'length' (longest value, in
+            characters), 'format' (date format for DATE fields), and 'empty'
+            (True if the column had no values, in which case its type is
+            TEXT).
+    """
+    with open_csv(path) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        schema = [
+            {"name": name, "type": None, "length": 1, "format": None} for name in header
+        ]
+        for count, row in enumerate(reader):
+            if sample_rows is not None and count >= sample_rows:
+                break
+            for field, value in zip(schema, row):
+                if value == "":
+                    continue
+                field["length"] = max(field["length"], len(value))
+                if field["type"] == "TEXT":
+                    continue
+                _widen(field, *_value_type(value))
+    for field in schema:
+        field["empty"] = field["type"] is None
+        if field["empty"]:
+            field["type"] = "TEXT"
+    return schema
+
+
+def merge_schemas(schemas: list) -> list:
+    """Combine schemas inferred from several CSV files into one schema that
+    can hold the values of every file. A column with no values in a file
+    does not affect the merged type.
+
+    Args:
+        schemas (list): Schemas returned from infer_schema().
+
+    Returns:
+        list: Merged field definitions, in order of first appearance.
+    """
+    merged = {}
+    for schema in schemas:
+        for field in schema:
+            if field["name"] not in merged:
+                merged[field["name"]] = dict(field)
+                continue
+            target = merged[field["name"]]
+            target["length"] = max(target["length"], field["length"])
+            if field.get("empty"):
+                continue
+            if target.get("empty"):
+                target.update(type=field["type"], format=field["format"], empty=False)
+            elif target["type"] != "TEXT":
+                _widen(target, field["type"], field["format"])
+    return list(merged.values())
+
+
+def parse_value(value: str, field: dict):
+    """Convert a CSV value to the Python type for an inferred field.
+
+    Args:
+        value (str): CSV value.
+        field (dict): Field definition from infer_schema().
+
+    Returns:
+        int, float, datetime, str, or None: Converted value. Empty strings
+            are returned as None.
+
+    Raises:
+        ValueError: If the value does not fit the field type.
+    """
+    if value == "":
+        return None
+    if field["type"] in ("SHORT", "LONG", "DOUBLE"):
+        value_type, _ = _value_type(value)
+        if value_type not in ("SHORT", "LONG", "DOUBLE") or FIELD_TYPES.index(
+            value_type
+        ) > FIELD_TYPES.index(field["type"]):
+            raise ValueError(f"{value!r} does not fit a {field['type']} field")
+        return float(value) if field["type"] == "DOUBLE" else int(value)
+    if field["type"] == "DATE" and field["format"]:
+        return datetime.strptime(value, field["format"])
+    if field["type"] == "DATE":
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(value, fmt)
+            except ValueError:
+                pass
+        raise ValueError(f"Unrecognized date: {value}")
+    if len(value) > field["length"]:
+        raise ValueError(f"Value longer than {field['length']} characters")
+    return value
+
+
+def row_hash(values: list) -> bytes:
+    """Hash a list of CSV values.
+
+    Args:
+        values (list): CSV values.
+
+    Returns:
+        bytes: ROW_HASH_SIZE byte digest.
+    """
+    digest = hashlib.blake2b(digest_size=ROW_HASH_SIZE)
+    for value in values:
+        digest.update(value.encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.digest()
+
+
+def open_row_index(path: str) -> sqlite3.Connection:
+    """Open (or create) a persistent index of the rows loaded into a feature
+    class. Each row is stored as its key hash and the hash of its values.
+    The grid size of the feature class's tuned spatial index is also kept
+    here (see store_grid_size()).
+
+    Args:
+        path (str): SQLite database path.
+
+    Returns:
+        sqlite3.Connection: Open connection.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS loaded_rows "
+        "(row_key BLOB PRIMARY KEY, row_hash BLOB NOT NULL) WITHOUT ROWID"
+    )
+    conn.execute("CREATE TABLE IF NOT EXISTS spatial_index (grid_size REAL NOT NULL)")
+    return conn
+
+
+def read_grid_size(conn: sqlite3.Connection):
+    """Read the grid size of the spatial index last built on a feature class.
+
+    Args:
+        conn (sqlite3.Connection): Connection from open_row_index().
+
+    Returns:
+        float: Grid size, or None if no tuned spatial index was recorded.
+    """
+    row = conn.execute("SELECT grid_size FROM spatial_index").fetchone()
+    return row[0] if row else None
+
+
+def store_grid_size(conn: sqlite3.Connection, grid_size) -> None:
+    """Record the grid size of a spatial index built on a feature class, or
+    clear it when the feature class is created again.
+
+    Args:
+        conn (sqlite3.Connection): Connection from open_row_index().
+        grid_size (float): Grid size, or None to clear it.
+    """
+    with conn:
+        conn.execute("DELETE FROM spatial_index")
+        if grid_size is not None:
+            conn.execute("INSERT INTO spatial_index VALUES (?)", (grid_size,))
+
+
+def lookup_rows(conn: sqlite3.Connection, keys: list) -> dict:
+    """Find the value hashes of rows already in a row index.
+
+    Args:
+        conn (sqlite3.Connection): Connection from open_row_index().
+        keys (list): Row key hashes.
+
+    Returns:
+        dict: Value hash for each key that is in the index.
+    """
+    found = {}
+    # Stay below the SQLite host parameter limit.
+    for start in range(0, len(keys), 900):
+        batch = keys[start : start + 900]
+        found.update(
+            conn.execute(
+                "SELECT row_key, row_hash FROM loaded_rows WHERE row_key IN "
+                f"({','.join('?' * len(batch))})",
+                batch,
+            )
+        )
+    return found
+
+
+def store_rows(conn: sqlite3.Connection, rows: dict) -> None:
+    """Add or replace rows in a row index. The caller commits once the rows
+    are saved in the feature class.
+
+    Args:
+        conn (sqlite3.Connection): Connection from open_row_index().
+        rows (dict): Value hash for each row key hash.
+    """
+    conn.executemany(
+        "INSERT OR REPLACE INTO loaded_rows (row_key, row_hash) VALUES (?, ?)",
+        rows.items(),
+    )
@@ -5,16 +5,27 @@
 #   Caleb Grant (CG)
 #
 # NOTES
-#   1) This script takes 2 arguments:
+#   1) This script takes 2 arguments and 1 optional argument:
 #       - MXD directory
 #       - Output PDF directory
+#       - *JSON config file with per-host I/O limits (see host_limits.py)
+#   2) Each PDF is exported to a local temporary folder and then copied to
+#      the output directory in the background while the next MXD exports.
+#      Copies to each file server are held to that server's limit.
+#   3) A PDF that could not be copied is kept in the temporary folder, and
+#      its path is reported, so the export does not have to be run again.
 #
 # HISTORY
 #   1) Created 2020-07-28. CG.
 # =========================================================================
 
 import os
+import shutil
 import sys
+import tempfile
+from multiprocessing.pool import ThreadPool
+
+from host_limits import HostLimiter
 
 # Check if ArcGIS License can be utilized for ArcPy
 # This shouldnt be an issue since the user will already have ArcMap open
@@ -24,10 +35,37 @@ except RuntimeError as e:
     print("RuntimeError:", e)
     sys.exit()
 
+# Maximum number of PDFs copied to the output directory at the same time.
+MAX_COPIES = 4
+
+
+def copy_pdf(limiter, src, dst):
+    """Copy an exported PDF to the output directory within the host limit.
+
+    Returns:
+        str: Error message, or None if the copy succeeded.
+    """
+    try:
+        # Copy time grows with the PDF size, so it is not counted in the
+        # host's average latency.
+        with limiter.slot(dst, adapt=False):
+            shutil.copyfile(src, dst)
+        os.remove(src)
+    except Exception as e:
+        return "    Could not copy {}: {}. The exported PDF was kept at {}".format(
+            os.path.basename(dst), e, src
+        )
+    return None
+
+
 # Retrieve input parameters (MXD directory, Output directory)
 working_dir = arcpy.GetParameterAsText(0)  # input workspace
 arcpy.env.workspace = working_dir
 output_dir = arcpy.GetParameterAsText(1)  # output PDF location
+limiter = HostLimiter.from_value(arcpy.GetParameterAsText(2))
+temp_dir = tempfile.mkdtemp(prefix="export_pdfs_")
+pool = ThreadPool(MAX_COPIES)
+copies = []
 
 arcpy.AddMessage("\nWorking MXD Directory: {}".format(working_dir))
 arcpy.AddMessage("\nOutput PDF Directory: {}".format(output_dir))
@@ -82,16 +120,37 @@ for mxd in mxd_list:
             continue
 
     # Load map document
-    cur_mxd = arcpy.mapping.MapDocument(os.path.join(working_dir, mxd))
+    mxd_path = os.path.join(working_dir, mxd)
+    with limiter.slot(mxd_path, adapt=False):
+        cur_mxd = arcpy.mapping.MapDocument(mxd_path)
     # Try to export map document to PDF
+    temp_pdf = os.path.join(temp_dir, pdf_name)
     try:
         arcpy.mapping.ExportToPDF(
-            cur_mxd, pdf_loc, image_quality="BETTER", picture_symbol="VECTORIZE_BITMAP"
+            cur_mxd, temp_pdf, image_quality="BETTER", picture_symbol="VECTORIZE_BITMAP"
         )
     except:
         arcpy.AddError("    Could not export to PDF.")
         index += 1
         continue
+    copies.append(pool.apply_async(copy_pdf, (limiter, temp_pdf, pdf_loc)))
     index += 1
 
+# Wait for the remaining copies to the output directory
+pool.close()
+pool.join()
+failed = 0
+for copy in copies:
+    error = copy.get()
+    if error:
+        arcpy.AddError(error)
+        failed += 1
+for line in limiter.summary():
+    arcpy.AddMessage(line)
+# Keep the temporary folder if it holds PDFs that could not be copied.
+if failed:
+    arcpy.AddWarning("\n{} PDF(s) kept in: {}".format(failed, temp_dir))
+else:
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
 arcpy.AddMessage("\n")
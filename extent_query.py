@@ -0,0 +1,384 @@
+# PURPOSE
+#   Find the projects, maps, and layers whose extents intersect a bounding
+#   box or contain a point, from APRX and MXD scan inventories.
+#
+# NOTES
+#   1) Usage:
+#           python extent_query.py <inventory> [<inventory> ...]
+#               (--bbox XMIN YMIN XMAX YMAX | --point X Y) [--srs WKID]
+#               [--projects] [--cache PATH] [-o results.csv]
+#      Inventories can be the scanners' CSV, PARQUET, ARROW, or SQLITE
+#      output (see scan_diff.py). Parquet and Arrow inputs require pyarrow.
+#   2) Layer extents are read from the layerXMin/YMin/XMax/YMax columns of
+#      APRX scans and the Layer_Extent_JSON or Raster_Extent_JSON columns of
+#      MXD scans, and map extents from the XMin/YMin/XMax/YMax columns of
+#      APRX scans. Rows without an extent, or with an empty (NaN) extent, are
+#      skipped.
+#   3) The extents are bulk loaded into an R-tree with Sort-Tile-Recursive
+#      (STR) packing, so a query visits only the nodes whose bounds it
+#      intersects instead of comparing every row.
+#   4) Extents are in the coordinate system of each layer or map, and are
+#      not projected. Use --srs to only match extents in the same coordinate
+#      system (WKID) as the query.
+#   5) With --cache, the built index is saved to a pickle file and reused
+#      while the inventory files are unchanged (same paths, sizes, and
+#      modified times).
+#   6) This script runs with Python 3 and does not import arcpy.
+#
+# HISTORY
+#   DATE            REVISION
+#   ----------      -------------------------------------------------------
+#   2026-10-19      Created.
+# =========================================================================
+
+import argparse
+import csv
+import json
+import math
+import os
+import pickle
+import sys
+
+from scan_diff import read_inventory
+
+NODE_SIZE = 16
+CACHE_VERSION = 1
+# Columns read for each record, in order of preference.
+PROJECT_COLUMNS = ("filePath", "MXD_Path")
+MAP_COLUMNS = ("mapName", "Data_Frame")
+LAYER_COLUMNS = ("longName", "layerName", "Layer_Name")
+EXTENT_KEYS = ("XMin", "YMin", "XMax", "YMax")
+OUTPUT_COLUMNS = [
+    "Kind",
+    "Project",
+    "Map",
+    "Layer",
+    "SRS",
+    "XMin",
+    "YMin",
+    "XMax",
+    "YMax",
+]
+
+
+def _first(row: dict, columns: tuple) -> str:
+    for column in columns:
+        if row.get(column) not in (None, ""):
+            return str(row[column])
+    return ""
+
+
+def _number(value) -> float:
+    """Convert a value to a finite float, or None."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _srs(row: dict, pcs: str, gcs: str) -> int:
+    for column in (pcs, gcs):
+        code = _number(row.get(column))
+        if code:
+            return int(code)
+    return 0
+
+
+def _bounds(values) -> tuple:
+    bounds = tuple(_number(v) for v in values)
+    if None in bounds:
+        return None
+    return bounds
+
+
+def row_extents(row: dict, project: str):
+    """Read the layer and map extents of one inventory row.
+
+    Args:
+        row (dict): Inventory row.
+        project (str): Project name used when the row has no project path
+            column (the flat MXD CSV).
+
+    Yields:
+        tuple: ((xmin, ymin, xmax, ymax), (kind, project, map, layer, srs)),
+            where kind is 'layer' or 'map'.
+    """
+    project = _first(row, PROJECT_COLUMNS) or project
+    map_name = _first(row, MAP_COLUMNS)
+    layer = _first(row, LAYER_COLUMNS)
+
+    bounds = _bounds(row.get("layer" + key) for key in EXTENT_KEYS)
+    if bounds is not None:
+        srs = _srs(row, "layerPCSCode", "layerGCSCode")
+        yield bounds, ("layer", project, map_name, layer, srs)
+    else:
+        text = row.get("Layer_Extent_JSON") or row.get("Raster_Extent_JSON")
+        if text:
+            try:
+                extent = json.loads(text)
+            except ValueError:
+                extent = {}
+            bounds = _bounds(
+                extent.get(key) for key in ("xmin", "ymin", "xmax", "ymax")
+            )
+            if bounds is not None:
+                sr = extent.get("spatialReference") or {}
+                srs = sr.get("latestWkid") or sr.get("wkid")
+                if not srs:
+                    srs = _srs(row, "PCS_Code", "GCS_Code")
+                yield bounds, ("layer", project, map_name, layer, int(srs))
+
+    bounds = _bounds(row.get(key) for key in EXTENT_KEYS)
+    if bounds is not None:
+        yield bounds, ("map", project, map_name, "", _srs(row, "PCSCode", "GCSCode"))
+
+
+def _union(boxes: list) -> tuple:
+    return (
+        min(b[0] for b in boxes),
+        min(b[1] for b in boxes),
+        max(b[2] for b in boxes),
+        max(b[3] for b in boxes),
+    )
+
+
+def _str_order(boxes: list, node_size: int) -> list:
+    """Sort box indexes in Sort-Tile-Recursive order: into vertical slices by
+    x center, then by y center within each slice."""
+    order = sorted(range(len(boxes)), key=lambda i: boxes[i][0] + boxes[i][2])
+    nodes = math.ceil(len(boxes) / node_size)
+    slice_size = math.ceil(nodes / math.ceil(math.sqrt(nodes))) * node_size
+    result = []
+    for start in range(0, len(order), slice_size):
+        result.extend(
+            sorted(
+                order[start : start + slice_size],
+                key=lambda i: boxes[i][1] + boxes[i][3],
+            )
+        )
+    return result
+
+
+class ExtentIndex:
+    """Static R-tree of extents, bulk loaded with STR packing.
+
+    Args:
+        entries (list): ((xmin, ymin, xmax, ymax), record) tuples.
+        node_size (int, optional): Maximum children per node. Defaults to
+            NODE_SIZE.
+    """
+
+    def __init__(self, entries: list, node_size: int = NODE_SIZE):
+        self.boxes = []
+        self.records = []
+        # Each level above the entries holds (bounds, first, last) nodes,
+        # covering a range of the level below. The root level is last.
+        self.levels = []
+        if not entries:
+            return
+        order = _str_order([bounds for bounds, record in entries], node_size)
+        self.boxes = [entries[i][0] for i in order]
+        self.records = [entries[i][1] for i in order]
+        boxes = self.boxes
+        while True:
+            level = []
+            for first in range(0, len(boxes), node_size):
+                last = min(first + node_size, len(boxes))
+                level.append((_union(boxes[first:last]), first, last))
+            if len(level) == 1:
+                self.levels.append(level)
+                break
+            # Reorder the nodes so that the next level groups nearby nodes.
+            order = _str_order([node[0] for node in level], node_size)
+            level = [level[i] for i in order]
+            self.levels.append(level)
+            boxes = [node[0] for node in level]
+
+    def __len__(self):
+        return len(self.records)
+
+    def intersects(self, bbox: tuple, srs: int = None):
+        """Find the extents that intersect a bounding box.
+
+        Args:
+            bbox (tuple): (xmin, ymin, xmax, ymax).
+            srs (int, optional): Only match extents in this coordinate
+                system. Defaults to None (any).
+
+        Yields:
+            tuple: ((xmin, ymin, xmax, ymax), record) for each match.
+        """
+        if not self.levels:
+            return
+        xmin, ymin, xmax, ymax = bbox
+        stack = [(len(self.levels) - 1, 0, len(self.levels[-1]))]
+        while stack:
+            depth, first, last = stack.pop()
+            if depth < 0:
+                for i in range(first, last):
+                    b = self.boxes[i]
+                    if b[0] <= xmax and b[2] >= xmin and b[1] <= ymax and b[3] >= ymin:
+                        record = self.records[i]
+                        if srs is None or record[-1] == srs:
+                            yield b, record
+                continue
+            for b, child_first, child_last in self.levels[depth][first:last]:
+                if b[0] <= xmax and b[2] >= xmin and b[1] <= ymax and b[3] >= ymin:
+                    stack.append((depth - 1, child_first, child_last))
+
+    def contains(self, x: float, y: float, srs: int = None):
+        """Find the extents that contain a point.
+
+        Args:
+            x (float): Point x coordinate.
+            y (float): Point y coordinate.
+            srs (int, optional): Only match extents in this coordinate
+                system. Defaults to None (any).
+
+        Yields:
+            tuple: ((xmin, ymin, xmax, ymax), record) for each match.
+        """
+        return self.intersects((x, y, x, y), srs)
+
+
+def read_extents(paths: list) -> list:
+    """Read the distinct layer and map extents of inventories.
+
+    Args:
+        paths (list): Inventory paths.
+
+    Returns:
+        list: ((xmin, ymin, xmax, ymax), record) tuples.
+    """
+    entries = []
+    seen = set()
+    for path in paths:
+        project = os.path.splitext(os.path.basename(path))[0]
+        rows = read_inventory(path)
+        next(rows)
+        for row in rows:
+            for entry in row_extents(row, project):
+                # The flat APRX output repeats each layer for every mapframe.
+                if entry not in seen:
+                    seen.add(entry)
+                    entries.append(entry)
+    return entries
+
+
+def _signature(paths: list) -> list:
+    signature = []
+    for path in paths:
+        stat = os.stat(path)
+        signature.append((os.path.abspath(path), stat.st_size, stat.st_mtime))
+    return signature
+
+
+def load_index(paths: list, cache_path: str = None, node_size: int = NODE_SIZE):
+    """Build the extent index of inventories, or load it from a cache file if
+    the inventories are unchanged.
+
+    Args:
+        paths (list): Inventory paths.
+        cache_path (str, optional): Pickle cache path. Defaults to None (no
+            cache).
+        node_size (int, optional): Maximum children per node. Defaults to
+            NODE_SIZE.
+
+    Returns:
+        ExtentIndex: Index.
+    """
+    signature = _signature(paths)
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, "rb") as f:
+                cached = pickle.load(f)
+            if (
+                cached.get("version") == CACHE_VERSION
+                and cached.get("signature") == signature
+                and cached.get("node_size") == node_size
+            ):
+                index = ExtentIndex([], node_size)
+                index.boxes = cached["boxes"]
+                index.records = cached["records"]
+                index.levels = cached["levels"]
+                return index
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+            pass
+    index = ExtentIndex(read_extents(paths), node_size)
+    if cache_path:
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(
+                {
+                    "version": CACHE_VERSION,
+                    "signature": signature,
+                    "node_size": node_size,
+                    "boxes": index.boxes,
+                    "records": index.records,
+                    "levels": index.levels,
+                },
+                f,
+                pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, cache_path)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Query APRX and MXD scan inventories by layer and map extent."
+    )
+    parser.add_argument("inventories", nargs="+", help="Inventory paths.")
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument(
+        "--bbox",
+        nargs=4,
+        type=float,
+        metavar=("XMIN", "YMIN", "XMAX", "YMAX"),
+        help="Find extents that intersect a bounding box.",
+    )
+    query.add_argument(
+        "--point",
+        nargs=2,
+        type=float,
+        metavar=("X", "Y"),
+        help="Find extents that contain a point.",
+    )
+    parser.add_argument("--srs", type=int, help="Only match extents in this WKID.")
+    parser.add_argument(
+        "--projects", action="store_true", help="List the matching projects only."
+    )
+    parser.add_argument("--cache", help="Index cache path. Default: no cache.")
+    parser.add_argument("-o", "--output", help="Output CSV path. Default: stdout.")
+    args = parser.parse_args()
+
+    index = load_index(args.inventories, args.cache)
+    if args.bbox:
+        matches = index.intersects(tuple(args.bbox), args.srs)
+    else:
+        matches = index.contains(args.point[0], args.point[1], args.srs)
+
+    f = open(args.output, "w", newline="") if args.output else sys.stdout
+    count = 0
+    try:
+        writer = csv.writer(f)
+        if args.projects:
+            projects = sorted(set(record[1] for bounds, record in matches))
+            writer.writerow(["Project"])
+            for project in projects:
+                writer.writerow([project])
+            count = len(projects)
+        else:
+            writer.writerow(OUTPUT_COLUMNS)
+            for bounds, record in matches:
+                writer.writerow(list(record) + list(bounds))
+                count += 1
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    print(f"{count} match(es) in {len(index)} extent(s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
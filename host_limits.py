@@ -0,0 +1,149 @@
+# PURPOSE
+#   Limit the number of concurrent I/O operations against each file server,
+#   adapting each server's limit to its observed latency.
+#
+# NOTES
+#   1) _clock falls back to time.time() under ArcMap's Python 2.7.
+#   2) The host of a path is read with source_watchdog.host_of() from UNC
+#      paths, URLs, and mapped network drives. Local paths are not limited.
+#   3) Each host starts at its configured limit (or DEFAULT_LIMIT). When the
+#      average latency of its operations rises above the target, its limit
+#      is halved; while it stays below the target, the limit grows by one
+#      up to the configured maximum. Only short operations (directory
+#      listings and metadata probes) are timed. Long reads, such as raster
+#      statistics, hold a slot without changing the average.
+#   4) Per-host limits can be set in the "hostLimits" section of a scanner
+#      JSON config file (see scan_config.py), for example:
+#           {"hostLimits": {"nas01": 2, "gisserver": 8, "*": 4}}
+#      where "*" sets the limit of all other hosts.
+#
+# HISTORY
+#   DATE            REVISION
+#   ----------      -------------------------------------------------------
+#   2026-10-19      Created.
+# =========================================================================
+
+import contextlib
+import threading
+import time
+
+from scan_config import load_config
+from source_watchdog import host_of
+
+DEFAULT_LIMIT = 4
+TARGET_LATENCY = 0.5  # seconds
+# Weight of the newest operation in each host's average latency.
+LATENCY_WEIGHT = 0.2
+
+_clock = getattr(time, "perf_counter", time.time)
+
+
+class _Host(object):
+    def __init__(self, limit):
+        self.max_limit = limit
+        self.limit = limit
+        self.active = 0
+        self.latency = None
+        self.completed = 0
+
+
+class HostLimiter(object):
+    """Per-host concurrency limits for network I/O.
+
+    Args:
+        limits (dict, optional): Maximum concurrent operations for each host
+            name, with "*" for all other hosts. Defaults to DEFAULT_LIMIT for
+            every host.
+        target_latency (float, optional): Average operation time in seconds
+            above which a host's limit is reduced. Defaults to
+            TARGET_LATENCY.
+    """
+
+    def __init__(self, limits=None, target_latency=TARGET_LATENCY):
+        limits = dict((k.lower(), int(v)) for k, v in (limits or {}).items())
+        self.default = max(1, limits.pop("*", DEFAULT_LIMIT))
+        self.limits = limits
+        self.target_latency = target_latency
+        self.hosts = {}
+        self.condition = threading.Condition()
+
+    @classmethod
+    def from_value(cls, value):
+        """Create a limiter from a toolbox parameter value.
+
+        Args:
+            value (str): Path to a JSON config file with a "hostLimits"
+                section. An empty value uses the default limits.
+
+        Returns:
+            HostLimiter: Limiter.
+        """
+        if not value:
+            return cls()
+        return cls(load_config(value).get("hostLimits"))
+
+    def _host(self, host):
+        if host not in self.hosts:
+            self.hosts[host] = _Host(max(1, self.limits.get(host, self.default)))
+        return self.hosts[host]
+
+    @contextlib.contextmanager
+    def slot(self, path, adapt=True):
+        """Wait for a free slot on the host of a path, and hold it while the
+        block runs.
+
+        Args:
+            path (str): Path or URL the block reads or writes.
+            adapt (bool, optional): Count the block's time in the host's
+                average latency. Set to False for reads whose time depends
+                on the size of the data, such as computing raster
+                statistics, which would otherwise lower the limit of a
+                healthy host. Defaults to True.
+        """
+        host = host_of(path)
+        if host is None:
+            yield
+            return
+        with self.condition:
+            state = self._host(host)
+            while state.active >= state.limit:
+                self.condition.wait()
+            state.active += 1
+        start = _clock()
+        try:
+            yield
+        finally:
+            elapsed = _clock() - start
+            with self.condition:
+                state.active -= 1
+                if adapt:
+                    self._adapt(state, elapsed)
+                self.condition.notify_all()
+
+    def _adapt(self, state, elapsed):
+        """Update a host's average latency and adjust its limit."""
+        if state.latency is None:
+            state.latency = elapsed
+        else:
+            state.latency += LATENCY_WEIGHT * (elapsed - state.latency)
+        state.completed += 1
+        if state.latency > self.target_latency:
+            if state.limit > 1:
+                state.limit = max(1, state.limit // 2)
+                state.completed = 0
+        elif state.completed >= state.limit and state.limit < state.max_limit:
+            state.limit += 1
+            state.completed = 0
+
+    def summary(self):
+        """Summarize the final limit and average latency of each host.
+
+        Returns:
+            list: One line of text per host.
+        """
+        return [
+            "Host {}: limit {} of {}, average latency {:.3f} s".format(
+                host, state.limit, state.max_limit, state.latency or 0
+            )
+            for host, state in sorted(self.hosts.items())
+        ]
@@ -1,13 +1,876 @@
+import csv
+import itertools
+import math
 import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
+
+import csv_ingest
+import reproject
 
 # Check if ArcGIS License can be utilized for ArcPy
 # This shouldnt be an issue since the user will already have ArcGIS Pro open.
-try:
-    import arcpy
-    from arcpy import metadata as md
-except RuntimeError as e:
-    raise
+# Validation and schema inference workers are started with spawn, which
+# imports this script again as __mp_main__. They only call csv_ingest, so
+# ArcPy is not loaded in them.
+if __name__ != "__mp_main__":
+    try:
+        import arcpy
+        from arcpy import metadata as md
+    except RuntimeError as e:
+        raise
+
+SOURCE_FIELD = "gis_source"
+SOURCE_ID_FIELD = "gis_source_id"
+SOURCE_TABLE = "gis_sources"
+ROW_KEY_FIELD = "gis_row_key"
+CHUNK_ROWS = 10000
+# Target number of features per spatial index grid cell.
+GRID_CELL_FEATURES = 16
+# Relative change of the tuned grid size above which an existing spatial
+# index is rebuilt.
+GRID_SIZE_TOLERANCE = 0.25
+# Map of arcpy field types to the field types used by csv_ingest.
+FIELD_TYPES = {
+    "SmallInteger": "SHORT",
+    "Integer": "LONG",
+    "Single": "DOUBLE",
+    "Double": "DOUBLE",
+    "Date": "DATE",
+    "String": "TEXT",
+}
+SCHEMA_MODES = {"NONE": 0, "SAMPLE": csv_ingest.SAMPLE_ROWS, "FULL": None}
+
+
+def unique_field_name(in_table: str, field_name: str) -> str:
+    """Return a field name that does not already exist in a table. If the
+    name is taken, underscores are added to the beginning and end of the
+    name until it is unique.
+
+    Args:
+        in_table (str): Table or feature class path.
+        field_name (str): Preferred field name.
+
+    Returns:
+        str: Unique field name.
+    """
+    fields = [field.name for field in arcpy.ListFields(in_table)]
+    while field_name in fields:
+        field_name = f"_{field_name}_"
+    return field_name
+
+
+def add_source_field(in_table: str, field_name: str, source) -> None:
+    """Add a field to a table and populate it with the source path, or with
+    the source id when a source lookup table is used.
+
+    Args:
+        in_table (str): Table or feature class path.
+        field_name (str): Name of the field to add.
+        source (str or int): Source path or source id written to every row.
+    """
+    if isinstance(source, int):
+        arcpy.AddMessage(f"Adding column {field_name} to store the source id.")
+        arcpy.management.AddField(in_table, field_name, "LONG")
+    else:
+        arcpy.AddMessage(f"Adding column {field_name} to store original source path.")
+        arcpy.management.AddField(in_table, field_name, "TEXT", field_length=255)
+    with arcpy.da.UpdateCursor(in_table, field_name) as cursor:
+        for row in cursor:
+            row[0] = source
+            cursor.updateRow(row)
+
+
+def register_source(in_csv: str) -> int:
+    """Record a CSV file in the source lookup table of the default workspace
+    and return its source id. The table is created if it does not exist and
+    a file that was imported before keeps its original id.
+
+    Args:
+        in_csv (str): CSV file path.
+
+    Returns:
+        int: Source id.
+    """
+    table = os.path.join(arcpy.env.workspace, SOURCE_TABLE)
+    if not arcpy.Exists(table):
+        arcpy.AddMessage(f"Creating source lookup table: {table}")
+        arcpy.management.CreateTable(arcpy.env.workspace, SOURCE_TABLE)
+        arcpy.management.AddFields(
+            table,
+            [
+                ["source_id", "LONG", "Source ID"],
+                ["source_path", "TEXT", "Source Path", 1024],
+                ["imported_by", "TEXT", "Imported By", 64],
+                ["imported_at", "DATE", "Imported At"],
+            ],
+        )
+        arcpy.management.AddIndex(table, "source_id", "source_id_idx", "UNIQUE")
+    max_id = 0
+    with arcpy.da.SearchCursor(table, ["source_id", "source_path"]) as cursor:
+        for source_id, source_path in cursor:
+            if source_path == in_csv:
+                return source_id
+            max_id = max(max_id, source_id or 0)
+    with arcpy.da.InsertCursor(
+        table, ["source_id", "source_path", "imported_by", "imported_at"]
+    ) as cursor:
+        cursor.insertRow([max_id + 1, in_csv, os.getlogin(), datetime.now()])
+    return max_id + 1
+
+
+def relate_sources(output_fc: str, source_field: str) -> None:
+    """Create a relationship class between the source lookup table and a
+    feature class, if one does not already exist.
+
+    Args:
+        output_fc (str): Feature class name.
+        source_field (str): Source id field in the feature class.
+    """
+    rel_class = arcpy.ValidateTableName(
+        f"{output_fc}_{SOURCE_TABLE}_rel", arcpy.env.workspace
+    )
+    if arcpy.Exists(rel_class):
+        return
+    arcpy.AddMessage(f"Creating relationship class: {rel_class}")
+    arcpy.management.CreateRelationshipClass(
+        SOURCE_TABLE,
+        output_fc,
+        rel_class,
+        "SIMPLE",
+        "Features",
+        "Source",
+        "NONE",
+        "ONE_TO_MANY",
+        "NONE",
+        "source_id",
+        source_field,
+    )
+
+
+def source_description(source_lookup: bool) -> str:
+    """Describe the source field values for the metadata description.
+
+    Args:
+        source_lookup (bool): True if the source field holds source ids.
+
+    Returns:
+        str: Text that precedes 'network path' in the description.
+    """
+    if source_lookup:
+        return f"the source id in the {SOURCE_TABLE} table of the"
+    return "the"
+
+
+def add_metadata(output_fc: str, fc_title: str, fc_summary: str, description: str):
+    """Write title, summary, and description metadata to a feature class.
+
+    Args:
+        output_fc (str): Feature class path.
+        fc_title (str): Metadata title.
+        fc_summary (str): Metadata summary.
+        description (str): Metadata description.
+    """
+    arcpy.AddMessage("Adding feature metadata.")
+    meta = md.Metadata()
+    meta.title = fc_title
+    arcpy.AddMessage(f"  Title: {fc_title}")
+    meta.summary = fc_summary
+    arcpy.AddMessage(f"  Summary: {fc_summary}")
+    meta.description = description
+    target = md.Metadata(output_fc)
+    if not target.isReadOnly:
+        target.copy(meta)
+        target.save()
+
+
+def create_feature_class(
+    output_fc: str,
+    schema: list,
+    coordinate_system: str,
+    source_field: str = None,
+    source_length: int = 255,
+) -> None:
+    """Create an empty point feature class with fields from an inferred
+    CSV schema. A 'fieldName' key holding the validated field name is added
+    to each field definition in the schema.
+
+    Args:
+        output_fc (str): Output feature class name.
+        schema (list): Field definitions from csv_ingest.infer_schema().
+        coordinate_system (str): Coordinate system of the feature class.
+        source_field (str, optional): Name of a text field to add for the
+            source path. Defaults to None (no source field).
+        source_length (int, optional): Length of the source field. Use None
+            to add a LONG source id field instead of a text field.
+    """
+    arcpy.management.CreateFeatureclass(
+        arcpy.env.workspace,
+        output_fc,
+        "POINT",
+        spatial_reference=coordinate_system,
+    )
+    descriptions = []
+    for field in schema:
+        field["fieldName"] = arcpy.ValidateFieldName(field["name"], arcpy.env.workspace)
+        descriptions.append(
+            [
+                field["fieldName"],
+                field["type"],
+                field["name"],
+                field["length"] if field["type"] == "TEXT" else "",
+            ]
+        )
+    if source_field and source_length is None:
+        descriptions.append([source_field, "LONG", source_field])
+    elif source_field:
+        descriptions.append([source_field, "TEXT", source_field, source_length])
+    arcpy.management.AddFields(output_fc, descriptions)
+    # A new feature class has the default spatial index, not a tuned one.
+    index_path = row_index_path(output_fc)
+    if os.path.exists(index_path):
+        conn = csv_ingest.open_row_index(index_path)
+        try:
+            csv_ingest.store_grid_size(conn, None)
+        finally:
+            conn.close()
+
+
+def insert_csv(
+    in_csv: str,
+    output_fc: str,
+    schema: list,
+    x_field: str,
+    y_field: str,
+    source_field: str = None,
+    source=None,
+    transformer=None,
+) -> int:
+    """Insert the rows of a CSV file into a feature class created with
+    create_feature_class().
+
+    Args:
+        in_csv (str): CSV file path.
+        output_fc (str): Feature class name.
+        schema (list): Field definitions used to create the feature class.
+        x_field (str): Name of the X coordinate column.
+        y_field (str): Name of the Y coordinate column.
+        source_field (str, optional): Name of the field to populate with the
+            CSV path. Defaults to None.
+        source (str or int, optional): Value for the source field. Defaults
+            to the CSV path.
+        transformer (function, optional): Function from
+            coordinate_transformer() used to reproject the coordinates of
+            each chunk of rows before they are inserted.
+
+    Returns:
+        int: Number of rows inserted.
+
+    Raises:
+        ValueError: If a value does not fit its field, for example when the
+            schema was inferred from a sample of rows.
+    """
+    for field in schema:
+        if "fieldName" not in field:
+            field["fieldName"] = arcpy.ValidateFieldName(
+                field["name"], arcpy.env.workspace
+            )
+    cursor_fields = ["SHAPE@XY"] + [field["fieldName"] for field in schema]
+    if source_field:
+        cursor_fields.append(source_field)
+    if source is None:
+        source = in_csv
+    rows = 0
+    with csv_ingest.open_csv(in_csv) as f, arcpy.da.InsertCursor(
+        output_fc, cursor_fields
+    ) as cursor:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        columns = [
+            header.index(field["name"]) if field["name"] in header else None
+            for field in schema
+        ]
+        x_idx = header.index(x_field)
+        y_idx = header.index(y_field)
+        while True:
+            chunk = []
+            for row in reader:
+                if not row:
+                    continue
+                try:
+                    values = parse_row(row, schema, columns, x_idx, y_idx)
+                except ValueError as e:
+                    raise ValueError(f"{in_csv} line {reader.line_num}: {e}") from e
+                if source_field:
+                    values.append(source)
+                chunk.append(values)
+                if len(chunk) == CHUNK_ROWS:
+                    break
+            if not chunk:
+                break
+            transform_shapes(chunk, transformer)
+            for values in chunk:
+                cursor.insertRow(values)
+            rows += len(chunk)
+    return rows
+
+
+def spatial_reference(coordinate_system: str):
+    """Create a spatial reference from a coordinate system parameter value.
+
+    Args:
+        coordinate_system (str): Factory code, name, or WKT string.
+
+    Returns:
+        arcpy.SpatialReference: Spatial reference.
+    """
+    if coordinate_system.strip().isdigit():
+        return arcpy.SpatialReference(int(coordinate_system))
+    sr = arcpy.SpatialReference()
+    sr.loadFromString(coordinate_system)
+    return sr
+
+
+def projection_params(sr) -> dict:
+    """Read the parameters used by reproject.py from a spatial reference.
+
+    Args:
+        sr (arcpy.SpatialReference): Spatial reference.
+
+    Returns:
+        dict: Coordinate system parameters, or None if the projection is not
+            supported by reproject.py.
+    """
+    gcs = sr.GCS if sr.type == "Projected" else sr
+    params = {
+        "gcs": gcs.GCSCode,
+        "a": gcs.semiMajorAxis,
+        "f": gcs.flattening,
+    }
+    if sr.type == "Geographic":
+        params["type"] = "GEOGRAPHIC"
+        return params
+    if sr.projectionName not in reproject.PROJECTIONS:
+        return None
+    params.update(
+        {
+            "type": sr.projectionName,
+            "lon0": sr.centralMeridian,
+            "lat0": sr.latitudeOfOrigin,
+            "lat1": sr.standardParallel1,
+            "lat2": sr.standardParallel2,
+            "k0": sr.scaleFactor or 1,
+            "x0": sr.falseEasting,
+            "y0": sr.falseNorthing,
+            "unit": sr.metersPerUnit,
+        }
+    )
+    if sr.projectionName == "Mercator_Auxiliary_Sphere":
+        params["a"] = 6378137.0
+    return params
+
+
+def coordinate_transformer(source_cs: str, target_cs: str):
+    """Build a function that reprojects lists of X and Y coordinates from the
+    source to the target coordinate system. UTM, State Plane (Transverse
+    Mercator and Lambert Conformal Conic), Web Mercator, and geographic
+    coordinates are converted in bulk with reproject.py. Other combinations
+    fall back to projecting each point with arcpy.
+
+    Args:
+        source_cs (str): Coordinate system of the CSV coordinates.
+        target_cs (str): Coordinate system of the feature class.
+
+    Returns:
+        function: Transformer taking and returning X and Y lists, or None if
+            the coordinate systems are the same.
+    """
+    source_sr = spatial_reference(source_cs)
+    target_sr = spatial_reference(target_cs)
+    if source_sr.exportToString() == target_sr.exportToString():
+        return None
+    source = projection_params(source_sr)
+    target = projection_params(target_sr)
+    if reproject.compatible(source, target):
+        arcpy.AddMessage(
+            f"Reprojecting coordinates from {source_sr.name} to {target_sr.name}."
+        )
+        return lambda xs, ys: reproject.transform(xs, ys, source, target)
+    arcpy.AddWarning(
+        f"Reprojecting coordinates from {source_sr.name} to {target_sr.name} one point at a time."
+    )
+
+    def project_points(xs, ys):
+        points = [
+            arcpy.PointGeometry(arcpy.Point(x, y), source_sr).projectAs(target_sr)
+            for x, y in zip(xs, ys)
+        ]
+        return [p.firstPoint.X for p in points], [p.firstPoint.Y for p in points]
+
+    return project_points
+
+
+def transform_shapes(rows: list, transformer) -> None:
+    """Reproject the SHAPE@XY value at the start of each insert cursor row in
+    place. Points that cannot be projected are set to null.
+
+    Args:
+        rows (list): Insert cursor rows.
+        transformer (function): Function from coordinate_transformer(), or
+            None to leave the rows unchanged.
+    """
+    if transformer is None:
+        return
+    index = [i for i, row in enumerate(rows) if row[0] is not None]
+    if not index:
+        return
+    xs, ys = transformer([rows[i][0][0] for i in index], [rows[i][0][1] for i in index])
+    for i, x, y in zip(index, xs, ys):
+        x, y = float(x), float(y)
+        rows[i][0] = (x, y) if math.isfinite(x) and math.isfinite(y) else None
+
+
+def parse_row(row: list, schema: list, columns: list, x_idx: int, y_idx: int):
+    """Convert a CSV row to insert cursor values.
+
+    Args:
+        row (list): CSV values.
+        schema (list): Field definitions.
+        columns (list): CSV column index of each schema field, or None for
+            fields missing from the CSV file.
+        x_idx (int): CSV column index of the X coordinate.
+        y_idx (int): CSV column index of the Y coordinate.
+
+    Returns:
+        list: Values starting with the SHAPE@XY tuple.
+
+    Raises:
+        ValueError: If a value does not fit its field.
+    """
+    try:
+        shape = (float(row[x_idx]), float(row[y_idx]))
+    except (IndexError, ValueError):
+        shape = None
+    values = [shape]
+    for field, idx in zip(schema, columns):
+        try:
+            values.append(csv_ingest.parse_value(row[idx], field))
+        except (IndexError, TypeError):
+            values.append(None)
+        except ValueError as e:
+            raise ValueError(f"column {field['name']}: {e}") from e
+    return values
+
+
+def schema_from_table(in_table: str, header: list) -> list:
+    """Build field definitions for the CSV columns that exist in a table,
+    using the table's field types.
+
+    Args:
+        in_table (str): Table or feature class path.
+        header (list): CSV column names.
+
+    Returns:
+        list: Field definitions in the format of csv_ingest.infer_schema(),
+            with the 'fieldName' key set.
+    """
+    fields = {
+        field.name: field
+        for field in arcpy.ListFields(in_table)
+        if field.type in FIELD_TYPES
+    }
+    schema = []
+    for name in header:
+        field_name = arcpy.ValidateFieldName(name, arcpy.env.workspace)
+        if field_name in fields:
+            schema.append(
+                {
+                    "name": name,
+                    "fieldName": field_name,
+                    "type": FIELD_TYPES[fields[field_name].type],
+                    "length": fields[field_name].length,
+                    "format": None,
+                }
+            )
+    return schema
+
+
+def row_index_path(output_fc: str) -> str:
+    """Return the path of the row index kept for incremental imports into a
+    feature class. The index is stored beside the workspace geodatabase.
+
+    Args:
+        output_fc (str): Feature class name.
+
+    Returns:
+        str: SQLite database path.
+    """
+    workspace = arcpy.env.workspace.rstrip("\\/")
+    gdb_name = os.path.splitext(os.path.basename(workspace))[0]
+    return os.path.join(
+        os.path.dirname(workspace), f"{gdb_name}_{output_fc}_rowindex.sqlite"
+    )
+
+
+def upsert_csv(
+    in_csv: str,
+    x_field: str,
+    y_field: str,
+    coordinate_system: str,
+    output_fc: str,
+    key_fields: list = None,
+    update_changed: bool = False,
+    source_cs: str = None,
+    schema_mode: str = "SAMPLE",
+    source_lookup: bool = False,
+) -> dict:
+    """Load only the rows of a CSV file that are not already in a feature
+    class. Each row is identified by a hash of its key columns (or of every
+    column when no key is given). A persistent row index records the key
+    and value hashes of the loaded rows so that existing rows do not have to
+    be read back from the feature class.
+
+    The inserts and updates are made in one edit session, and the row index
+    is only committed once the edit session is saved, so a failed load
+    leaves both unchanged and can be run again.
+
+    Args:
+        in_csv (str): CSV file path.
+        x_field (str): Name of the X coordinate column.
+        y_field (str): Name of the Y coordinate column.
+        coordinate_system (str): Coordinate system used if the feature class
+            has to be created.
+        output_fc (str): Feature class name.
+        key_fields (list, optional): Columns that identify a row.
+        update_changed (bool, optional): Update rows whose key is loaded but
+            whose values changed. Only applies when key_fields are given.
+            Defaults to False.
+        source_cs (str, optional): Coordinate system of the CSV coordinates,
+            if different from the feature class.
+        schema_mode (str, optional): 'SAMPLE' or 'FULL' inference of the
+            field types used if the feature class has to be created. 'NONE'
+            is treated as 'SAMPLE'. If a later value does not fit a sampled
+            schema, the new feature class is created again with 'FULL'.
+            Defaults to 'SAMPLE'.
+        source_lookup (bool, optional): Write the CSV file's id in the
+            source lookup table to each inserted or updated row instead of
+            its path. Defaults to False.
+
+    Returns:
+        dict: Counts of 'inserted', 'updated', and 'skipped' rows, and the
+            name of the 'sourceField'. Empty if the CSV file was not loaded.
+    """
+    index_path = row_index_path(output_fc)
+    header = csv_ingest.read_header(in_csv)
+    key_fields = [fld for fld in (key_fields or []) if fld]
+    missing = [fld for fld in key_fields if fld not in header]
+    if missing:
+        arcpy.AddError(f"Key column(s) not found in {in_csv}: {', '.join(missing)}")
+        return {}
+    missing = [fld for fld in (x_field, y_field) if fld not in header]
+    if missing:
+        arcpy.AddError(
+            f"Coordinate column(s) not found in {in_csv}: {', '.join(missing)}"
+        )
+        return {}
+    source_name = SOURCE_ID_FIELD if source_lookup else SOURCE_FIELD
+    source_field = schema_source_field([{"name": name} for name in header], source_name)
+    created = not arcpy.Exists(output_fc)
+    if not created:
+        schema = schema_from_table(output_fc, header)
+    else:
+        schema_mode = (schema_mode or "SAMPLE").upper()
+        if schema_mode == "NONE":
+            arcpy.AddMessage(
+                "Incremental import: inferring schema from a sample of rows."
+            )
+            schema_mode = "SAMPLE"
+        schema = csv_ingest.infer_schema(in_csv, SCHEMA_MODES[schema_mode])
+    # Checked before anything is created, so a bad file leaves no trace.
+    missing = [field["name"] for field in schema if field["name"] not in header]
+    if missing:
+        arcpy.AddError(f"Column(s) not found in {in_csv}: {', '.join(missing)}")
+        return {}
+    if not created:
+        if not check_source_field(output_fc, source_field, source_lookup, [in_csv]):
+            return {}
+        fields = {field.name: field for field in arcpy.ListFields(output_fc)}
+        if ROW_KEY_FIELD not in fields:
+            arcpy.AddWarning(
+                f"{output_fc} was not created by an incremental import. Existing rows are not indexed and may be loaded again."
+            )
+            arcpy.management.AddField(
+                output_fc,
+                ROW_KEY_FIELD,
+                "TEXT",
+                field_length=csv_ingest.ROW_HASH_SIZE * 2,
+            )
+    else:
+        # The index describes rows of a feature class that no longer exists.
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        describe_schema(schema)
+        arcpy.AddMessage(
+            f"Creating Feature Class: {os.path.join(arcpy.env.workspace, output_fc)}."
+        )
+        create_feature_class(
+            output_fc,
+            schema,
+            coordinate_system,
+            source_field,
+            None if source_lookup else 255,
+        )
+        arcpy.management.AddField(
+            output_fc, ROW_KEY_FIELD, "TEXT", field_length=csv_ingest.ROW_HASH_SIZE * 2
+        )
+        arcpy.management.AddIndex(output_fc, ROW_KEY_FIELD, f"{ROW_KEY_FIELD}_idx")
+    arcpy.AddMessage(f"Row index: {index_path}")
+    source = register_source(in_csv) if source_lookup else in_csv
+    transformer = None
+    if source_cs:
+        transformer = coordinate_transformer(
+            source_cs, arcpy.Describe(output_fc).spatialReference.exportToString()
+        )
+
+    columns = [header.index(field["name"]) for field in schema]
+    key_idx = [header.index(fld) for fld in key_fields]
+    x_idx = header.index(x_field)
+    y_idx = header.index(y_field)
+    cursor_fields = (
+        ["SHAPE@XY"]
+        + [field["fieldName"] for field in schema]
+        + [source_field, ROW_KEY_FIELD]
+    )
+    counts = {"inserted": 0, "updated": 0, "skipped": 0}
+    changed = {}
+    try:
+        conn = csv_ingest.open_row_index(index_path)
+        try:
+            with arcpy.da.Editor(arcpy.env.workspace):
+                with csv_ingest.open_csv(in_csv) as f, arcpy.da.InsertCursor(
+                    output_fc, cursor_fields
+                ) as cursor:
+                    reader = csv.reader(f)
+                    next(reader, None)
+                    while True:
+                        lines = list(itertools.islice(reader, CHUNK_ROWS))
+                        if not lines:
+                            break
+                        chunk = [row for row in lines if row]
+                        hashes = []
+                        for row in chunk:
+                            value_hash = csv_ingest.row_hash(row)
+                            if key_idx:
+                                row_key = csv_ingest.row_hash([row[i] for i in key_idx])
+                            else:
+                                row_key = value_hash
+                            hashes.append((row_key, value_hash))
+                        loaded = csv_ingest.lookup_rows(
+                            conn, [key for key, _ in hashes]
+                        )
+                        stored = {}
+                        new_rows = []
+                        for row, (row_key, value_hash) in zip(chunk, hashes):
+                            if row_key not in loaded:
+                                values = parse_row(row, schema, columns, x_idx, y_idx)
+                                new_rows.append(values + [source, row_key.hex()])
+                            elif (
+                                loaded[row_key] != value_hash
+                                and update_changed
+                                and key_idx
+                            ):
+                                changed[row_key.hex()] = row
+                            else:
+                                counts["skipped"] += 1
+                                continue
+                            loaded[row_key] = value_hash
+                            stored[row_key] = value_hash
+                        transform_shapes(new_rows, transformer)
+                        for values in new_rows:
+                            cursor.insertRow(values)
+                        counts["inserted"] += len(new_rows)
+                        csv_ingest.store_rows(conn, stored)
+
+                keys = list(changed)
+                for start in range(0, len(keys), 500):
+                    batch = keys[start : start + 500]
+                    where = (
+                        f"{ROW_KEY_FIELD} IN ({','.join(repr(key) for key in batch)})"
+                    )
+                    updates = {}
+                    for key in batch:
+                        values = parse_row(changed[key], schema, columns, x_idx, y_idx)
+                        updates[key] = values + [source, key]
+                    transform_shapes(list(updates.values()), transformer)
+                    with arcpy.da.UpdateCursor(
+                        output_fc, cursor_fields, where
+                    ) as cursor:
+                        for row in cursor:
+                            cursor.updateRow(updates[row[-1]])
+                            counts["updated"] += 1
+            # The edit session was saved, so the index can record the new rows.
+            conn.commit()
+        finally:
+            conn.close()
+    except ValueError as e:
+        if not (created and schema_mode == "SAMPLE"):
+            arcpy.AddError(f"{in_csv}: {e}. The file was not loaded.")
+            return {}
+        arcpy.AddWarning(
+            f"{in_csv}: {e}. Inferring the schema from every row and loading the file again."
+        )
+        arcpy.management.Delete(output_fc)
+        return upsert_csv(
+            in_csv,
+            x_field,
+            y_field,
+            coordinate_system,
+            output_fc,
+            key_fields,
+            update_changed,
+            source_cs,
+            "FULL",
+            source_lookup,
+        )
+    arcpy.AddMessage(
+        f"{in_csv}: {counts['inserted']} inserted, {counts['updated']} updated, {counts['skipped']} skipped."
+    )
+    counts["sourceField"] = source_field
+    return counts
+
+
+def upsert_csvs(
+    in_paths: list,
+    x_field: str,
+    y_field: str,
+    coordinate_system: str,
+    output_fc: str,
+    fc_title: str,
+    fc_summary: str,
+    key_fields: list = None,
+    update_changed: bool = False,
+    source_cs: str = None,
+    schema_mode: str = "SAMPLE",
+    source_lookup: bool = False,
+) -> list:
+    """Incrementally load CSV files into one feature class with
+    upsert_csv(), then relate the source lookup table and write metadata.
+
+    Args:
+        in_paths (list): CSV file paths.
+        fc_title (str): Metadata title.
+        fc_summary (str): Metadata summary.
+        Other arguments are passed to upsert_csv().
+
+    Returns:
+        list: Feature classes updated.
+    """
+    source_field = None
+    loaded = 0
+    for index, in_csv in enumerate(in_paths, 1):
+        arcpy.AddMessage(f"({index}/{len(in_paths)}) Loading: {in_csv}")
+        counts = upsert_csv(
+            in_csv,
+            x_field,
+            y_field,
+            coordinate_system,
+            output_fc,
+            key_fields,
+            update_changed,
+            source_cs,
+            schema_mode,
+            source_lookup,
+        )
+        if counts:
+            source_field = counts["sourceField"]
+            loaded += 1
+    if source_field is None:
+        return []
+    if source_lookup:
+        relate_sources(output_fc, source_field)
+    add_metadata(
+        output_fc,
+        fc_title,
+        fc_summary,
+        f"""{loaded} data sets were loaded incrementally to {os.path.join(arcpy.env.workspace, output_fc)}. Script user: {os.getlogin()}. Updated: {datetime.now().isoformat(sep=' ', timespec='seconds')}. The column {source_field} holds a value indicating {source_description(source_lookup)} network path and file name of the source data that last inserted or updated each row.""",
+    )
+    return [output_fc]
+
+
+def schema_source_field(schema: list, field_name: str = SOURCE_FIELD) -> str:
+    """Return a source field name that does not clash with a CSV column.
+
+    Args:
+        schema (list): Field definitions from csv_ingest.infer_schema().
+        field_name (str, optional): Preferred field name.
+
+    Returns:
+        str: Unique field name.
+    """
+    names = [field["name"] for field in schema]
+    while field_name in names:
+        field_name = f"_{field_name}_"
+    return field_name
+
+
+def check_source_field(
+    output_fc: str, source_field: str, source_lookup: bool, in_paths: list
+) -> bool:
+    """Check that the source field of an existing feature class can hold the
+    source values of the CSV files to be loaded. The field is added if it
+    does not exist.
+
+    Args:
+        output_fc (str): Feature class name.
+        source_field (str): Source field name.
+        source_lookup (bool): True if the field holds source ids, False if
+            it holds source paths.
+        in_paths (list): CSV file paths to be loaded.
+
+    Returns:
+        bool: True if the field can hold the source values. Errors are
+            reported as geoprocessing messages.
+    """
+    fields = {field.name: field for field in arcpy.ListFields(output_fc)}
+    length = max(len(path) for path in in_paths)
+    if source_field not in fields:
+        arcpy.AddMessage(f"Adding column {source_field} to {output_fc}.")
+        if source_lookup:
+            arcpy.management.AddField(output_fc, source_field, "LONG")
+        else:
+            arcpy.management.AddField(
+                output_fc, source_field, "TEXT", field_length=max(length, 255)
+            )
+        return True
+    field = fields[source_field]
+    if field.type != ("Integer" if source_lookup else "String"):
+        arcpy.AddError(
+            f"{output_fc}.{source_field} is a {field.type} field. Load the CSV files with the same source lookup setting as the earlier loads."
+        )
+        return False
+    if not source_lookup and field.length < length:
+        arcpy.AddError(
+            f"{output_fc}.{source_field} holds {field.length} characters, but a source path has {length}. Use the source lookup table or a shorter path."
+        )
+        return False
+    return True
+
+
+def describe_schema(schema: list) -> None:
+    """Report an inferred schema as geoprocessing messages.
+
+    Args:
+        schema (list): Field definitions from csv_ingest.infer_schema().
+    """
+    arcpy.AddMessage("Inferred schema:")
+    for field in schema:
+        if field["type"] == "TEXT":
+            arcpy.AddMessage(f"  {field['name']}: TEXT ({field['length']})")
+        else:
+            arcpy.AddMessage(f"  {field['name']}: {field['type']}")
 
 
 def import_csv(
@@ -18,15 +881,17 @@ def import_csv(
     output_fc: str,
     fc_title: str,
     fc_summary: str,
+    schema_mode: str = "NONE",
+    source_lookup: bool = False,
+    source_cs: str = None,
 ) -> None:
-    SOURCE_FIELD = "gis_source"
     # Check that a default workspace exists.
     if not arcpy.Exists(arcpy.env.workspace):
         arcpy.AddError(
             "No workspace found for the current project. Try setting a default geodatabase for the project before continuing."
         )
     # Check that input file is CSV.
-    if os.path.splitext(in_csv)[-1].lower() != ".csv":
+    if not csv_ingest.is_csv(in_csv):
         arcpy.AddError(
             f"Input file is not in CSV format ({os.path.splitext(in_csv)[-1]})."
         )
@@ -35,40 +900,415 @@ def import_csv(
     arcpy.AddMessage(
         f"Creating Feature Class: {os.path.join(arcpy.env.workspace, output_fc)}."
     )
-    arcpy.management.XYTableToPoint(
-        in_table=in_csv,
-        out_feature_class=output_fc,
-        x_field=x_field,
-        y_field=y_field,
-        coordinate_system=coordinate_system,
+    schema_mode = (schema_mode or "NONE").upper()
+    if schema_mode == "NONE" and csv_ingest.is_compressed(in_csv):
+        # XYTableToPoint cannot read compressed files, so stream the rows
+        # through an insert cursor instead.
+        arcpy.AddMessage("Compressed input: inferring schema from a sample of rows.")
+        schema_mode = "SAMPLE"
+    transformer = None
+    if source_cs:
+        transformer = coordinate_transformer(source_cs, coordinate_system)
+    if schema_mode == "NONE" and transformer is not None:
+        # Reproject while the rows are inserted so that the data set is
+        # written only once.
+        schema_mode = "SAMPLE"
+    # Either the source path is written to every row, or the source is
+    # recorded once in a lookup table and each row gets its source id.
+    if source_lookup:
+        source, source_name = register_source(in_csv), SOURCE_ID_FIELD
+    else:
+        source, source_name = in_csv, SOURCE_FIELD
+    if schema_mode == "NONE":
+        arcpy.management.XYTableToPoint(
+            in_table=in_csv,
+            out_feature_class=output_fc,
+            x_field=x_field,
+            y_field=y_field,
+            coordinate_system=coordinate_system,
+        )
+        # Add a SOURCE_FIELD field. If one already exists, add underscores to the beginning
+        # and end of the SOURCE_FIELD name to make it unique.
+        source_field = unique_field_name(output_fc, source_name)
+        # Update the SOURCE_FIELD field with the file name and path
+        add_source_field(output_fc, source_field, source)
+    else:
+        # Create the feature class with field types and text lengths sized
+        # to the data, then load the rows with an insert cursor. A value that
+        # does not fit a schema inferred from a sample of rows starts over
+        # with a schema inferred from every row.
+        while True:
+            schema = csv_ingest.infer_schema(in_csv, SCHEMA_MODES[schema_mode])
+            describe_schema(schema)
+            source_field = schema_source_field(schema, source_name)
+            create_feature_class(
+                output_fc,
+                schema,
+                coordinate_system,
+                source_field,
+                None if source_lookup else len(in_csv),
+            )
+            try:
+                rows = insert_csv(
+                    in_csv,
+                    output_fc,
+                    schema,
+                    x_field,
+                    y_field,
+                    source_field,
+                    source,
+                    transformer,
+                )
+                break
+            except ValueError as e:
+                if schema_mode != "SAMPLE":
+                    raise
+                arcpy.AddWarning(
+                    f"{e}. Inferring the schema from every row and importing again."
+                )
+                arcpy.management.Delete(output_fc)
+                schema_mode = "FULL"
+        arcpy.AddMessage(f"Inserted {rows} rows.")
+    if source_lookup:
+        relate_sources(output_fc, source_field)
+    # Add feature metadata
+    add_metadata(
+        output_fc,
+        fc_title,
+        fc_summary,
+        f"""Data set {in_csv} was imported to {os.path.join(arcpy.env.workspace, output_fc)}. Script user: {os.getlogin()}. Created: {datetime.now().isoformat(sep=' ', timespec='seconds')}. The column {source_field} was created in the data set with a value indicating {source_description(source_lookup)} network path and file name of the source data.""",
     )
-    # Add a SOURCE_FIELD field. If one already exists, add underscores to the beginning
-    # and end of the SOURCE_FIELD name to make it unique.
-    fields = [field.name for field in arcpy.ListFields(output_fc)]
-    while True:
-        if SOURCE_FIELD in fields:
-            SOURCE_FIELD = f"_{SOURCE_FIELD}_"
+
+
+def spatial_grid_size(output_fc: str) -> float:
+    """Pick a spatial index grid size from the extent and feature count of a
+    feature class, so that each grid cell holds about GRID_CELL_FEATURES
+    features.
+
+    Args:
+        output_fc (str): Feature class name.
+
+    Returns:
+        float: Grid size in the units of the feature class, or 0 to let
+            ArcGIS calculate the grid size.
+    """
+    extent = arcpy.Describe(output_fc).extent
+    count = int(arcpy.management.GetCount(output_fc)[0])
+    area = extent.width * extent.height
+    if count == 0 or area == 0:
+        return 0
+    return math.sqrt(area * GRID_CELL_FEATURES / count)
+
+
+def build_indexes(
+    output_fc: str,
+    spatial_index: bool = True,
+    attribute_fields: list = None,
+    rebuild_spatial: bool = False,
+) -> dict:
+    """Build a spatial index and attribute indexes on an imported feature
+    class and report how long each one took.
+
+    Indexes that already exist are kept, so that repeated incremental loads
+    into the same feature class do not fail or rebuild them. The spatial
+    index is only rebuilt when the tuned grid size differs by more than
+    GRID_SIZE_TOLERANCE from the grid size it was last built with. That
+    grid size is kept in the row index database (see row_index_path()),
+    since arcpy does not report the grid size of an existing index.
+
+    Args:
+        output_fc (str): Feature class name.
+        spatial_index (bool, optional): Build the spatial index with a grid
+            size tuned to the data. Defaults to True.
+        attribute_fields (list, optional): CSV column names to index.
+        rebuild_spatial (bool, optional): Rebuild the spatial index even if
+            its grid size has not changed. Defaults to False.
+
+    Returns:
+        dict: Build time in seconds for each index, or None for indexes that
+            were skipped because they already exist.
+    """
+    timings = {}
+    if spatial_index:
+        grid_size = spatial_grid_size(output_fc)
+        conn = csv_ingest.open_row_index(row_index_path(output_fc))
+        try:
+            current = csv_ingest.read_grid_size(conn)
+            if (
+                rebuild_spatial
+                or current is None
+                or abs(grid_size - current) > GRID_SIZE_TOLERANCE * current
+            ):
+                start = time.perf_counter()
+                arcpy.AddMessage(f"Building spatial index (grid size {grid_size:g}).")
+                arcpy.management.AddSpatialIndex(output_fc, grid_size)
+                timings["spatial"] = time.perf_counter() - start
+                csv_ingest.store_grid_size(conn, grid_size)
+            else:
+                timings["spatial"] = None
+        finally:
+            conn.close()
+    existing = [field.name for field in arcpy.ListFields(output_fc)]
+    index_names = set()
+    indexed_fields = set()
+    for index in arcpy.ListIndexes(output_fc):
+        index_names.add(index.name.lower())
+        indexed_fields.update(field.name.lower() for field in index.fields)
+    for name in attribute_fields or []:
+        if not name:
+            continue
+        field_name = arcpy.ValidateFieldName(name, arcpy.env.workspace)
+        if field_name not in existing:
+            arcpy.AddWarning(f"Cannot index {name}: field not found in {output_fc}.")
+            continue
+        index_name = f"{field_name}_idx"
+        if index_name.lower() in index_names or field_name.lower() in indexed_fields:
+            timings[field_name] = None
+            continue
+        start = time.perf_counter()
+        arcpy.AddMessage(f"Building attribute index on {field_name}.")
+        arcpy.management.AddIndex(output_fc, field_name, index_name)
+        timings[field_name] = time.perf_counter() - start
+    for name, seconds in timings.items():
+        if seconds is None:
+            arcpy.AddMessage(f"  {name} index: skipped (already exists)")
         else:
-            break
-    arcpy.AddMessage(f"Adding column {SOURCE_FIELD} to store original source path.")
-    arcpy.management.AddField(output_fc, SOURCE_FIELD, "TEXT", field_length=255)
-    # Update the SOURCE_FIELD field with the file name and path
-    with arcpy.da.UpdateCursor(output_fc, SOURCE_FIELD) as cursor:
-        for row in cursor:
-            row[0] = in_csv
-            cursor.updateRow(row)
-    # Add feature metadata
-    arcpy.AddMessage("Adding feature metadata.")
-    meta = md.Metadata()
-    meta.title = fc_title
-    arcpy.AddMessage(f"  Title: {fc_title}")
-    meta.summary = fc_summary
-    arcpy.AddMessage(f"  Summary: {fc_summary}")
-    meta.description = f"""Data set {in_csv} was imported to {os.path.join(arcpy.env.workspace, output_fc)}. Script user: {os.getlogin()}. Created: {datetime.now().isoformat(sep=' ', timespec='seconds')}. The column {SOURCE_FIELD} was created in the data set with a value indicating the network path and file name of the source data."""
-    target = md.Metadata(output_fc)
-    if not target.isReadOnly:
-        target.copy(meta)
-        target.save()
+            arcpy.AddMessage(f"  {name} index: {seconds:.2f} s")
+    built = [seconds for seconds in timings.values() if seconds is not None]
+    if built:
+        arcpy.AddMessage(f"  Total index build time: {sum(built):.2f} s")
+    return timings
+
+
+def validate_csvs(
+    in_paths: list, x_field: str, y_field: str, workers: int = None
+) -> list:
+    """Validate CSV files in parallel across a process pool.
+
+    Args:
+        in_paths (list): CSV file paths.
+        x_field (str): Name of the X coordinate column.
+        y_field (str): Name of the Y coordinate column.
+        workers (int, optional): Number of worker processes. Defaults to
+            the number of processors.
+
+    Returns:
+        list: Validation summaries from csv_ingest.validate_csv(), in the
+            same order as in_paths.
+    """
+    # Inside ArcGIS Pro sys.executable is ArcGISPro.exe, so point
+    # multiprocessing at the Python interpreter of the active environment.
+    if sys.platform == "win32":
+        import multiprocessing
+
+        multiprocessing.set_executable(os.path.join(sys.exec_prefix, "pythonw.exe"))
+    validate = partial(csv_ingest.validate_csv, x_field=x_field, y_field=y_field)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(validate, in_paths))
+
+
+def import_csvs(
+    in_paths: list,
+    x_field: str,
+    y_field: str,
+    coordinate_system: str,
+    output_fc: str,
+    fc_title: str,
+    fc_summary: str,
+    batch_mode: str = "SEPARATE",
+    workers: int = None,
+    schema_mode: str = "NONE",
+    source_lookup: bool = False,
+    source_cs: str = None,
+) -> list:
+    """Import many CSV files into the default workspace.
+
+    CSV files are parsed and validated in parallel. Geodatabase writes are
+    made one file at a time so that the geodatabase lock is respected.
+
+    Args:
+        in_paths (list): CSV file paths.
+        x_field (str): Name of the X coordinate column.
+        y_field (str): Name of the Y coordinate column.
+        coordinate_system (str): Coordinate system of the X/Y values.
+        output_fc (str): Output feature class name. In SEPARATE mode this is
+            used as a prefix for one feature class per CSV file.
+        fc_title (str): Metadata title.
+        fc_summary (str): Metadata summary.
+        batch_mode (str, optional): 'SEPARATE' to create one feature class
+            per CSV file or 'APPEND' to load every CSV file into output_fc.
+            Defaults to 'SEPARATE'.
+        workers (int, optional): Number of validation processes.
+        schema_mode (str, optional): 'NONE' to let XYTableToPoint choose
+            field types, 'SAMPLE' to infer field types from the first rows
+            of each file, or 'FULL' to infer them from every row. A new
+            feature class is created again with 'FULL' if a later value does
+            not fit a 'SAMPLE' schema. Defaults to 'NONE'.
+        source_lookup (bool, optional): Record each CSV file once in the
+            source lookup table and write its source id to each row instead
+            of the full path. Defaults to False.
+        source_cs (str, optional): Coordinate system of the CSV coordinates.
+            When given, coordinates are reprojected to coordinate_system as
+            the rows are written.
+
+    Returns:
+        list: Feature classes created or updated.
+    """
+    if not arcpy.Exists(arcpy.env.workspace):
+        arcpy.AddError(
+            "No workspace found for the current project. Try setting a default geodatabase for the project before continuing."
+        )
+        return []
+    batch_mode = batch_mode.upper() if batch_mode else "SEPARATE"
+    schema_mode = (schema_mode or "NONE").upper()
+    arcpy.AddMessage(f"Validating {len(in_paths)} CSV files.")
+    results = validate_csvs(in_paths, x_field, y_field, workers)
+    valid = []
+    for result in results:
+        if result["error"]:
+            arcpy.AddWarning(f"Skipping {result['path']}: {result['error']}")
+            continue
+        if result["badCoords"]:
+            arcpy.AddWarning(
+                f"{result['path']}: {result['badCoords']} of {result['rows']} rows have missing or invalid coordinates."
+            )
+        valid.append(result["path"])
+    arcpy.AddMessage(f"{len(valid)} of {len(in_paths)} CSV files passed validation.")
+
+    outputs = []
+    if batch_mode == "SEPARATE":
+        for index, in_csv in enumerate(valid, 1):
+            arcpy.AddMessage(f"({index}/{len(valid)})")
+            name = os.path.splitext(os.path.basename(in_csv))[0]
+            fc = arcpy.ValidateTableName(f"{output_fc}_{name}", arcpy.env.workspace)
+            import_csv(
+                in_csv,
+                x_field,
+                y_field,
+                coordinate_system,
+                fc,
+                fc_title,
+                fc_summary,
+                schema_mode,
+                source_lookup,
+                source_cs,
+            )
+            outputs.append(fc)
+        return outputs
+
+    source_field = None
+    source_name = SOURCE_ID_FIELD if source_lookup else SOURCE_FIELD
+    if schema_mode == "NONE" and any(csv_ingest.is_compressed(p) for p in valid):
+        arcpy.AddMessage("Compressed input: inferring schema from a sample of rows.")
+        schema_mode = "SAMPLE"
+    transformer = None
+    if source_cs:
+        transformer = coordinate_transformer(source_cs, coordinate_system)
+    if schema_mode == "NONE" and transformer is not None:
+        schema_mode = "SAMPLE"
+    if schema_mode != "NONE" and valid:
+        created = not arcpy.Exists(output_fc)
+        if not created:
+            # Rows are appended with the fields of the existing feature
+            # class. CSV columns without a matching field are not loaded.
+            header = []
+            for in_csv in valid:
+                header.extend(
+                    name
+                    for name in csv_ingest.read_header(in_csv)
+                    if name not in header
+                )
+            schema = schema_from_table(output_fc, header)
+            loaded = [field["name"] for field in schema]
+            skipped = [name for name in header if name not in loaded]
+            if skipped:
+                arcpy.AddWarning(
+                    f"Column(s) not found in {output_fc} and not loaded: {', '.join(skipped)}"
+                )
+            source_field = schema_source_field(
+                [{"name": name} for name in header], source_name
+            )
+            if not check_source_field(output_fc, source_field, source_lookup, valid):
+                return outputs
+        while True:
+            if created:
+                arcpy.AddMessage(f"Inferring schema for {len(valid)} CSV files.")
+                infer = partial(
+                    csv_ingest.infer_schema, sample_rows=SCHEMA_MODES[schema_mode]
+                )
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    schema = csv_ingest.merge_schemas(list(executor.map(infer, valid)))
+                describe_schema(schema)
+                source_field = schema_source_field(schema, source_name)
+                arcpy.AddMessage(
+                    f"Creating Feature Class: {os.path.join(arcpy.env.workspace, output_fc)}."
+                )
+                create_feature_class(
+                    output_fc,
+                    schema,
+                    coordinate_system,
+                    source_field,
+                    None if source_lookup else max(len(path) for path in valid),
+                )
+            try:
+                for index, in_csv in enumerate(valid, 1):
+                    arcpy.AddMessage(f"({index}/{len(valid)}) Importing: {in_csv}")
+                    source = register_source(in_csv) if source_lookup else in_csv
+                    insert_csv(
+                        in_csv,
+                        output_fc,
+                        schema,
+                        x_field,
+                        y_field,
+                        source_field,
+                        source,
+                        transformer,
+                    )
+                break
+            except ValueError as e:
+                # Start over with a schema inferred from every row, unless rows
+                # were appended to an existing feature class.
+                if schema_mode != "SAMPLE" or not created:
+                    raise
+                arcpy.AddWarning(
+                    f"{e}. Inferring the schema from every row and importing again."
+                )
+                arcpy.management.Delete(output_fc)
+                schema_mode = "FULL"
+    else:
+        for index, in_csv in enumerate(valid, 1):
+            arcpy.AddMessage(f"({index}/{len(valid)}) Importing: {in_csv}")
+            temp_fc = f"memory\\import_csv_{index}"
+            arcpy.management.XYTableToPoint(
+                in_table=in_csv,
+                out_feature_class=temp_fc,
+                x_field=x_field,
+                y_field=y_field,
+                coordinate_system=coordinate_system,
+            )
+            if source_field is None:
+                source_field = unique_field_name(temp_fc, source_name)
+            source = register_source(in_csv) if source_lookup else in_csv
+            add_source_field(temp_fc, source_field, source)
+            if arcpy.Exists(output_fc):
+                arcpy.management.Append(temp_fc, output_fc, "NO_TEST")
+            else:
+                arcpy.AddMessage(
+                    f"Creating Feature Class: {os.path.join(arcpy.env.workspace, output_fc)}."
+                )
+                arcpy.management.CopyFeatures(temp_fc, output_fc)
+            arcpy.management.Delete(temp_fc)
+    if source_field is not None:
+        if source_lookup:
+            relate_sources(output_fc, source_field)
+        add_metadata(
+            output_fc,
+            fc_title,
+            fc_summary,
+            f"""{len(valid)} data sets were imported to {os.path.join(arcpy.env.workspace, output_fc)}. Script user: {os.getlogin()}. Created: {datetime.now().isoformat(sep=' ', timespec='seconds')}. The column {source_field} was created in the data set with a value indicating {source_description(source_lookup)} network path and file name of the source data for each row.""",
+        )
+        outputs.append(output_fc)
+    return outputs
 
 
 if __name__ == "__main__":
@@ -79,15 +1319,63 @@ if __name__ == "__main__":
     output_fc = arcpy.GetParameterAsText(4)
     fc_title = arcpy.GetParameterAsText(5)
     fc_summary = arcpy.GetParameterAsText(6)
+    batch_mode = arcpy.GetParameterAsText(7)
+    workers = arcpy.GetParameterAsText(8)
+    schema_mode = arcpy.GetParameterAsText(9)
+    source_lookup = arcpy.GetParameter(10) is True
+    incremental = arcpy.GetParameter(11) is True
+    key_fields = arcpy.GetParameterAsText(12)
+    update_changed = arcpy.GetParameter(13) is True
+    spatial_index = arcpy.GetParameter(14) is True
+    index_fields = arcpy.GetParameterAsText(15)
+    source_cs = arcpy.GetParameterAsText(16)
     try:
-        import_csv(
-            in_csv,
-            x_field,
-            y_field,
-            coordinate_system,
-            output_fc,
-            fc_title,
-            fc_summary,
-        )
+        outputs = [output_fc]
+        if incremental:
+            outputs = upsert_csvs(
+                csv_ingest.expand_inputs(in_csv),
+                x_field,
+                y_field,
+                coordinate_system,
+                output_fc,
+                fc_title,
+                fc_summary,
+                key_fields.split(";"),
+                update_changed,
+                source_cs,
+                schema_mode,
+                source_lookup,
+            )
+        elif csv_ingest.is_csv(in_csv) and csv_ingest.exists(in_csv):
+            import_csv(
+                in_csv,
+                x_field,
+                y_field,
+                coordinate_system,
+                output_fc,
+                fc_title,
+                fc_summary,
+                schema_mode,
+                source_lookup,
+                source_cs,
+            )
+        else:
+            outputs = import_csvs(
+                csv_ingest.expand_inputs(in_csv),
+                x_field,
+                y_field,
+                coordinate_system,
+                output_fc,
+                fc_title,
+                fc_summary,
+                batch_mode,
+                int(workers) if workers else None,
+                schema_mode,
+                source_lookup,
+                source_cs,
+            )
+        if spatial_index or index_fields:
+            for fc in outputs:
+                build_indexes(fc, spatial_index, index_fields.split(";"))
     except arcpy.ExecuteError:
         arcpy.AddError(arcpy.GetMessages())
@@ -0,0 +1,232 @@
+# PURPOSE
+#   Profile the tables behind vector layers: row count, and the null rate,
+#   minimum, and maximum of each field.
+#
+# NOTES
+#   1) mxd_metadata.py profiles its layers through scan_engine.py under
+#      ArcMap (Python 2.7), so this module avoids Python 3 only syntax. arcpy
+#      and numpy are imported only when a table is profiled.
+#   2) Profiling is opt-in. It is enabled by a "profile" section in a
+#      scanner JSON config file (see scan_config.py), for example:
+#           {"profile": {"sample": 100000, "cache": "D:/profiles.sqlite"}}
+#      or {"profile": true} for the defaults.
+#   3) Row counts use GetCount, which reads the stored count of most
+#      formats. Fields are profiled in a single SearchCursor pass over only
+#      the profiled fields, aggregated in chunks of CHUNK_ROWS rows with
+#      numpy for numeric fields. With a sample size, only the first rows up
+#      to the sample size are profiled.
+#   4) Profiling reads the whole table, which can take longer than the
+#      scanners' probe deadline, so the scanners profile without it and a
+#      large table never gets its host blacklisted (see source_watchdog.py).
+#   5) Profiles are cached in a SQLite database keyed by data source, and
+#      reused while the data source's modified time is unchanged. For file
+#      geodatabase tables the newest file in the geodatabase is used. Data
+#      sources without a modified time of their own (enterprise geodatabases
+#      behind a .sde connection file, and services) are profiled on every
+#      scan, because the connection file's modified time does not change
+#      when the data does.
+#
+# HISTORY
+#   DATE            REVISION
+#   ----------      -------------------------------------------------------
+#   2026-10-19      Created.
+# =========================================================================
+
+import itertools
+import json
+import os
+import sqlite3
+
+from scan_config import load_config
+
+DEFAULT_CACHE = os.path.join(os.path.expanduser("~"), "layer_profile.sqlite")
+CHUNK_ROWS = 10000
+# Field types that are not profiled.
+SKIPPED_TYPES = ("Blob", "Geometry", "GlobalID", "Guid", "OID", "Raster")
+NUMERIC_TYPES = ("BigInteger", "Double", "Integer", "Single", "SmallInteger")
+
+
+def source_mtime(data_source):
+    """Get the modified time of a data source.
+
+    Args:
+        data_source (str): Data source path.
+
+    Returns:
+        float: Modified time, or None if the data source is not on disk or
+            is in an enterprise geodatabase or a service.
+    """
+    if "://" in data_source or any(
+        part.lower().endswith(".sde")
+        for part in data_source.replace("\\", "/").split("/")
+    ):
+        return None
+    path = data_source
+    while path and not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+    if not path:
+        return None
+    try:
+        if path.lower().endswith(".gdb") and os.path.isdir(path):
+            # Editing a file geodatabase table rewrites files in place, which
+            # does not always change the directory's modified time.
+            return max(
+                [os.path.getmtime(path)]
+                + [os.path.getmtime(os.path.join(path, n)) for n in os.listdir(path)]
+            )
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def _aggregate(profile, field_type, values):
+    """Update a field's null count, minimum, and maximum with a chunk of
+    values."""
+    import numpy
+
+    column = numpy.array(values, dtype=object)
+    nulls = numpy.equal(column, None)
+    profile["nulls"] += int(nulls.sum())
+    column = column[~nulls]
+    if not column.size:
+        return
+    if field_type in NUMERIC_TYPES:
+        column = column.astype(numpy.float64)
+        low, high = column.min().item(), column.max().item()
+    else:
+        low, high = min(column), max(column)
+    if profile["min"] is None or low < profile["min"]:
+        profile["min"] = low
+    if profile["max"] is None or high > profile["max"]:
+        profile["max"] = high
+
+
+class LayerProfiler(object):
+    """Row counts and field profiles of layer data sources, with a
+    persistent cache.
+
+    Args:
+        cache_path (str, optional): SQLite cache database path. Created if it
+            does not exist. Defaults to DEFAULT_CACHE.
+        sample (int, optional): Maximum rows profiled per table. Defaults to
+            None (all rows).
+    """
+
+    def __init__(self, cache_path=None, sample=None):
+        self.sample = int(sample) if sample else None
+        self.profiled = 0
+        self.cached = 0
+        self.conn = sqlite3.connect(cache_path or DEFAULT_CACHE)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS profiles ("
+            "source TEXT PRIMARY KEY, "
+            "mtime REAL NOT NULL, "
+            "sample INTEGER, "
+            "profile TEXT NOT NULL)"
+        )
+        self.conn.commit()
+
+    @classmethod
+    def from_value(cls, value):
+        """Create a profiler from a toolbox parameter value.
+
+        Args:
+            value (str): Path to a JSON config file.
+
+        Returns:
+            LayerProfiler: Profiler, or None if the config file has no
+                "profile" section.
+        """
+        if not value:
+            return None
+        options = load_config(value).get("profile")
+        if not options:
+            return None
+        if not isinstance(options, dict):
+            options = {}
+        return cls(options.get("cache"), options.get("sample"))
+
+    def close(self):
+        self.conn.close()
+
+    def profile(self, data_source):
+        """Profile a table or feature class, or read its cached profile.
+
+        Args:
+            data_source (str): Data source path.
+
+        Returns:
+            dict: 'rowCount', 'sampled' (rows profiled, or None if all rows
+                were profiled), and 'fields', a dict of 'nullRate', 'min',
+                and 'max' for each field. Dates are returned as text.
+        """
+        mtime = source_mtime(data_source)
+        if mtime is not None:
+            row = self.conn.execute(
+                "SELECT mtime, sample, profile FROM profiles WHERE source = ?",
+                (data_source,),
+            ).fetchone()
+            if row is not None and row[0] == mtime and row[1] == self.sample:
+                self.cached += 1
+                return json.loads(row[2])
+        # Round trip through JSON so that fresh and cached profiles match.
+        text = json.dumps(self._profile(data_source), default=str)
+        self.profiled += 1
+        if mtime is not None:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO profiles VALUES (?, ?, ?, ?)",
+                    (data_source, mtime, self.sample, text),
+                )
+        return json.loads(text)
+
+    def _profile(self, data_source):
+        import arcpy
+
+        count = int(arcpy.GetCount_management(data_source).getOutput(0))
+        fields = [
+            f for f in arcpy.ListFields(data_source) if f.type not in SKIPPED_TYPES
+        ]
+        profiles = [{"nulls": 0, "min": None, "max": None} for f in fields]
+        rows = 0
+        if fields:
+            with arcpy.da.SearchCursor(data_source, [f.name for f in fields]) as cursor:
+                if self.sample:
+                    cursor = itertools.islice(cursor, self.sample)
+                while True:
+                    chunk = list(itertools.islice(cursor, CHUNK_ROWS))
+                    if not chunk:
+                        break
+                    rows += len(chunk)
+                    for field, profile, values in zip(fields, profiles, zip(*chunk)):
+                        _aggregate(profile, field.type, values)
+        return {
+            "rowCount": count,
+            "sampled": rows if self.sample and rows < count else None,
+            "fields": dict(
+                (
+                    field.name,
+                    {
+                        "nullRate": float(profile["nulls"]) / rows if rows else None,
+                        "min": profile["min"],
+                        "max": profile["max"],
+                    },
+                )
+                for field, profile in zip(fields, profiles)
+            ),
+        }
+
+    def summary(self):
+        """Summarize the tables profiled.
+
+        Returns:
+            list: Lines of text.
+        """
+        return [
+            "Profiled {} table(s), {} from cache".format(
+                self.profiled + self.cached, self.cached
+            )
+        ]
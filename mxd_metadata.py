@@ -5,24 +5,68 @@
 #   Caleb Grant (CG)
 #
 # NOTES
-#   1) This script takes 1 argument and 1 optional argument
+#   1) This script takes 1 argument and 8 optional arguments
 #       - MXD path
 #       - *Output CSV directory (optional)
+#       - *Columns to compute, as a semicolon-delimited list or a JSON
+#         config file (see scan_config.py). Default is all columns.
+#       - *JSON config file with layer exclusion rules (see scan_config.py),
+#         per-host I/O limits (see host_limits.py), raster statistics
+#         options (see raster_stats.py), and optional feature layer
+#         profiling (see layer_profile.py). Default excludes basemap layers.
+#       - *Semicolon-delimited search root directories used to suggest
+#         repair paths for broken layers (see repair_index.py).
+#       - *Repair index database path. Default is repair_index.sqlite in the
+#         user's home directory.
+#       - *Data source usage index database path (see usage_index.py). Each
+#         scan replaces this MXD's rows in the index.
+#       - *Output format: CSV (default, one row per layer), CSV_TABLES
+#         (normalized projects, maps, layers, and fields CSVs), SQLITE
+#         (the same tables loaded into scan_inventory.sqlite in the output
+#         directory), PARQUET, or ARROW (typed columnar versions of the CSV
+#         output, which require pyarrow), or GPKG (each layer's extent as a
+#         polygon with the layer's metadata, in scan_extents.gpkg in the
+#         output directory).
+#       - *Seconds to wait for the server of each layer's data source to
+#         respond before its Describe and Raster calls (see
+#         source_watchdog.py). Default is 30. Layers whose server does not
+#         respond are marked in the Probe_Status column.
 #
 # HISTORY
 #   1) Created 2020-06-26. CG.
 #
 # ISSUES
-#   - Nested layer groups where > 6 nested groups are present
 #   - Layers pulled in through a connection
 # =========================================================================
 
 import csv
 import datetime
 import getpass
+import json
 import os
 import sys
 
+from scan_config import ExclusionRules, parse_columns, wants
+from scan_output import (
+    COLUMNAR_FORMATS,
+    EXTENTS_GPKG,
+    INVENTORY_DB,
+    GeoPackageWriter,
+    StringPool,
+    TableKey,
+    atomic_open,
+    output_name,
+    split_fields,
+    write_columnar,
+    write_csv_tables,
+    write_sqlite,
+)
+from repair_index import open_index
+from scan_engine import ScanContext, describe_dataset, iter_layers, raster_properties
+from source_health import SourceHealth
+from source_watchdog import STATUS_OK, TIMEOUT
+from usage_index import record_usage
+
 # Check if ArcGIS License can be utilized for ArcPy
 # This shouldnt be an issue since the user will already have ArcMap open
 try:
@@ -35,404 +79,411 @@ OS_USER = getpass.getuser()
 USER = "".join([i for i in OS_USER if not i.isdigit()])
 RUN_TIME = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S %p")
 
-
-def mainFunction(mxd):
-    def lyrDescriptions(l):
+# Layers excluded when no exclusion rules are configured.
+DEFAULT_EXCLUSIONS = {"layerTypes": ["isBasemapLayer"]}
+
+# Output columns filled from a file system check of each data source.
+HEALTH_COLUMNS = ["Data_Source_Exists", "Data_Source_Size_MB", "Data_Source_Modified"]
+
+# Keys of the normalized output tables.
+TABLE_KEYS = [
+    TableKey("projects", "project_id", [], "MXD_Path"),
+    TableKey("maps", "map_id", [("project_id", "projects")], None),
+    TableKey("layers", "layer_id", [("map_id", "maps")], None),
+    TableKey("fields", "field_id", [("layer_id", "layers")], None),
+]
+
+# Output columns that need arcpy.Describe() or arcpy.Raster(). These calls
+# are skipped when none of their columns are selected.
+DESCRIBE_COLUMNS = [
+    "Layer_Basename",
+    "Layer_Type",
+    "File_Extension",
+    "Layer_Catalog_Path",
+    "Field_Names",
+    "Feature_Type",
+    "Shape_Type",
+    "Has_Z",
+    "Has_Spatial_Index",
+    "Layer_File",
+    "Layer_Path",
+    "Coordinate_Type",
+    "GCS_Name",
+    "GCS_Code",
+    "PCS_Name",
+    "PCS_Code",
+    "Linear_Unit_Name",
+    "Linear_Unit_Code",
+    "Datum_Name",
+    "Datum_Code",
+    "Spheroid_Name",
+    "Spheroid_Code",
+    "Layer_Description",
+    "Layer_Extent_JSON",
+]
+RASTER_COLUMNS = [
+    "Raster_Format",
+    "Raster_Band_Count",
+    "Raster_Compression_Type",
+    "Raster_Size_MB",
+    "Raster_Cell_Width",
+    "Raster_Cell_Height",
+    "Raster_Cell_Min",
+    "Raster_Cell_Max",
+    "Raster_Cell_Mean",
+    "Raster_NoData_Fraction",
+    "Raster_Extent_JSON",
+]
+# Output columns filled by the optional layer profile (see layer_profile.py).
+PROFILE_COLUMNS = ["Row_Count", "Field_Profile"]
+# Columns needed to write layer footprints to a GeoPackage.
+FOOTPRINT_COLUMNS = [
+    "Layer_Extent_JSON",
+    "Raster_Extent_JSON",
+    "GCS_Code",
+    "PCS_Code",
+    "Coordinate_Type",
+]
+
+# Keys of each layer's metadata, in order.
+LAYER_COLUMNS = [
+    "Data_Frame",
+    "Layer_Basename",
+    "Layer_Type",
+    "File_Extension",
+    "Layer_Catalog_Path",
+    "Layer_DefinitionQuery_Supported",
+    "Layer_DefinitionQuery",
+    "Field_Names",
+    "Feature_Type",
+    "Shape_Type",
+    "Has_Z",
+    "Has_Spatial_Index",
+    "Layer_File",
+    "Layer_Path",
+    "Coordinate_Type",
+    "GCS_Name",
+    "GCS_Code",
+    "PCS_Name",
+    "PCS_Code",
+    "Linear_Unit_Name",
+    "Linear_Unit_Code",
+    "Datum_Name",
+    "Datum_Code",
+    "Spheroid_Name",
+    "Spheroid_Code",
+    "Layer_Description",
+    "Raster_Format",
+    "Raster_Band_Count",
+    "Raster_Compression_Type",
+    "Raster_Size_MB",
+    "Raster_Cell_Width",
+    "Raster_Cell_Height",
+    "Raster_Cell_Min",
+    "Raster_Cell_Max",
+    "Raster_Cell_Mean",
+    "Raster_Extent_JSON",
+    # Added after the original layout.
+    "Layer_Data_Source",
+    "Layer_Is_Broken",
+    "Probe_Status",
+    "Row_Count",
+    "Field_Profile",
+    "Raster_NoData_Fraction",
+    "Layer_Extent_JSON",
+]
+# (scan_engine name, column) of the properties read from Describe.
+DATASET_COLUMNS = [
+    ("baseName", "Layer_Basename"),
+    ("dataType", "Layer_Type"),
+    ("catalogPath", "Layer_Catalog_Path"),
+    ("fieldNames", "Field_Names"),
+    ("featureType", "Feature_Type"),
+    ("shapeType", "Shape_Type"),
+    ("file", "Layer_File"),
+    ("path", "Layer_Path"),
+]
+# (name, code, name column, code column) of each coordinate system part.
+SPATIAL_COLUMNS = [
+    ("GCSName", "GCSCode", "GCS_Name", "GCS_Code"),
+    ("PCSName", "PCSCode", "PCS_Name", "PCS_Code"),
+    ("linearUnitName", "linearUnitCode", "Linear_Unit_Name", "Linear_Unit_Code"),
+    ("datumName", "datumCode", "Datum_Name", "Datum_Code"),
+    ("spheroidName", "spheroidCode", "Spheroid_Name", "Spheroid_Code"),
+]
+# (scan_engine name, column) of the raster properties and statistics.
+RASTER_PROPERTY_COLUMNS = [
+    ("format", "Raster_Format"),
+    ("bandCount", "Raster_Band_Count"),
+    ("compressionType", "Raster_Compression_Type"),
+    ("cellWidth", "Raster_Cell_Width"),
+    ("cellHeight", "Raster_Cell_Height"),
+    ("minimum", "Raster_Cell_Min"),
+    ("maximum", "Raster_Cell_Max"),
+    ("mean", "Raster_Cell_Mean"),
+    ("nodataFraction", "Raster_NoData_Fraction"),
+]
+
+
+def mainFunction(mxd, columns=None, context=None):
+    def lyrDescriptions(l, frame):
+        lyr = dict((column, "") for column in LAYER_COLUMNS)
+        lyr["Data_Frame"] = frame.name
+        if l.supports("DATASOURCE"):
+            lyr["Layer_Data_Source"] = l.dataSource
         try:
-            desc = arcpy.Describe(l)
+            lyr["Layer_Is_Broken"] = l.isBroken
         except Exception:
+            pass
+        source = lyr["Layer_Data_Source"]
+
+        probe_status = STATUS_OK
+        desc = None
+        if wants(columns, DESCRIBE_COLUMNS + RASTER_COLUMNS):
             try:
-                meta.update(
-                    {
-                        str(l.name): {
-                            "Data_Frame": frame.name,
-                            "Layer_Basename": "",
-                            "Layer_Type": "",
-                            "File_Extension": "",
-                            "Layer_Catalog_Path": "",
-                            "Layer_DefinitionQuery_Supported": "",
-                            "Layer_DefinitionQuery": "",
-                            "Field_Names": "",
-                            "Feature_Type": "",
-                            "Shape_Type": "",
-                            "Has_Z": "",
-                            "Has_Spatial_Index": "",
-                            "Layer_File": "",
-                            "Layer_Path": "",
-                            "Coordinate_Type": "",
-                            "GCS_Name": "",
-                            "GCS_Code": "",
-                            "PCS_Name": "",
-                            "PCS_Code": "",
-                            "Linear_Unit_Name": "",
-                            "Linear_Unit_Code": "",
-                            "Datum_Name": "",
-                            "Datum_Code": "",
-                            "Spheroid_Name": "",
-                            "Spheroid_Code": "",
-                            "Layer_Description": "",
-                            "Raster_Format": "",
-                            "Raster_Band_Count": "",
-                            "Raster_Compression_Type": "",
-                            "Raster_Size_MB": "",
-                            "Raster_Cell_Width": "",
-                            "Raster_Cell_Height": "",
-                            "Raster_Cell_Min": "",
-                            "Raster_Cell_Max": "",
-                            "Raster_Cell_Mean": "",
-                            "Raster_Extent_JSON": "",
-                        }
-                    }
-                )
+                desc, probe_status = context.probe(source, arcpy.Describe, l)
             except Exception:
+                desc = None
+            if desc is None:
+                undescribed.add(str(l.name))
+                lyr["Probe_Status"] = probe_status
+                meta[str(l.name)] = strings.intern_row(lyr)
                 return
-            return
-
-        if hasattr(desc, "fieldInfo"):
-            field_info = desc.fieldInfo
-            fieldNames = [
-                str(field_info.getFieldName(index))
-                for index in range(0, field_info.count)
-            ]
-            fieldNameStr = ""
-            for field in fieldNames:
-                if field == fieldNames[-1]:
-                    fieldNameStr = fieldNameStr + field
-                else:
-                    fieldNameStr = fieldNameStr + "{};".format(field)
-        else:
-            fieldNameStr = ""
-
-        if hasattr(desc, "featureType"):
-            feature_type = desc.featureType
-        else:
-            feature_type = ""
-
-        if hasattr(desc, "shapeType"):
-            shape_type = desc.shapeType
-        else:
-            shape_type = ""
-
-        if hasattr(desc, "hasZ"):
-            has_z = desc.hasZ
-        else:
-            has_z = False
-
-        if hasattr(desc, "hasSpatialIndex"):
-            has_spat_index = desc.hasSpatialIndex
-        else:
-            has_spat_index = False
 
         try:
             lyr_name = l.longName
         except Exception:
-            lyr_name = desc.nameString
+            lyr_name = desc.nameString if desc else l.name
 
-        if hasattr(desc, "file"):
-            lyr_file = desc.file
+        if l.supports("DEFINITIONQUERY"):
+            lyr["Layer_DefinitionQuery_Supported"] = True
+            if l.definitionQuery != "":
+                lyr["Layer_DefinitionQuery"] = str(l.definitionQuery)
         else:
-            lyr_file = ""
-
-        if hasattr(desc, "path"):
-            lyr_path = desc.path
-        else:
-            lyr_path = ""
-
-        if hasattr(desc, "extension"):
-            lyr_extension = desc.extension
-            if lyr_extension == "":
-                lyr_extension = "gdb"
-        else:
-            lyr_extension = ""
-
-        if hasattr(desc, "dataType"):
-            lyr_dtype = desc.dataType
-        else:
-            lyr_dtype = ""
-
-        if hasattr(desc, "baseName"):
-            lyr_basename = desc.baseName
-        else:
-            lyr_basename = ""
-
-        if hasattr(desc, "catalogPath"):
-            lyr_catpath = desc.catalogPath
-        else:
-            lyr_catpath = ""
-
-        if lyr.supports("DEFINITIONQUERY"):
-            lyrDefSupport = True
-            if lyr.definitionQuery == "":
-                lyrDef = ""
-            else:
-                lyrDef = str(lyr.definitionQuery)
-        else:
-            lyrDefSupport = False
-            lyrDef = ""
-
+            lyr["Layer_DefinitionQuery_Supported"] = False
+
+        d = describe_dataset(desc) if desc is not None else {}
+        for key, column in DATASET_COLUMNS:
+            lyr[column] = d.get(key, "")
+        lyr["Has_Z"] = d.get("hasZ", False)
+        lyr["Has_Spatial_Index"] = d.get("hasSpatialIndex", False)
+        if "extension" in d:
+            lyr["File_Extension"] = d["extension"] or "gdb"
         if hasattr(desc, "description"):
-            lyr_description = lyr.description
-        else:
-            lyr_description = ""
-
-        try:
-            lyr_coordType = desc.spatialReference.type
-        except Exception:
-            lyr_coordType = ""
-
-        try:
-            lyr_GCSName = desc.spatialReference.GCSName
-            if lyr_GCSName == "":
-                lyr_GCSCode = ""
-            else:
-                lyr_GCSCode = desc.spatialReference.GCSCode
-        except Exception:
-            lyr_GCSName = ""
-            lyr_GCSCode = ""
-
-        try:
-            lyr_PCSName = desc.spatialReference.PCSName
-            if lyr_PCSName == "":
-                lyr_PCSCode = ""
-            else:
-                lyr_PCSCode = desc.spatialReference.PCSCode
-        except Exception:
-            lyr_PCSName = ""
-            lyr_PCSCode = ""
-
-        try:
-            lyr_datumName = desc.spatialReference.datumName
-            if lyr_datumName == "":
-                lyr_datumCode = ""
-            else:
-                lyr_datumCode = desc.spatialReference.datumCode
-        except Exception:
-            lyr_datumName = ""
-            lyr_datumCode = ""
-
-        try:
-            lyr_spheroidName = desc.spatialReference.spheroidName
-            if lyr_spheroidName == "":
-                lyr_spheroidCode = ""
-            else:
-                lyr_spheroidCode = desc.spatialReference.spheroidCode
-        except Exception:
-            lyr_spheroidName = ""
-            lyr_spheroidCode = ""
-
-        try:
-            lyr_coord_unit = desc.spatialReference.linearUnitName
-            if lyr_coord_unit == "":
-                lyr_coord_unit_code = ""
-            else:
-                lyr_coord_unit_code = desc.spatialReference.linearUnitCode
-        except Exception:
-            lyr_coord_unit = ""
-            lyr_coord_unit_code = ""
-
-        if l.isRasterLayer:
-            raster = arcpy.Raster(lyr_catpath)
+            lyr["Layer_Description"] = l.description
+        sr = d.get("spatialReference", {})
+        lyr["Coordinate_Type"] = sr.get("coordType", "")
+        for name_key, code_key, name_column, code_column in SPATIAL_COLUMNS:
+            lyr[name_column] = sr.get(name_key, "")
+            if lyr[name_column] != "":
+                lyr[code_column] = sr.get(code_key, "")
+        lyr["Layer_Extent_JSON"] = d.get("extent", {}).get("extentJSON", "")
+
+        if l.isRasterLayer and wants(columns, RASTER_COLUMNS):
+            catalog_path = lyr["Layer_Catalog_Path"]
             try:
-                raster_format = raster.format
+                raster, status = context.probe(source, arcpy.Raster, catalog_path)
             except Exception:
-                raster_format = ""
-
+                raster, status = None, STATUS_OK
+            if status != STATUS_OK:
+                probe_status = status
+            if raster is not None:
+                r = raster_properties(raster)
+                # Stored statistics, or computed block by block when missing,
+                # without the probe deadline.
+                try:
+                    stats, status = context.run(
+                        source, context.raster_stats.statistics, raster, catalog_path
+                    )
+                except Exception:
+                    stats, status = None, STATUS_OK
+                if status != STATUS_OK:
+                    probe_status = status
+                r.update(stats or {})
+                for key, column in RASTER_PROPERTY_COLUMNS:
+                    if r.get(key) is not None:
+                        lyr[column] = r[key]
+                if r.get("uncompressedSize") is not None:
+                    # Byte --> Megabyte
+                    lyr["Raster_Size_MB"] = float(r["uncompressedSize"]) / 1000000
+                lyr["Raster_Extent_JSON"] = r["extent"].get("extentJSON", "")
+
+        if (
+            context.profiler is not None
+            and l.isFeatureLayer
+            and source
+            and wants(columns, PROFILE_COLUMNS)
+        ):
+            # Without the probe deadline, like the raster statistics.
             try:
-                raster_bands = raster.bandCount
+                profile, status = context.run(source, context.profiler.profile, source)
             except Exception:
-                raster_bannds = ""
-
-            try:
-                raster_compression = raster.compressionType
-            except Exception:
-                raster_compression = ""
+                profile, status = None, STATUS_OK
+            if status != STATUS_OK:
+                probe_status = status
+            if profile is not None:
+                lyr["Row_Count"] = profile["rowCount"]
+                lyr["Field_Profile"] = json.dumps(profile["fields"])
+
+        lyr["Probe_Status"] = probe_status
+        meta[str(lyr_name)] = strings.intern_row(lyr)
+
+    if context is None:
+        context = ScanContext(ExclusionRules(DEFAULT_EXCLUSIONS))
+    meta = {}
+    strings = StringPool()
+    undescribed = set()
+    df_index = 0
+    for frame in arcpy.mapping.ListDataFrames(mxd, "*"):
+        for lyr in iter_layers(arcpy.mapping.ListLayers(mxd, "", frame), context.rules):
+            lyrDescriptions(lyr, frame)
+        df_index += 1
 
-            try:
-                raster_size = (
-                    float(raster.uncompressedSize) / 1000000
-                )  # Byte --> Megabyte
-            except Exception:
-                raster_size = ""
+    if wants(columns, HEALTH_COLUMNS):
+        arcpy.AddMessage("Checking data sources on disk")
+        source_health(meta, context.health)
 
-            try:
-                raster_cell_width = raster.meanCellWidth
-            except Exception:
-                raster_cell_width = ""
+    if wants(columns, ["Repair_Candidates"]):
+        repair_candidates(meta, context.repair, undescribed)
 
-            try:
-                raster_cell_height = raster.meanCellHeight
-            except Exception:
-                raster_cell_height = ""
-
-            try:
-                raster_cell_min = raster.minimum
-            except Exception:
-                raster_cell_min = ""
+    arcpy.AddMessage("\n")
+    arcpy.AddMessage("Total dataframes: {}".format(df_index))
+    arcpy.AddMessage("Total layers: {}".format(len(meta)))
+    for line in context.summary():
+        arcpy.AddMessage(line)
 
-            try:
-                raster_cell_max = raster.maximum
-            except Exception:
-                raster_cell_max = ""
+    return meta
 
-            try:
-                raster_cell_mean = raster.mean
-            except Exception:
-                raster_cell_mean = ""
 
-            try:
-                raster_extent = raster.extent.JSON
-            except Exception:
-                raster_extent = ""
-        else:
-            raster_format = ""
-            raster_bands = ""
-            raster_format = ""
-            raster_bands = ""
-            raster_compression = ""
-            raster_size = ""
-            raster_cell_width = ""
-            raster_cell_height = ""
-            raster_cell_min = ""
-            raster_cell_max = ""
-            raster_cell_mean = ""
-            raster_extent = ""
-
-        meta.update(
+def source_health(meta, health=None):
+    """Add the existence, size, and modified time of each layer data source
+    on disk to the layer metadata. Each data source directory is listed once.
+
+    Args:
+        meta (dict): Layer metadata returned from mainFunction().
+        health (SourceHealth, optional): Directory listings of the scan run.
+            Defaults to a new SourceHealth.
+    """
+    results = (health or SourceHealth()).check(
+        [lyr["Layer_Data_Source"] for lyr in meta.values()]
+    )
+    for lyr in meta.values():
+        result = results.get(lyr["Layer_Data_Source"])
+        if result is None:
+            result = {"exists": "", "size": "", "modified": ""}
+        size_mb = result["size"]
+        if size_mb != "":
+            size_mb = float(size_mb) / 1000000  # Byte --> Megabyte
+        lyr.update(
             {
-                str(lyr_name): {
-                    "Data_Frame": frame.name,
-                    "Layer_Basename": lyr_basename,
-                    "Layer_Type": lyr_dtype,
-                    "File_Extension": lyr_extension,
-                    "Layer_Catalog_Path": lyr_catpath,
-                    "Layer_DefinitionQuery_Supported": lyrDefSupport,
-                    "Layer_DefinitionQuery": lyrDef,
-                    "Field_Names": fieldNameStr,
-                    "Feature_Type": feature_type,
-                    "Shape_Type": shape_type,
-                    "Has_Z": has_z,
-                    "Has_Spatial_Index": has_spat_index,
-                    "Layer_File": lyr_file,
-                    "Layer_Path": lyr_path,
-                    "Coordinate_Type": lyr_coordType,
-                    "GCS_Name": lyr_GCSName,
-                    "GCS_Code": lyr_GCSCode,
-                    "PCS_Name": lyr_PCSName,
-                    "PCS_Code": lyr_PCSCode,
-                    "Linear_Unit_Name": lyr_coord_unit,
-                    "Linear_Unit_Code": lyr_coord_unit_code,
-                    "Datum_Name": lyr_datumName,
-                    "Datum_Code": lyr_datumCode,
-                    "Spheroid_Name": lyr_spheroidName,
-                    "Spheroid_Code": lyr_spheroidCode,
-                    "Layer_Description": lyr_description,
-                    "Raster_Format": raster_format,
-                    "Raster_Band_Count": raster_bands,
-                    "Raster_Compression_Type": raster_compression,
-                    "Raster_Size_MB": raster_size,
-                    "Raster_Cell_Width": raster_cell_width,
-                    "Raster_Cell_Height": raster_cell_height,
-                    "Raster_Cell_Min": raster_cell_min,
-                    "Raster_Cell_Max": raster_cell_max,
-                    "Raster_Cell_Mean": raster_cell_mean,
-                    "Raster_Extent_JSON": raster_extent,
-                }
+                "Data_Source_Exists": result["exists"],
+                "Data_Source_Size_MB": size_mb,
+                "Data_Source_Modified": result["modified"],
             }
         )
 
-    meta = {}
-    cur_mxd = mxd
-    df = arcpy.mapping.ListDataFrames(cur_mxd, "*")
-    df_index = 0
-    for frame in df:
-        for lyr in arcpy.mapping.ListLayers(cur_mxd, "", frame):
-            if lyr.isBasemapLayer:
-                pass
-            else:
-                if lyr.isGroupLayer:
-                    for glyr in lyr:
-                        if glyr.isBasemapLayer:
-                            pass
-                        else:
-                            if glyr.isGroupLayer:
-                                for g2lyr in glyr:
-                                    if g2lyr.isBasemapLayer:
-                                        pass
-                                    else:
-                                        if g2lyr.isGroupLayer:
-                                            for g3lyr in g2lyr:
-                                                if g3lyr.isBasemapLayer:
-                                                    pass
-                                                else:
-                                                    if g3lyr.isGroupLayer:
-                                                        for g4lyr in g3lyr:
-                                                            if g4lyr.isBasemapLayer:
-                                                                pass
-                                                            else:
-                                                                if g4lyr.isGroupLayer:
-                                                                    for g5lyr in g4lyr:
-                                                                        if (
-                                                                            g5lyr.isBasemapLayer
-                                                                        ):
-                                                                            pass
-                                                                        else:
-                                                                            if (
-                                                                                g5lyr.isGroupLayer
-                                                                            ):
-                                                                                for g6lyr in g5lyr:
-                                                                                    if (
-                                                                                        g6lyr.isBasemapLayer
-                                                                                    ):
-                                                                                        pass
-                                                                                    else:
-                                                                                        try:
-                                                                                            lyrDescriptions(
-                                                                                                g6lyr
-                                                                                            )
-                                                                                        except Exception:
-                                                                                            arcpy.AddWarning(
-                                                                                                "> 6 nested groups present. Skipping those."
-                                                                                            )
-                                                                                            pass
-                                                                            else:
-                                                                                lyrDescriptions(
-                                                                                    g5lyr
-                                                                                )
-                                                                else:
-                                                                    lyrDescriptions(
-                                                                        g4lyr
-                                                                    )
-                                                    else:
-                                                        lyrDescriptions(g3lyr)
-                                        else:
-                                            lyrDescriptions(g2lyr)
-                            else:
-                                lyrDescriptions(glyr)
-                else:
-                    lyrDescriptions(lyr)
-        df_index += 1
 
-    arcpy.AddMessage("\n")
-    arcpy.AddMessage("Total dataframes: {}".format(df_index))
-    lyr_count = 0
-    for lyr in meta:
-        lyr_count += 1
-    arcpy.AddMessage("Total layers: {}".format(lyr_count))
-
-    return meta
+def repair_candidates(meta, repair, undescribed):
+    """Add suggested repair paths to broken layers and layers that could not
+    be described.
+
+    Args:
+        meta (dict): Layer metadata returned from mainFunction().
+        repair (RepairIndex): Repair index, or None to leave the column empty.
+        undescribed (set): Names of layers where arcpy.Describe() failed.
+    """
+    for name, lyr in meta.items():
+        candidates = ""
+        if repair is not None and (
+            lyr["Layer_Is_Broken"] is True or name in undescribed
+        ):
+            candidates = ";".join(repair.suggest(lyr["Layer_Data_Source"]))
+        lyr["Repair_Candidates"] = candidates
+
+
+def relational_tables(mxdPath, mxdMeta):
+    """Split layer metadata into normalized tables, so that data frame
+    attributes are stored once instead of on every layer row.
+
+    Args:
+        mxdPath (str): MXD file path.
+        mxdMeta (dict): Layer metadata returned from mainFunction().
+
+    Returns:
+        dict: Row dicts for each table in TABLE_KEYS, keyed by table name.
+    """
+    tables = dict((key.table, []) for key in TABLE_KEYS)
+    tables["projects"].append(
+        {
+            "project_id": 1,
+            "MXD_Path": mxdPath,
+            "Script_User": USER,
+            "Script_Run_Time": RUN_TIME,
+        }
+    )
+    map_ids = {}
+    for name in sorted(mxdMeta.keys()):
+        lyr = mxdMeta[name]
+        frame = lyr["Data_Frame"]
+        if frame not in map_ids:
+            map_ids[frame] = len(tables["maps"]) + 1
+            tables["maps"].append(
+                {"map_id": map_ids[frame], "project_id": 1, "Data_Frame": frame}
+            )
+        layer = {"layer_id": len(tables["layers"]) + 1, "map_id": map_ids[frame]}
+        layer["Layer_Name"] = name
+        for key, value in lyr.items():
+            if key not in ("Data_Frame", "Field_Names", "Field_Profile"):
+                layer[key] = value
+        tables["layers"].append(layer)
+        profile = json.loads(lyr.get("Field_Profile") or "{}")
+        for position, field in split_fields(lyr.get("Field_Names")):
+            row = {
+                "field_id": len(tables["fields"]) + 1,
+                "layer_id": layer["layer_id"],
+                "Position": position,
+                "Field_Name": field,
+            }
+            if field in profile:
+                row["Null_Rate"] = profile[field]["nullRate"]
+                row["Minimum"] = profile[field]["min"]
+                row["Maximum"] = profile[field]["max"]
+            tables["fields"].append(row)
+    return tables
+
+
+def write_tables(mxdName, mxdPath, mxdMeta, csvPath, outputFormat):
+    """Export normalized tables to CSV files or a SQLite inventory.
+
+    Args:
+        mxdName (str): MXD name, used as the CSV file name prefix.
+        mxdPath (str): MXD file path.
+        mxdMeta (dict): Layer metadata returned from mainFunction().
+        csvPath (str): Output directory.
+        outputFormat (str): CSV_TABLES or SQLITE.
+
+    Returns:
+        list: Output files created.
+    """
+    if csvPath == "":
+        csvPath = "H:\\"
+    tables = relational_tables(mxdPath, mxdMeta)
+    try:
+        if outputFormat == "SQLITE":
+            return [
+                write_sqlite(tables, TABLE_KEYS, os.path.join(csvPath, INVENTORY_DB))
+            ]
+        return write_csv_tables(tables, csvPath, mxdName)
+    except Exception:
+        arcpy.AddError("Error writing output tables")
+        raise
 
 
-def write_output(mxdName, mxdMeta, csvPath):
+def write_output(mxdName, mxdMeta, csvPath, columns=None, outputFormat="CSV"):
+    extension = COLUMNAR_FORMATS.get(outputFormat, ".csv")
     if csvPath == "":
-        fPath = "H:\{}.csv".format(mxdName)
-    else:
-        fPath = os.path.join(csvPath, mxdName + ".csv")
-
-    if os.path.exists(fPath):
-        try:
-            os.remove(fPath)
-        except Exception:
-            sys.exit()
+        csvPath = "H:\\"
+    fPath = os.path.join(csvPath, mxdName + extension)
 
     headers = [
         "Layer_Name",
@@ -471,42 +522,218 @@ def write_output(mxdName, mxdMeta, csvPath):
         "Raster_Cell_Mean",
         "Raster_Extent_JSON",
         "Layer_Description",
+        # Columns added after the original layout go here, so that readers of
+        # earlier outputs keep their column positions.
+        "Layer_Data_Source",
+        "Layer_Is_Broken",
+        "Probe_Status",
+        "Repair_Candidates",
+        "Data_Source_Exists",
+        "Data_Source_Size_MB",
+        "Data_Source_Modified",
+        "Row_Count",
+        "Field_Profile",
+        "Raster_NoData_Fraction",
+        "Layer_Extent_JSON",
         "Script_User",
         "Script_Run_Time",
     ]
+    headers = [
+        header
+        for header in headers
+        if header in ("Layer_Name", "Script_User", "Script_Run_Time")
+        or wants(columns, [header])
+    ]
+
+    def rows():
+        for lyr in sorted(mxdMeta.keys()):
+            row = []
+            for header in headers:
+                if header == "Layer_Name":
+                    row.append(lyr)
+                elif header == "Script_User":
+                    row.append(USER)
+                elif header == "Script_Run_Time":
+                    row.append(RUN_TIME)
+                else:
+                    row.append(mxdMeta[lyr][header])
+            yield row
+
+    if outputFormat in COLUMNAR_FORMATS:
+        try:
+            write_columnar(
+                (dict(zip(headers, row)) for row in rows()),
+                headers,
+                fPath,
+                outputFormat,
+            )
+        except Exception as e:
+            arcpy.AddError("Error writing to {}: {}".format(outputFormat, e))
+            raise
+        return fPath
 
     try:
-        with open(fPath, "wb") as f:
+        with atomic_open(fPath) as f:
             f_writer = csv.writer(
                 f, delimiter=",", quotechar='"', quoting=csv.QUOTE_MINIMAL
             )
             f_writer.writerow(headers)
-            for lyr in sorted(mxdMeta.keys()):
-                row = []
-                for header in headers:
-                    if header == "Layer_Name":
-                        row.append(lyr)
-                    elif header == "Script_User":
-                        row.append(USER)
-                    elif header == "Script_Run_Time":
-                        row.append(RUN_TIME)
-                    else:
-                        row.append(mxdMeta[lyr][header])
+            for row in rows():
                 f_writer.writerow(row)
     except Exception:
         arcpy.AddError("Error writing to CSV")
-        sys.exit()
+        raise
     return fPath
 
 
+def srs_definition(code):
+    """Get the name and WKT definition of a coordinate system.
+
+    Args:
+        code (int): Coordinate system factory code (WKID).
+
+    Returns:
+        tuple: (name, WKT).
+    """
+    sr = arcpy.SpatialReference(code)
+    # exportToString() appends the XY, Z, and M domains after the WKT.
+    return sr.name, sr.exportToString().split(";")[0]
+
+
+def layer_extent(lyr):
+    """Read a layer's extent from its Layer_Extent_JSON, or for rasters its
+    Raster_Extent_JSON.
+
+    Args:
+        lyr (dict): Layer metadata from mainFunction().
+
+    Returns:
+        tuple: (spatial reference id, (xmin, ymin, xmax, ymax)), or None if
+            the layer has no extent.
+    """
+    text = lyr.get("Layer_Extent_JSON") or lyr.get("Raster_Extent_JSON")
+    if not text:
+        return None
+    try:
+        extent = json.loads(text)
+        bounds = tuple(float(extent[key]) for key in ("xmin", "ymin", "xmax", "ymax"))
+    except (ValueError, TypeError, KeyError):
+        return None
+    sr = extent.get("spatialReference") or {}
+    srs_id = sr.get("latestWkid") or sr.get("wkid")
+    if not srs_id:
+        srs_id = lyr.get("PCS_Code") or lyr.get("GCS_Code")
+    if not srs_id:
+        # Undefined geographic (0) or Cartesian (-1) system.
+        srs_id = 0 if lyr.get("Coordinate_Type") == "Geographic" else -1
+    return srs_id, bounds
+
+
+def write_footprints(mxdPath, mxdMeta, csvPath):
+    """Write each layer's extent as a polygon feature, with the layer's
+    metadata, to the GeoPackage in the output directory. This MXD's existing
+    features are replaced.
+
+    Args:
+        mxdPath (str): MXD file path.
+        mxdMeta (dict): Layer metadata returned from mainFunction().
+        csvPath (str): Output directory.
+
+    Returns:
+        str: Output file created.
+    """
+    if csvPath == "":
+        csvPath = "H:\\"
+    fPath = os.path.join(csvPath, EXTENTS_GPKG)
+    skipped = 0
+    try:
+        with GeoPackageWriter(fPath, srs_definition) as gpkg:
+            gpkg.replace("MXD_Path", mxdPath)
+            for name in sorted(mxdMeta.keys()):
+                lyr = mxdMeta[name]
+                footprint = layer_extent(lyr)
+                if footprint is None:
+                    skipped += 1
+                    continue
+                attributes = {"MXD_Path": mxdPath, "Layer_Name": name}
+                attributes.update(lyr)
+                if not gpkg.write(footprint[0], footprint[1], attributes):
+                    skipped += 1
+    except Exception as e:
+        arcpy.AddError("Error writing to {}: {}".format(fPath, e))
+        raise
+    if skipped:
+        arcpy.AddMessage("Skipped {} layer(s) without an extent".format(skipped))
+    return fPath
+
+
+def export(
+    mxdPath, mxdMeta, csvPath, columns=None, outputFormat="CSV", unique_names=False
+):
+    """Write layer metadata in the selected output format.
+
+    Args:
+        mxdPath (str): MXD file path.
+        mxdMeta (dict): Layer metadata returned from mainFunction().
+        csvPath (str): Output directory.
+        columns (set, optional): Selected columns. Defaults to None (all).
+        outputFormat (str, optional): CSV, CSV_TABLES, SQLITE, PARQUET,
+            ARROW, or GPKG. Defaults to CSV.
+        unique_names (bool, optional): Add a hash of the MXD path to the
+            output file names (see scan_output.output_name()). Defaults to
+            False.
+
+    Returns:
+        list: Output files created.
+    """
+    mxdName = output_name(mxdPath, unique_names)
+    if outputFormat in ("CSV_TABLES", "SQLITE"):
+        outputs = write_tables(mxdName, mxdPath, mxdMeta, csvPath, outputFormat)
+    elif outputFormat == "GPKG":
+        outputs = [write_footprints(mxdPath, mxdMeta, csvPath)]
+    else:
+        outputs = [write_output(mxdName, mxdMeta, csvPath, columns, outputFormat)]
+        arcpy.AddMessage("{} generated".format(outputFormat))
+    for output_file in outputs:
+        arcpy.AddMessage("Output: {}".format(output_file))
+    return outputs
+
+
 if __name__ == "__main__":
     mxd = arcpy.mapping.MapDocument("CURRENT")
-    mxdMeta = mainFunction(mxd)
+    columns = parse_columns(arcpy.GetParameterAsText(1))
+    outputFormat = arcpy.GetParameterAsText(6) or "CSV"
+    if outputFormat == "GPKG" and columns is not None:
+        columns.update(FOOTPRINT_COLUMNS)
+    repair = None
+    if wants(columns, ["Repair_Candidates"]):
+        repair = open_index(arcpy.GetParameterAsText(3), arcpy.GetParameterAsText(4))
+    context = ScanContext.from_value(
+        arcpy.GetParameterAsText(2),
+        DEFAULT_EXCLUSIONS,
+        float(arcpy.GetParameterAsText(7) or TIMEOUT),
+        repair,
+    )
+    try:
+        mxdMeta = mainFunction(mxd, columns, context)
+    finally:
+        context.close()
     mxdPath = mxd.filePath
-    mxdBaseName = os.path.basename(mxdPath)
-    mxdName = os.path.splitext(mxdBaseName)[0]
+    usage_path = arcpy.GetParameterAsText(5)
+    if usage_path:
+        count = record_usage(
+            usage_path,
+            mxdPath,
+            [
+                (lyr["Data_Frame"], name, lyr["Layer_Data_Source"])
+                for name, lyr in mxdMeta.items()
+            ],
+        )
+        arcpy.AddMessage("Recorded {} data source(s) in usage index".format(count))
     csvPath = arcpy.GetParameterAsText(0)
-    output_file = write_output(mxdName, mxdMeta, csvPath)
-    arcpy.AddMessage("CSV generated")
-    arcpy.AddMessage("Output: {}".format(output_file))
+    try:
+        export(mxdPath, mxdMeta, csvPath, columns, outputFormat)
+    except Exception:
+        # The error was already reported by the writer.
+        sys.exit(1)
     arcpy.AddMessage("\n")
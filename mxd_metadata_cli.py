@@ -5,9 +5,18 @@
 #   Caleb Grant (CG)
 #
 # NOTES
-#   1) This script takes 1 argument and 1 optional argument
-#       - MXD path
-#       - *Output CSV directory
+#   1) Usage:
+#           python mxd_metadata_cli.py <mxd_path> [<output_csv_directory>]
+#               [--dry-run] [--timings PATH]
+#      The output directory defaults to H:\. Run with -h for help.
+#   2) Arguments, the MXD path, and the output directory (which must be
+#      writable) are checked before colorama, arcpy, and mxd_metadata.py
+#      are imported, so bad arguments fail in well under a second instead
+#      of after the arcpy startup.
+#   3) --dry-run reports the MXD and output file that would be scanned and
+#      written, without importing arcpy.
+#   4) The time taken by each deferred import is appended to a CSV log
+#      (TIMINGS, or --timings), so startup regressions can be tracked.
 #
 # HISTORY
 #   Date                Revision
@@ -16,682 +25,167 @@
 #   2020-07-22          Updated conditional check for object attributes (if they exist). CG.
 #                       Added multiple new layer attributes to output. CG.
 #                       Output sorted by first column in csv (Layer_Name). CG.
+#   2026-10-19          Scan with mxd_metadata.py instead of a copy of its code.
+#   2026-10-19          Parse arguments with argparse, check them before the
+#                       heavy imports, add --dry-run and import timings.
 #
 # ISSUES
-#   - Nested layer groups where > 6 nested groups are present
 #   - Layers pulled in through a connection
 # =========================================================================
 
-import csv
+import argparse
 import datetime
-import getpass
+import importlib
 import os
 import sys
+import tempfile
+import time
 
-from colorama import Fore, Style, init
+DEFAULT_OUTPUT = "H:\\"
+TIMINGS = os.path.join(os.path.expanduser("~"), "mxd_metadata_cli_timings.csv")
+TIMINGS_HEADER = "Run_Time,Python_Version,Module,Seconds\n"
 
-init(autoreset=True)
 
-OS_USER = getpass.getuser()
-USER = "".join([i for i in OS_USER if not i.isdigit()])
-RUN_TIME = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S %p")
+def writable(path):
+    """Check that files can be created in a directory.
 
+    Args:
+        path (str): Directory path.
 
-def CLI():
-    def CLI_Help():
-        print(
-            Style.BRIGHT
-            + Fore.BLUE
-            + "\n========================================================================================"
-        )
-        print(Style.BRIGHT + Fore.GREEN + "    HELP - ArcGIS MXD metadata compiler")
-        print(
-            Style.BRIGHT
-            + Fore.BLUE
-            + "========================================================================================"
-        )
-        print(
-            Style.BRIGHT
-            + Fore.CYAN
-            + "Usage"
-            + Fore.WHITE
-            + "  python <python_script_path> <mxd_path> <output_csv_path>"
-        )
-        print(
-            Style.BRIGHT
-            + Fore.CYAN
-            + "   or"
-            + Fore.WHITE
-            + "  python <python_script_path> <mxd_path>\n"
-        )
-        print(Style.BRIGHT + Fore.CYAN + "Arguments")
-        print(
-            Style.BRIGHT
-            + Fore.WHITE
-            + "    python_script_path:  Path to python script. No UNC allowed."
-        )
-        print(
-            Style.BRIGHT
-            + Fore.WHITE
-            + '                             Surround path in double quotes ("<path>") if spaces in path.'
-        )
-        print(
-            Style.BRIGHT
-            + Fore.WHITE
-            + "    mxd_path:            Path to .mxd file. No UNC allowed."
-        )
-        print(
-            Style.BRIGHT
-            + Fore.WHITE
-            + '                             Surround path in double quotes ("<path>") if spaces in path.'
-        )
-        print(
-            Style.BRIGHT
-            + Fore.WHITE
-            + "    output_csv_path:     Path of desired output CSV. No UNC allowed."
-        )
-        print(
-            Style.BRIGHT
-            + Fore.WHITE
-            + "                             Only include directory, no file name needed."
-        )
-        print(
-            Style.BRIGHT + Fore.WHITE + "                             DEFAULT: H:\ \n"
-        )
-        print(Style.BRIGHT + Fore.CYAN + "Options:")
-        print(Style.BRIGHT + Fore.WHITE + "    -h  : Show this help message and exit\n")
-        print(Style.BRIGHT + Fore.CYAN + "Known Issues:")
-        print(
-            Style.BRIGHT
-            + Fore.WHITE
-            + "    - Layer groups that are > 6 nested groups deep are not accounted for.\n"
-        )
-        print(Style.BRIGHT + Fore.CYAN + "Author(s):")
-        print(Style.BRIGHT + Fore.WHITE + "    Caleb Grant, Integral Consulting, Inc.")
-        print(
-            Style.BRIGHT
-            + Fore.BLUE
-            + "========================================================================================"
-        )
-        sys.exit()
-
-    def validate_mxd():
-        try:
-            if os.path.splitext(args[1])[1] == ".mxd":
-                if os.path.exists(args[1]):
-                    return True
-                else:
-                    return False
-            else:
-                return False
-        except:
-            return False
-
-    def validate_csv():
-        try:
-            if os.path.exists(args[2]):
-                return True
-            else:
-                return False
-        except:
-            return False
-
-    args = sys.argv
-    arg_count = len(args)
-    if len(args) == 2 and args[1] == "-h":
-        CLI_Help()
-
-    if len(args) < 2:
-        print(Style.BRIGHT + Fore.YELLOW + "\nWARNING: No arguments provided")
-        CLI_Help()
-    elif len(args) == 2:
-        valid_mxd = validate_mxd()
-        if valid_mxd == True:
-            return
-        else:
-            print(Style.BRIGHT + Fore.RED + "\nERROR: Invalid MXD path")
-            CLI_Help()
-    elif len(args) == 3:
-        valid_mxd = validate_mxd()
-        valid_csv = validate_csv()
-        if valid_mxd == True and valid_csv == True:
-            return
-        elif valid_mxd == False and valid_csv == True:
-            print(Style.BRIGHT + Fore.RED + "\nERROR: Invalid MXD path")
-            CLI_Help()
-        elif valid_mxd == True and valid_csv == False:
-            print(Style.BRIGHT + Fore.RED + "\nERROR: Invalid output CSV path")
-            CLI_Help()
-        else:
-            print(
-                Style.BRIGHT
-                + Fore.RED
-                + "\nERROR: Invalid MXD path and invalid output CSV path"
-            )
-            CLI_Help()
-    else:
-        print(Style.BRIGHT + Fore.RED + "\nERROR: Too many arguments provided.")
-        print(Style.BRIGHT + Fore.RED + "Only 3 arguments allowed")
-        print(
-            Style.BRIGHT
-            + Fore.RED
-            + "  *Unknown arguments: "
-            + Fore.WHITE
-            + "{}\n\n".format(args[3:])
-        )
-        CLI_Help()
-
-
-def mainFunction(mxd):
-    def lyrDescriptions(l):
-        try:
-            desc = arcpy.Describe(l)
-        except:
-            try:
-                meta.update(
-                    {
-                        str(l.name): {
-                            "Data_Frame": frame.name,
-                            "Layer_Basename": "",
-                            "Layer_Type": "",
-                            "File_Extension": "",
-                            "Layer_Catalog_Path": "",
-                            "Layer_DefinitionQuery_Supported": "",
-                            "Layer_DefinitionQuery": "",
-                            "Field_Names": "",
-                            "Feature_Type": "",
-                            "Shape_Type": "",
-                            "Has_Z": "",
-                            "Has_Spatial_Index": "",
-                            "Layer_File": "",
-                            "Layer_Path": "",
-                            "Coordinate_Type": "",
-                            "GCS_Name": "",
-                            "GCS_Code": "",
-                            "PCS_Name": "",
-                            "PCS_Code": "",
-                            "Linear_Unit_Name": "",
-                            "Linear_Unit_Code": "",
-                            "Datum_Name": "",
-                            "Datum_Code": "",
-                            "Spheroid_Name": "",
-                            "Spheroid_Code": "",
-                            "Layer_Description": "",
-                            "Raster_Format": "",
-                            "Raster_Band_Count": "",
-                            "Raster_Compression_Type": "",
-                            "Raster_Size_MB": "",
-                            "Raster_Cell_Width": "",
-                            "Raster_Cell_Height": "",
-                            "Raster_Cell_Min": "",
-                            "Raster_Cell_Max": "",
-                            "Raster_Cell_Mean": "",
-                            "Raster_Extent_JSON": "",
-                        }
-                    }
-                )
-                return
-            except:
-                return
-            return
-
-        if hasattr(desc, "fieldInfo"):
-            field_info = desc.fieldInfo
-            fieldNames = [
-                str(field_info.getFieldName(index))
-                for index in range(0, field_info.count)
-            ]
-            fieldNameStr = ""
-            for field in fieldNames:
-                if field == fieldNames[-1]:
-                    fieldNameStr = fieldNameStr + field
-                else:
-                    fieldNameStr = fieldNameStr + "{};".format(field)
-        else:
-            fieldNameStr = ""
-
-        if hasattr(desc, "featureType"):
-            feature_type = desc.featureType
-        else:
-            feature_type = ""
-
-        if hasattr(desc, "shapeType"):
-            shape_type = desc.shapeType
-        else:
-            shape_type = ""
-
-        if hasattr(desc, "hasZ"):
-            has_z = desc.hasZ
-        else:
-            has_z = False
-
-        if hasattr(desc, "hasSpatialIndex"):
-            has_spat_index = desc.hasSpatialIndex
-        else:
-            has_spat_index = False
-
-        try:
-            lyr_name = l.longName
-        except:
-            lyr_name = desc.nameString
-
-        if hasattr(desc, "file"):
-            lyr_file = desc.file
-        else:
-            lyr_file = ""
-
-        if hasattr(desc, "path"):
-            lyr_path = desc.path
-        else:
-            lyr_path = ""
-
-        if hasattr(desc, "extension"):
-            lyr_extension = desc.extension
-            if lyr_extension == "":
-                lyr_extension = "gdb"
-        else:
-            lyr_extension = ""
-
-        if hasattr(desc, "dataType"):
-            lyr_dtype = desc.dataType
-        else:
-            lyr_dtype = ""
-
-        if hasattr(desc, "baseName"):
-            lyr_basename = desc.baseName
-        else:
-            lyr_basename = ""
-
-        if hasattr(desc, "catalogPath"):
-            lyr_catpath = desc.catalogPath
-        else:
-            lyr_catpath = ""
-
-        if lyr.supports("DEFINITIONQUERY"):
-            lyrDefSupport = True
-            if lyr.definitionQuery == "":
-                lyrDef = ""
-            else:
-                lyrDef = str(lyr.definitionQuery)
-        else:
-            lyrDefSupport = False
-            lyrDef = ""
-
-        if hasattr(desc, "description"):
-            lyr_description = lyr.description
-        else:
-            lyr_description = ""
-
-        try:
-            lyr_coordType = desc.spatialReference.type
-        except:
-            lyr_coordType = ""
-
-        try:
-            lyr_GCSName = desc.spatialReference.GCSName
-            if lyr_GCSName == "":
-                lyr_GCSCode = ""
-            else:
-                lyr_GCSCode = desc.spatialReference.GCSCode
-        except:
-            lyr_GCSName = ""
-            lyr_GCSCode = ""
-
-        try:
-            lyr_PCSName = desc.spatialReference.PCSName
-            if lyr_PCSName == "":
-                lyr_PCSCode = ""
-            else:
-                lyr_PCSCode = desc.spatialReference.PCSCode
-        except:
-            lyr_PCSName = ""
-            lyr_PCSCode = ""
-
-        try:
-            lyr_datumName = desc.spatialReference.datumName
-            if lyr_datumName == "":
-                lyr_datumCode = ""
-            else:
-                lyr_datumCode = desc.spatialReference.datumCode
-        except:
-            lyr_datumName = ""
-            lyr_datumCode = ""
-
-        try:
-            lyr_spheroidName = desc.spatialReference.spheroidName
-            if lyr_spheroidName == "":
-                lyr_spheroidCode = ""
-            else:
-                lyr_spheroidCode = desc.spatialReference.spheroidCode
-        except:
-            lyr_spheroidName = ""
-            lyr_spheroidCode = ""
-
-        try:
-            lyr_coord_unit = desc.spatialReference.linearUnitName
-            if lyr_coord_unit == "":
-                lyr_coord_unit_code = ""
-            else:
-                lyr_coord_unit_code = desc.spatialReference.linearUnitCode
-        except:
-            lyr_coord_unit = ""
-            lyr_coord_unit_code = ""
-
-        if l.isRasterLayer:
-            raster = arcpy.Raster(lyr_catpath)
-            try:
-                raster_format = raster.format
-            except:
-                raster_format = ""
-
-            try:
-                raster_bands = raster.bandCount
-            except:
-                raster_bannds = ""
-
-            try:
-                raster_compression = raster.compressionType
-            except:
-                raster_compression = ""
-
-            try:
-                raster_size = (
-                    float(raster.uncompressedSize) / 1000000
-                )  # Byte --> Megabyte
-            except:
-                raster_size = ""
-
-            try:
-                raster_cell_width = raster.meanCellWidth
-            except:
-                raster_cell_width = ""
-
-            try:
-                raster_cell_height = raster.meanCellHeight
-            except:
-                raster_cell_height = ""
-
-            try:
-                raster_cell_min = raster.minimum
-            except:
-                raster_cell_min = ""
-
-            try:
-                raster_cell_max = raster.maximum
-            except:
-                raster_cell_max = ""
-
-            try:
-                raster_cell_mean = raster.mean
-            except:
-                raster_cell_mean = ""
-
-            try:
-                raster_extent = raster.extent.JSON
-            except:
-                raster_extent = ""
-        else:
-            raster_format = ""
-            raster_bands = ""
-            raster_format = ""
-            raster_bands = ""
-            raster_compression = ""
-            raster_size = ""
-            raster_cell_width = ""
-            raster_cell_height = ""
-            raster_cell_min = ""
-            raster_cell_max = ""
-            raster_cell_mean = ""
-            raster_extent = ""
-
-        meta.update(
-            {
-                str(lyr_name): {
-                    "Data_Frame": frame.name,
-                    "Layer_Basename": lyr_basename,
-                    "Layer_Type": lyr_dtype,
-                    "File_Extension": lyr_extension,
-                    "Layer_Catalog_Path": lyr_catpath,
-                    "Layer_DefinitionQuery_Supported": lyrDefSupport,
-                    "Layer_DefinitionQuery": lyrDef,
-                    "Field_Names": fieldNameStr,
-                    "Feature_Type": feature_type,
-                    "Shape_Type": shape_type,
-                    "Has_Z": has_z,
-                    "Has_Spatial_Index": has_spat_index,
-                    "Layer_File": lyr_file,
-                    "Layer_Path": lyr_path,
-                    "Coordinate_Type": lyr_coordType,
-                    "GCS_Name": lyr_GCSName,
-                    "GCS_Code": lyr_GCSCode,
-                    "PCS_Name": lyr_PCSName,
-                    "PCS_Code": lyr_PCSCode,
-                    "Linear_Unit_Name": lyr_coord_unit,
-                    "Linear_Unit_Code": lyr_coord_unit_code,
-                    "Datum_Name": lyr_datumName,
-                    "Datum_Code": lyr_datumCode,
-                    "Spheroid_Name": lyr_spheroidName,
-                    "Spheroid_Code": lyr_spheroidCode,
-                    "Layer_Description": lyr_description,
-                    "Raster_Format": raster_format,
-                    "Raster_Band_Count": raster_bands,
-                    "Raster_Compression_Type": raster_compression,
-                    "Raster_Size_MB": raster_size,
-                    "Raster_Cell_Width": raster_cell_width,
-                    "Raster_Cell_Height": raster_cell_height,
-                    "Raster_Cell_Min": raster_cell_min,
-                    "Raster_Cell_Max": raster_cell_max,
-                    "Raster_Cell_Mean": raster_cell_mean,
-                    "Raster_Extent_JSON": raster_extent,
-                }
-            }
-        )
-
-    meta = {}
-    cur_mxd = arcpy.mapping.MapDocument(mxd)
-    df = arcpy.mapping.ListDataFrames(cur_mxd, "*")
-    df_index = 0
-    for frame in df:
-        print(
-            Style.BRIGHT
-            + Fore.WHITE
-            + "Scanning layers in dataframe: "
-            + Style.DIM
-            + "{}".format(frame.name)
-        )
-        for lyr in arcpy.mapping.ListLayers(cur_mxd, "", frame):
-            if lyr.isBasemapLayer:
-                pass
-            else:
-                if lyr.isGroupLayer:
-                    for glyr in lyr:
-                        if glyr.isBasemapLayer:
-                            pass
-                        else:
-                            if glyr.isGroupLayer:
-                                for g2lyr in glyr:
-                                    if g2lyr.isBasemapLayer:
-                                        pass
-                                    else:
-                                        if g2lyr.isGroupLayer:
-                                            for g3lyr in g2lyr:
-                                                if g3lyr.isBasemapLayer:
-                                                    pass
-                                                else:
-                                                    if g3lyr.isGroupLayer:
-                                                        for g4lyr in g3lyr:
-                                                            if g4lyr.isBasemapLayer:
-                                                                pass
-                                                            else:
-                                                                if g4lyr.isGroupLayer:
-                                                                    for g5lyr in g4lyr:
-                                                                        if (
-                                                                            g5lyr.isBasemapLayer
-                                                                        ):
-                                                                            pass
-                                                                        else:
-                                                                            if (
-                                                                                g5lyr.isGroupLayer
-                                                                            ):
-                                                                                for g6lyr in g5lyr:
-                                                                                    if (
-                                                                                        g6lyr.isBasemapLayer
-                                                                                    ):
-                                                                                        pass
-                                                                                    else:
-                                                                                        try:
-                                                                                            lyrDescriptions(
-                                                                                                g6lyr
-                                                                                            )
-                                                                                        except:
-                                                                                            print(
-                                                                                                "> 6 nested groups present. Skipping those."
-                                                                                            )
-                                                                                            pass
-                                                                            else:
-                                                                                lyrDescriptions(
-                                                                                    g5lyr
-                                                                                )
-                                                                else:
-                                                                    lyrDescriptions(
-                                                                        g4lyr
-                                                                    )
-                                                    else:
-                                                        lyrDescriptions(g3lyr)
-                                        else:
-                                            lyrDescriptions(g2lyr)
-                            else:
-                                lyrDescriptions(glyr)
-                else:
-                    lyrDescriptions(lyr)
-        df_index += 1
-
+    Returns:
+        bool: True if a temporary file could be created in the directory.
+    """
+    if not os.path.isdir(path):
+        return False
+    try:
+        tempfile.TemporaryFile(dir=path).close()
+    except (IOError, OSError):
+        return False
+    return True
+
+
+def parse_args(argv=None):
+    """Parse and check the command line arguments.
+
+    Args:
+        argv (list, optional): Arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        Namespace: mxd, output_dir, dry_run, and timings. Exits with a usage
+            error if the MXD does not exist or the output directory is not
+            writable.
+    """
+    parser = argparse.ArgumentParser(
+        description="ArcGIS MXD metadata compiler.",
+        epilog="Author(s): Caleb Grant, Integral Consulting, Inc.",
+    )
+    parser.add_argument(
+        "mxd",
+        help="Path to .mxd file. No UNC allowed. Surround path in double "
+        'quotes ("<path>") if spaces in path.',
+    )
+    parser.add_argument(
+        "output_dir",
+        nargs="?",
+        default=DEFAULT_OUTPUT,
+        help="Directory of the output CSV. No UNC allowed. Default: H:\\",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report what would be scanned and written, without scanning.",
+    )
+    parser.add_argument(
+        "--timings",
+        default=TIMINGS,
+        help="CSV log that import times are appended to. Default: {}".format(TIMINGS),
+    )
+    args = parser.parse_args(argv)
+    if os.path.splitext(args.mxd)[1].lower() != ".mxd" or not os.path.isfile(args.mxd):
+        parser.error("Invalid MXD path: {}".format(args.mxd))
+    if not writable(args.output_dir):
+        parser.error("Output directory is not writable: {}".format(args.output_dir))
+    return args
+
+
+def timed_import(name, timings):
+    """Import a module, recording how long the import took.
+
+    Args:
+        name (str): Module name.
+        timings (list): (module, seconds) tuples, appended to.
+
+    Returns:
+        module: Imported module.
+    """
+    start = time.time()
+    module = importlib.import_module(name)
+    timings.append((name, time.time() - start))
+    return module
+
+
+def record_timings(path, timings):
+    """Append import times to a CSV log.
+
+    Args:
+        path (str): Log path. Created with a header if it does not exist.
+        timings (list): (module, seconds) tuples.
+    """
+    if not path:
+        return
+    run_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    version = sys.version.split()[0]
+    try:
+        new = not os.path.exists(path)
+        with open(path, "a") as f:
+            if new:
+                f.write(TIMINGS_HEADER)
+            for name, seconds in timings:
+                f.write("{},{},{},{:.3f}\n".format(run_time, version, name, seconds))
+    except (IOError, OSError):
+        pass
+
+
+def main(argv=None):
+    start = time.time()
+    args = parse_args(argv)
+    mxdName = os.path.splitext(os.path.basename(args.mxd))[0]
+    output_file = os.path.join(args.output_dir, mxdName + ".csv")
+    if args.dry_run:
+        print("Would scan: {}".format(os.path.abspath(args.mxd)))
+        print("Would write: {}".format(output_file))
+        return
+    timings = [("arguments", time.time() - start)]
+
+    colorama = timed_import("colorama", timings)
+    colorama.init(autoreset=True)
+    Fore, Style = colorama.Fore, colorama.Style
+    print(Style.BRIGHT + Fore.GREEN + "\nRUNNING - ArcGIS MXD metadata compiler\n")
+    print(Style.BRIGHT + Fore.WHITE + "\nImporting arcpy.")
+    arcpy = timed_import("arcpy", timings)
+    mxd_metadata = timed_import("mxd_metadata", timings)
+    record_timings(args.timings, timings)
     print(
         Style.BRIGHT
         + Fore.WHITE
-        + "\nTotal dataframes: "
+        + "Imported in "
         + Style.DIM
-        + "{}".format(df_index)
+        + ", ".join("{} {:.2f}s".format(name, s) for name, s in timings)
     )
-    lyr_count = 0
-    for lyr in meta:
-        lyr_count += 1
+
     print(
         Style.BRIGHT
         + Fore.WHITE
-        + "Total layers: "
+        + "\nLoading MXD: "
         + Style.DIM
-        + "{}".format(lyr_count)
+        + "{}\n".format(args.mxd)
     )
-
-    return meta
-
-
-def write_output(mxdName, mxdMeta, csvPath):
-    if csvPath == "":
-        fPath = "H:\{}.csv".format(mxdName)
-    else:
-        fPath = os.path.join(csvPath, mxdName + ".csv")
-
-    if os.path.exists(fPath):
-        try:
-            os.remove(fPath)
-        except:
-            print(
-                Style.BRIGHT
-                + Fore.RED
-                + "ERROR: File already exists and cannot remove. Check that the file isnt being used."
-            )
-            print(Style.BRIGHT + Fore.WHITE + "File: ", fPath)
-            sys.exit()
-
-    headers = [
-        "Layer_Name",
-        "Data_Frame",
-        "Layer_Basename",
-        "Layer_Type",
-        "File_Extension",
-        "Feature_Type",
-        "Shape_Type",
-        "Has_Z",
-        "Has_Spatial_Index",
-        "Field_Names",
-        "Layer_Path",
-        "Layer_Catalog_Path",
-        "Layer_DefinitionQuery_Supported",
-        "Layer_DefinitionQuery",
-        "Coordinate_Type",
-        "GCS_Name",
-        "GCS_Code",
-        "PCS_Name",
-        "PCS_Code",
-        "Linear_Unit_Name",
-        "Linear_Unit_Code",
-        "Datum_Name",
-        "Datum_Code",
-        "Spheroid_Name",
-        "Spheroid_Code",
-        "Raster_Format",
-        "Raster_Band_Count",
-        "Raster_Compression_Type",
-        "Raster_Size_MB",
-        "Raster_Cell_Width",
-        "Raster_Cell_Height",
-        "Raster_Cell_Min",
-        "Raster_Cell_Max",
-        "Raster_Cell_Mean",
-        "Raster_Extent_JSON",
-        "Layer_Description",
-        "Script_User",
-        "Script_Run_Time",
-    ]
-
+    mxdMeta = mxd_metadata.mainFunction(arcpy.mapping.MapDocument(args.mxd))
     try:
-        with open(fPath, "wb") as f:
-            f_writer = csv.writer(
-                f, delimiter=",", quotechar='"', quoting=csv.QUOTE_MINIMAL
-            )
-            f_writer.writerow(headers)
-            for lyr in sorted(mxdMeta.keys()):
-                row = []
-                for header in headers:
-                    if header == "Layer_Name":
-                        row.append(lyr)
-                    elif header == "Script_User":
-                        row.append(USER)
-                    elif header == "Script_Run_Time":
-                        row.append(RUN_TIME)
-                    else:
-                        row.append(mxdMeta[lyr][header])
-                f_writer.writerow(row)
-    except:
-        print(
-            Style.BRIGHT
-            + Fore.WHITE
-            + "ERROR: Cannot write to output file. Check that the file isnt being used."
-        )
-        sys.exit()
-    return fPath
-
-
-def main():
-    CLI()
-    print(Style.BRIGHT + Fore.GREEN + "\nRUNNING - ArcGIS MXD metadata compiler\n")
-    print(Style.BRIGHT + Fore.WHITE + "\nImporting arcpy.")
-    import arcpy
-
-    mxd = sys.argv[1]
-    print(
-        Style.BRIGHT + Fore.WHITE + "\nLoading MXD: " + Style.DIM + "{}\n".format(mxd)
-    )
-    mxdMeta = mainFunction(mxd)
-    mxdNameExt = os.path.basename(mxd)
-    mxdName = os.path.splitext(mxdNameExt)[0]
-    if len(sys.argv) == 3:
-        csvPath = sys.argv[2]
-    else:
-        csvPath = ""
-    output_file = write_output(mxdName, mxdMeta, csvPath)
+        output_file = mxd_metadata.write_output(mxdName, mxdMeta, args.output_dir)
+    except Exception:
+        print(Style.BRIGHT + Fore.RED + "Failed.")
+        sys.exit(1)
     print(
         Style.BRIGHT
         + Fore.WHITE
@@ -0,0 +1,240 @@
+# PURPOSE
+#   Compute raster minimum, maximum, mean, and NoData fraction by reading
+#   the raster in fixed-size blocks, for rasters without stored statistics.
+#
+# NOTES
+#   1) arcpy and numpy are imported only when statistics are computed.
+#   2) Each block is read with arcpy.RasterToNumPyArray(), so memory use is
+#      bounded by the block size regardless of the raster size. Multiband
+#      rasters are read one block of all bands at a time, and the statistics
+#      cover all bands.
+#   3) With a sample step greater than 1, only every n-th row and column of
+#      each block is used, for faster approximate statistics.
+#   4) Results are cached per raster path and modified time, so a raster
+#      used by many layers or projects is only read once per run.
+#   5) Stored statistics are used when present, since they are cheaper to
+#      read, but do not include the NoData fraction. Set "stored" to false to
+#      always compute statistics. They are read with GetRasterProperties,
+#      which fails when statistics are missing, rather than from the Raster
+#      minimum, maximum, and mean properties, which can build them.
+#   6) Statistics can take longer than the scanners' probe deadline on a
+#      large raster, so the scanners compute them without it (see
+#      source_watchdog.py). An optional "timeout" in seconds stops a
+#      computation between blocks, and the statistics are left empty.
+#   7) The block size, sample step, use of stored statistics, and timeout
+#      can be set in the "rasterStats" section of a scanner JSON config file
+#      (see scan_config.py), for example:
+#           {"rasterStats": {"blockSize": 2048, "sample": 4, "stored": false,
+#                            "timeout": 600}}
+#
+# HISTORY
+#   DATE            REVISION
+#   ----------      -------------------------------------------------------
+#   2026-10-19      Created.
+# =========================================================================
+
+import os
+import threading
+import time
+
+from scan_config import load_config
+
+BLOCK_SIZE = 1024  # rows and columns per block
+SAMPLE = 1  # use every pixel
+STORED_PROPERTIES = [("minimum", "MINIMUM"), ("maximum", "MAXIMUM"), ("mean", "MEAN")]
+
+
+class RasterStats(object):
+    """Block-wise raster statistics with a per-path cache.
+
+    Args:
+        block_size (int, optional): Rows and columns read per block.
+            Defaults to BLOCK_SIZE.
+        sample (int, optional): Use every n-th row and column. Defaults to
+            SAMPLE (every pixel).
+        stored (bool, optional): Use a raster's stored minimum, maximum, and
+            mean when they are all present, and only compute statistics when
+            they are missing. Defaults to True.
+        timeout (float, optional): Seconds after which a computation stops.
+            Defaults to None (no limit).
+    """
+
+    def __init__(self, block_size=BLOCK_SIZE, sample=SAMPLE, stored=True, timeout=None):
+        self.block_size = max(1, int(block_size))
+        self.sample = max(1, int(sample))
+        self.stored = stored
+        self.timeout = float(timeout) if timeout else None
+        self.cache = {}
+        self.lock = threading.Lock()
+        self.computed = 0
+        self.stopped = 0
+
+    @classmethod
+    def from_value(cls, value):
+        """Create raster statistics options from a toolbox parameter value.
+
+        Args:
+            value (str): Path to a JSON config file with a "rasterStats"
+                section. An empty value uses the defaults.
+
+        Returns:
+            RasterStats: Options.
+        """
+        if not value:
+            return cls()
+        options = load_config(value).get("rasterStats") or {}
+        return cls(
+            options.get("blockSize", BLOCK_SIZE),
+            options.get("sample", SAMPLE),
+            options.get("stored", True),
+            options.get("timeout"),
+        )
+
+    def stored_statistics(self, raster):
+        """Read a raster's stored minimum, maximum, and mean.
+
+        Args:
+            raster (Raster): arcpy Raster.
+
+        Returns:
+            dict: 'minimum', 'maximum', 'mean', and 'nodataFraction' (None),
+                or None if the raster has no stored statistics.
+        """
+        import arcpy
+
+        values = {"nodataFraction": None}
+        for key, name in STORED_PROPERTIES:
+            try:
+                text = arcpy.GetRasterProperties_management(raster, name).getOutput(0)
+                # The output uses the locale's decimal separator.
+                values[key] = float(str(text).replace(",", "."))
+            except Exception:
+                return None
+        return values
+
+    def statistics(self, raster, path=None):
+        """Get the statistics of a raster.
+
+        Args:
+            raster (Raster): arcpy Raster.
+            path (str, optional): Raster path used as the cache key. Defaults
+                to the raster's catalogPath.
+
+        Returns:
+            dict: 'minimum', 'maximum', 'mean', and 'nodataFraction' (None
+                when stored statistics are used, for a raster with no valid
+                pixels, or when the computation timed out).
+        """
+        if self.stored:
+            values = self.stored_statistics(raster)
+            if values is not None:
+                return values
+        if path is None:
+            path = getattr(raster, "catalogPath", None)
+        try:
+            mtime = os.path.getmtime(path)
+        except (OSError, TypeError):
+            mtime = None
+        key = (path, mtime)
+        with self.lock:
+            if path is not None and key in self.cache:
+                return self.cache[key]
+        result = self.compute(raster)
+        with self.lock:
+            if path is not None:
+                self.cache[key] = result
+            self.computed += 1
+        return result
+
+    def _blocks(self, raster):
+        """Yield (lower left corner, columns, rows) of each block."""
+        import arcpy
+
+        width, height = raster.width, raster.height
+        extent = raster.extent
+        cell_width, cell_height = raster.meanCellWidth, raster.meanCellHeight
+        for row in range(0, height, self.block_size):
+            rows = min(self.block_size, height - row)
+            y = extent.YMax - (row + rows) * cell_height
+            for col in range(0, width, self.block_size):
+                cols = min(self.block_size, width - col)
+                x = extent.XMin + col * cell_width
+                yield arcpy.Point(x, y), cols, rows
+
+    def compute(self, raster):
+        """Compute the statistics of a raster block by block.
+
+        Args:
+            raster (Raster): arcpy Raster.
+
+        Returns:
+            dict: 'minimum', 'maximum', 'mean', and 'nodataFraction'.
+        """
+        import arcpy
+        import numpy
+
+        nodata = getattr(raster, "noDataValue", None)
+        minimum = maximum = None
+        total = 0.0
+        valid = 0
+        pixels = 0
+        start = time.time()
+        for corner, cols, rows in self._blocks(raster):
+            if self.timeout and time.time() - start > self.timeout:
+                with self.lock:
+                    self.stopped += 1
+                return dict.fromkeys(["minimum", "maximum", "mean", "nodataFraction"])
+            if nodata is None:
+                block = arcpy.RasterToNumPyArray(raster, corner, cols, rows)
+            else:
+                block = arcpy.RasterToNumPyArray(raster, corner, cols, rows, nodata)
+            if self.sample > 1:
+                block = block[..., :: self.sample, :: self.sample]
+            mask = numpy.ones(block.shape, dtype=bool)
+            if nodata is not None:
+                mask &= block != nodata
+            if block.dtype.kind == "f":
+                mask &= ~numpy.isnan(block)
+            pixels += block.size
+            values = block[mask]
+            del block, mask
+            if not values.size:
+                continue
+            valid += values.size
+            total += float(values.sum(dtype=numpy.float64))
+            low, high = values.min().item(), values.max().item()
+            minimum = low if minimum is None else min(minimum, low)
+            maximum = high if maximum is None else max(maximum, high)
+        return {
+            "minimum": minimum,
+            "maximum": maximum,
+            "mean": total / valid if valid else None,
+            "nodataFraction": 1 - float(valid) / pixels if pixels else None,
+        }
+
+    def summary(self):
+        """Summarize the rasters whose statistics were computed.
+
+        Returns:
+            list: Lines of text, empty if none were computed.
+        """
+        if not self.computed:
+            return []
+        lines = [
+            "Computed statistics of {} raster(s) in {} pixel blocks{}".format(
+                self.computed,
+                self.block_size,
+                (
+                    ", sampling every {} pixels".format(self.sample)
+                    if self.sample > 1
+                    else ""
+                ),
+            )
+        ]
+        if self.stopped:
+            lines.append(
+                "Stopped statistics of {} raster(s) after {} seconds".format(
+                    self.stopped, self.timeout
+                )
+            )
+        return lines
@@ -0,0 +1,320 @@
+# PURPOSE
+#   Index the file and dataset names under a set of search roots so that
+#   broken layers can be given a ranked list of candidate repair paths.
+#
+# NOTES
+#   1) The index is stored in a SQLite database and refreshed
+#      incrementally. A directory is only listed again if its modified time
+#      changed since the last refresh, otherwise its subdirectories are read
+#      from the index.
+#   2) Feature classes, tables, and rasters inside file geodatabases are
+#      listed with arcpy.da.Walk() when arcpy is available. Adding a dataset
+#      to a geodatabase does not always change the modified time of the .gdb
+#      directory, so a geodatabase is listed again when the newest modified
+#      time of the directory and its a*.gdbtable files changed.
+#
+# HISTORY
+#   DATE            REVISION
+#   ----------      -------------------------------------------------------
+#   2026-10-19      Created.
+# =========================================================================
+
+import difflib
+import os
+import re
+import sqlite3
+
+MAX_CANDIDATES = 5
+DEFAULT_INDEX = os.path.join(os.path.expanduser("~"), "repair_index.sqlite")
+GEODATABASE_EXTENSIONS = (".gdb",)
+# Files that accompany a dataset and are never suggested on their own.
+SIDECAR_EXTENSIONS = (
+    ".aux",
+    ".aux.xml",
+    ".cpg",
+    ".dbf",
+    ".lock",
+    ".ovr",
+    ".prj",
+    ".rrd",
+    ".sbn",
+    ".sbx",
+    ".shp.xml",
+    ".shx",
+    ".tfw",
+    ".xml",
+)
+
+
+def _split(path):
+    """Split a path on either separator into its components."""
+    return [part for part in re.split(r"[\\/]", path) if part]
+
+
+def _stem(name):
+    return os.path.splitext(name)[0].lower()
+
+
+class RepairIndex(object):
+    """Persistent index of file and dataset names under search roots.
+
+    Args:
+        path (str): SQLite database path. Created if it does not exist.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS dirs (
+                path TEXT PRIMARY KEY,
+                mtime REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                dir TEXT NOT NULL,
+                path TEXT NOT NULL,
+                name TEXT NOT NULL,
+                stem TEXT NOT NULL,
+                kind TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_dir ON entries (dir);
+            CREATE INDEX IF NOT EXISTS entries_name ON entries (name);
+            CREATE INDEX IF NOT EXISTS entries_stem ON entries (stem);
+            """)
+
+    def close(self):
+        self.conn.close()
+
+    def refresh(self, roots):
+        """Bring the index up to date with the search roots.
+
+        Args:
+            roots (list): Search root directories.
+
+        Returns:
+            int: Number of directories that were listed again.
+        """
+        roots = [os.path.normpath(root) for root in roots if root]
+        stack = list(roots)
+        seen = set()
+        listed = 0
+        while stack:
+            directory = stack.pop()
+            if directory in seen:
+                continue
+            seen.add(directory)
+            try:
+                mtime = _modified_time(directory)
+            except OSError:
+                continue
+            row = self.conn.execute(
+                "SELECT mtime FROM dirs WHERE path = ?", (directory,)
+            ).fetchone()
+            if row is not None and row[0] == mtime:
+                subdirs = [
+                    r[0]
+                    for r in self.conn.execute(
+                        "SELECT path FROM entries "
+                        "WHERE dir = ? AND kind IN ('dir', 'gdb')",
+                        (directory,),
+                    )
+                ]
+            else:
+                subdirs = self._index_dir(directory, mtime)
+                listed += 1
+            stack.extend(subdirs)
+        # Forget directories under the roots that no longer exist.
+        for (directory,) in self.conn.execute("SELECT path FROM dirs").fetchall():
+            under_root = any(
+                directory == root or directory.startswith(root + os.sep)
+                for root in roots
+            )
+            if under_root and directory not in seen:
+                self._forget(directory)
+        self.conn.commit()
+        return listed
+
+    def _forget(self, directory):
+        self.conn.execute("DELETE FROM entries WHERE dir = ?", (directory,))
+        self.conn.execute("DELETE FROM dirs WHERE path = ?", (directory,))
+
+    def _index_dir(self, directory, mtime):
+        """List a directory, or the datasets of a geodatabase, into the
+        index.
+
+        Args:
+            directory (str): Directory or geodatabase path.
+            mtime (float): Modified time from _modified_time().
+
+        Returns:
+            list: Subdirectories and geodatabases to walk.
+        """
+        self._forget(directory)
+        if _is_geodatabase(directory):
+            self.conn.executemany(
+                "INSERT INTO entries (dir, path, name, stem, kind) "
+                "VALUES (?, ?, ?, ?, 'dataset')",
+                (
+                    (directory, item, os.path.basename(item).lower(), _stem(item))
+                    for item in _list_geodatabase(directory)
+                ),
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO dirs (path, mtime) VALUES (?, ?)",
+                (directory, mtime),
+            )
+            return []
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return []
+        subdirs = []
+        rows = []
+        for name in names:
+            path = os.path.join(directory, name)
+            if not os.path.isdir(path):
+                rows.append((directory, path, name.lower(), _stem(name), "file"))
+            elif _is_geodatabase(name):
+                rows.append((directory, path, name.lower(), _stem(name), "gdb"))
+                subdirs.append(path)
+            else:
+                rows.append((directory, path, name.lower(), _stem(name), "dir"))
+                subdirs.append(path)
+        self.conn.executemany(
+            "INSERT INTO entries (dir, path, name, stem, kind) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO dirs (path, mtime) VALUES (?, ?)",
+            (directory, mtime),
+        )
+        return subdirs
+
+    def suggest(self, data_source, limit=MAX_CANDIDATES):
+        """Find candidate paths for a broken data source.
+
+        Candidates with the same name (including extension) rank above
+        candidates with only the same name stem. Stem matches are limited to
+        geodatabase datasets when the data source has an extension, and
+        never include sidecar files such as a shapefile's .dbf. Ties are broken by how many
+        trailing folders match and then by the similarity of the full path.
+
+        Args:
+            data_source (str): Broken layer data source.
+            limit (int, optional): Maximum number of candidates.
+
+        Returns:
+            list: Candidate paths, best first.
+        """
+        if not data_source:
+            return []
+        parts = _split(data_source)
+        if not parts:
+            return []
+        name = parts[-1].lower()
+        stem = _stem(parts[-1])
+        rows = [
+            (path, entry_name)
+            for path, entry_name, kind in self.conn.execute(
+                "SELECT path, name, kind FROM entries "
+                "WHERE kind != 'dir' AND (name = ? OR stem = ?)",
+                (name, stem),
+            )
+            if entry_name == name
+            or kind == "dataset"
+            or (name == stem and not entry_name.endswith(SIDECAR_EXTENSIONS))
+        ]
+        source = [part.lower() for part in parts]
+
+        def score(row):
+            candidate = [part.lower() for part in _split(row[0])]
+            trailing = 0
+            for a, b in zip(reversed(candidate[:-1]), reversed(source[:-1])):
+                if a != b:
+                    break
+                trailing += 1
+            similarity = difflib.SequenceMatcher(
+                None, "/".join(candidate), "/".join(source)
+            ).ratio()
+            return (row[1] == name, trailing, similarity)
+
+        return [row[0] for row in sorted(rows, key=score, reverse=True)[:limit]]
+
+
+def _is_geodatabase(path):
+    return path.lower().endswith(GEODATABASE_EXTENSIONS)
+
+
+def _modified_time(path):
+    """Get the modified time used to decide whether a directory is listed
+    again. For a geodatabase this is the newest modified time of the
+    directory and its a*.gdbtable files.
+
+    Args:
+        path (str): Directory or geodatabase path.
+
+    Returns:
+        float: Modified time.
+
+    Raises:
+        OSError: If the directory cannot be read.
+    """
+    mtime = os.stat(path).st_mtime
+    if not _is_geodatabase(path):
+        return mtime
+    for name in os.listdir(path):
+        lower = name.lower()
+        if lower.startswith("a") and lower.endswith(".gdbtable"):
+            try:
+                mtime = max(mtime, os.stat(os.path.join(path, name)).st_mtime)
+            except OSError:
+                pass
+    return mtime
+
+
+def _list_geodatabase(path):
+    """List the datasets in a geodatabase with arcpy.da.Walk().
+
+    Args:
+        path (str): Geodatabase path.
+
+    Returns:
+        list: Dataset paths, or an empty list if arcpy is not available.
+    """
+    try:
+        import arcpy
+    except (ImportError, RuntimeError):
+        return []
+    datasets = []
+    try:
+        for dirpath, dirnames, filenames in arcpy.da.Walk(
+            path, datatype=["FeatureClass", "Table", "RasterDataset"]
+        ):
+            datasets.extend(os.path.join(dirpath, name) for name in filenames)
+    except Exception:
+        pass
+    return datasets
+
+
+def open_index(roots, index_path=None):
+    """Open the repair index and refresh it from the search roots.
+
+    Args:
+        roots (str or list): Search root directories, as a list or separated
+            by semicolons. No index is opened if no roots are given.
+        index_path (str, optional): SQLite database path. Defaults to
+            DEFAULT_INDEX.
+
+    Returns:
+        RepairIndex: Refreshed index, or None if no roots are given.
+    """
+    if not roots:
+        return None
+    if not isinstance(roots, (list, tuple)):
+        roots = [root.strip() for root in roots.split(";")]
+    roots = [root for root in roots if root]
+    if not roots:
+        return None
+    index = RepairIndex(index_path or DEFAULT_INDEX)
+    index.refresh(roots)
+    return index
@@ -0,0 +1,251 @@
+# PURPOSE
+#   Vectorized coordinate conversion between geographic coordinates and the
+#   projections used by UTM, State Plane, and Web Mercator coordinate
+#   systems, for reprojecting X/Y arrays while a CSV is imported.
+#
+# NOTES
+#   1) Projection parameters are passed as dicts so that this module does
+#      not depend on arcpy. import_csv.py builds them from
+#      arcpy.SpatialReference objects, which are resolved locally without a
+#      network lookup.
+#   2) No datum transformation is applied. Coordinates can only be
+#      converted between coordinate systems on the same geographic
+#      coordinate system, or between WGS 1984 and NAD 1983, which are
+#      treated as equivalent (the same as projecting in ArcGIS without a
+#      geographic transformation).
+#   3) Transverse Mercator uses the Krüger series to third order in n, and
+#      the series back from conformal latitude to fourth order, which agrees
+#      with PROJ to within 0.1 millimeter within a UTM zone.
+#
+# HISTORY
+#   DATE            REVISION
+#   ----------      -------------------------------------------------------
+#   2026-10-19      Created.
+# =========================================================================
+
+import numpy as np
+
+PROJECTIONS = (
+    "Transverse_Mercator",
+    "Lambert_Conformal_Conic",
+    "Mercator_Auxiliary_Sphere",
+)
+# Geographic coordinate systems that are treated as equivalent.
+EQUIVALENT_GCS = ({4326, 4269},)
+
+
+def compatible(source: dict, target: dict) -> bool:
+    """Check whether coordinates can be converted between two coordinate
+    systems without a datum transformation.
+
+    Args:
+        source (dict): Source coordinate system parameters.
+        target (dict): Target coordinate system parameters.
+
+    Returns:
+        bool: True if the conversion is supported.
+    """
+    if source is None or target is None:
+        return False
+    if source["gcs"] == target["gcs"]:
+        return True
+    return any({source["gcs"], target["gcs"]} <= gcs for gcs in EQUIVALENT_GCS)
+
+
+def transform(x, y, source: dict, target: dict) -> tuple:
+    """Convert coordinate arrays from one coordinate system to another.
+
+    Args:
+        x (array-like): X coordinates (longitude for geographic systems).
+        y (array-like): Y coordinates (latitude for geographic systems).
+        source (dict): Source coordinate system parameters.
+        target (dict): Target coordinate system parameters.
+
+    Returns:
+        tuple: Arrays of converted X and Y coordinates.
+    """
+    lon, lat = to_geographic(np.asarray(x, float), np.asarray(y, float), source)
+    return from_geographic(lon, lat, target)
+
+
+def to_geographic(x: np.ndarray, y: np.ndarray, params: dict) -> tuple:
+    """Convert projected coordinates to longitude and latitude in degrees.
+
+    Args:
+        x (np.ndarray): X coordinates.
+        y (np.ndarray): Y coordinates.
+        params (dict): Coordinate system parameters.
+
+    Returns:
+        tuple: Longitude and latitude arrays.
+    """
+    if params["type"] == "GEOGRAPHIC":
+        return x, y
+    x = (x - params["x0"]) * params["unit"]
+    y = (y - params["y0"]) * params["unit"]
+    if params["type"] == "Transverse_Mercator":
+        lon, lat = _tm_inverse(x, y, params)
+    elif params["type"] == "Lambert_Conformal_Conic":
+        lon, lat = _lcc_inverse(x, y, params)
+    else:
+        lon = x / params["a"]
+        lat = 2 * np.arctan(np.exp(y / params["a"])) - np.pi / 2
+        lon = lon + np.radians(params["lon0"])
+    return np.degrees(lon), np.degrees(lat)
+
+
+def from_geographic(lon: np.ndarray, lat: np.ndarray, params: dict) -> tuple:
+    """Convert longitude and latitude in degrees to projected coordinates.
+
+    Args:
+        lon (np.ndarray): Longitudes.
+        lat (np.ndarray): Latitudes.
+        params (dict): Coordinate system parameters.
+
+    Returns:
+        tuple: X and Y arrays.
+    """
+    if params["type"] == "GEOGRAPHIC":
+        return lon, lat
+    lon = np.radians(lon)
+    lat = np.radians(lat)
+    if params["type"] == "Transverse_Mercator":
+        x, y = _tm_forward(lon, lat, params)
+    elif params["type"] == "Lambert_Conformal_Conic":
+        x, y = _lcc_forward(lon, lat, params)
+    else:
+        x = params["a"] * (lon - np.radians(params["lon0"]))
+        y = params["a"] * np.log(np.tan(np.pi / 4 + lat / 2))
+    return x / params["unit"] + params["x0"], y / params["unit"] + params["y0"]
+
+
+def _tm_constants(params: dict) -> tuple:
+    """Return the Krüger series constants for an ellipsoid.
+
+    Args:
+        params (dict): Coordinate system parameters.
+
+    Returns:
+        tuple: Rectifying radius A, n, and the alpha, beta, and delta
+            series coefficients.
+    """
+    n = params["f"] / (2 - params["f"])
+    big_a = params["a"] / (1 + n) * (1 + n**2 / 4 + n**4 / 64)
+    alpha = (
+        n / 2 - 2 / 3 * n**2 + 5 / 16 * n**3,
+        13 / 48 * n**2 - 3 / 5 * n**3,
+        61 / 240 * n**3,
+    )
+    beta = (
+        n / 2 - 2 / 3 * n**2 + 37 / 96 * n**3,
+        1 / 48 * n**2 + 1 / 15 * n**3,
+        17 / 480 * n**3,
+    )
+    delta = (
+        2 * n - 2 / 3 * n**2 - 2 * n**3 + 116 / 45 * n**4,
+        7 / 3 * n**2 - 8 / 5 * n**3 - 227 / 45 * n**4,
+        56 / 15 * n**3 - 136 / 35 * n**4,
+        4279 / 630 * n**4,
+    )
+    return big_a, n, alpha, beta, delta
+
+
+def _tm_xi(lon, lat, params: dict) -> tuple:
+    """Return the Gauss-Schreiber coordinates xi' and eta' used by the
+    forward Transverse Mercator series.
+    """
+    _, n, alpha, _, _ = _tm_constants(params)
+    c = 2 * np.sqrt(n) / (1 + n)
+    sin_lat = np.sin(lat)
+    t = np.sinh(np.arctanh(sin_lat) - c * np.arctanh(c * sin_lat))
+    dlon = lon - np.radians(params["lon0"])
+    xi = np.arctan2(t, np.cos(dlon))
+    eta = np.arctanh(np.sin(dlon) / np.sqrt(1 + t**2))
+    xi_sum = xi + sum(
+        a * np.sin(2 * j * xi) * np.cosh(2 * j * eta) for j, a in enumerate(alpha, 1)
+    )
+    eta_sum = eta + sum(
+        a * np.cos(2 * j * xi) * np.sinh(2 * j * eta) for j, a in enumerate(alpha, 1)
+    )
+    return xi_sum, eta_sum
+
+
+def _tm_forward(lon, lat, params: dict) -> tuple:
+    """Project radians to Transverse Mercator meters relative to the false
+    origin."""
+    big_a = _tm_constants(params)[0]
+    k = params["k0"] * big_a
+    xi, eta = _tm_xi(lon, lat, params)
+    xi0, _ = _tm_xi(np.radians(params["lon0"]), np.radians(params["lat0"]), params)
+    return k * eta, k * (xi - xi0)
+
+
+def _tm_inverse(x, y, params: dict) -> tuple:
+    """Convert Transverse Mercator meters relative to the false origin to
+    radians."""
+    big_a, _, _, beta, delta = _tm_constants(params)
+    k = params["k0"] * big_a
+    xi0, _ = _tm_xi(np.radians(params["lon0"]), np.radians(params["lat0"]), params)
+    xi = y / k + xi0
+    eta = x / k
+    xi_p = xi - sum(
+        b * np.sin(2 * j * xi) * np.cosh(2 * j * eta) for j, b in enumerate(beta, 1)
+    )
+    eta_p = eta - sum(
+        b * np.cos(2 * j * xi) * np.sinh(2 * j * eta) for j, b in enumerate(beta, 1)
+    )
+    chi = np.arcsin(np.sin(xi_p) / np.cosh(eta_p))
+    lat = chi + sum(d * np.sin(2 * j * chi) for j, d in enumerate(delta, 1))
+    lon = np.radians(params["lon0"]) + np.arctan2(np.sinh(eta_p), np.cos(xi_p))
+    return lon, lat
+
+
+def _lcc_constants(params: dict) -> tuple:
+    """Return the cone constant n, F, rho0, and eccentricity for a Lambert
+    Conformal Conic projection (Snyder, 1987)."""
+    e = np.sqrt(params["f"] * (2 - params["f"]))
+
+    def m(lat):
+        return np.cos(lat) / np.sqrt(1 - (e * np.sin(lat)) ** 2)
+
+    def t(lat):
+        return np.tan(np.pi / 4 - lat / 2) / (
+            ((1 - e * np.sin(lat)) / (1 + e * np.sin(lat))) ** (e / 2)
+        )
+
+    lat1 = np.radians(params["lat1"])
+    lat2 = np.radians(params["lat2"])
+    lat0 = np.radians(params["lat0"])
+    if np.isclose(lat1, lat2):
+        n = np.sin(lat1)
+    else:
+        n = (np.log(m(lat1)) - np.log(m(lat2))) / (np.log(t(lat1)) - np.log(t(lat2)))
+    big_f = m(lat1) / (n * t(lat1) ** n)
+    scale = params["a"] * big_f * params["k0"]
+    rho0 = scale * t(lat0) ** n
+    return n, scale, rho0, e, t
+
+
+def _lcc_forward(lon, lat, params: dict) -> tuple:
+    """Project radians to Lambert Conformal Conic meters relative to the
+    false origin."""
+    n, scale, rho0, _, t = _lcc_constants(params)
+    rho = scale * t(lat) ** n
+    theta = n * (lon - np.radians(params["lon0"]))
+    return rho * np.sin(theta), rho0 - rho * np.cos(theta)
+
+
+def _lcc_inverse(x, y, params: dict) -> tuple:
+    """Convert Lambert Conformal Conic meters relative to the false origin
+    to radians."""
+    n, scale, rho0, e, _ = _lcc_constants(params)
+    sign = np.sign(n)
+    rho = sign * np.sqrt(x**2 + (rho0 - y) ** 2)
+    theta = np.arctan2(sign * x, sign * (rho0 - y))
+    t = (rho / scale) ** (1 / n)
+    lat = np.pi / 2 - 2 * np.arctan(t)
+    for _ in range(8):
+        sin_lat = e * np.sin(lat)
+        lat = np.pi / 2 - 2 * np.arctan(t * ((1 - sin_lat) / (1 + sin_lat)) ** (e / 2))
+    lon = theta / n + np.radians(params["lon0"])
+    return lon, lat
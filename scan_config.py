@@ -0,0 +1,178 @@
+# PURPOSE
+#   Shared options for the APRX and MXD metadata scanners: which output
+#   columns to compute and which layers to exclude from a scan.
+#
+# NOTES
+#   1) Options can be given directly as a toolbox parameter or in a JSON
+#      config file, for example:
+#           {
+#               "columns": ["dataSource", "isBroken"],
+#               "exclude": {
+#                   "name": ["^Basemap"],
+#                   "longName": ["World_Imagery\\\\"],
+#                   "dataSource": ["^https?://"],
+#                   "layerTypes": ["isBasemapLayer", "isWebLayer"]
+#               }
+#           }
+#   2) Exclusion rules only read cheap layer properties, so they are
+#      evaluated before any Describe, ListFields, or Raster call.
+#
+# HISTORY
+#   DATE            REVISION
+#   ----------      -------------------------------------------------------
+#   2026-10-19      Created.
+# =========================================================================
+
+import json
+import os
+import re
+
+# Layer properties that exclusion patterns can be matched against, and the
+# property name passed to layer.supports() for each one.
+PATTERN_PROPERTIES = (
+    ("name", "NAME"),
+    ("longName", "LONGNAME"),
+    ("dataSource", "DATASOURCE"),
+)
+# Boolean layer properties that can be used as layer type filters.
+LAYER_TYPES = (
+    "isBasemapLayer",
+    "isWebLayer",
+    "isServiceLayer",
+    "isGroupLayer",
+    "isFeatureLayer",
+    "isRasterLayer",
+    "isBroken",
+)
+
+
+def load_config(path):
+    """Read a scanner config file.
+
+    Args:
+        path (str): JSON config file path.
+
+    Returns:
+        dict: Config options.
+    """
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def parse_columns(value):
+    """Parse a column selection.
+
+    Args:
+        value (str or list): Column names separated by semicolons or commas,
+            a list of column names, or the path to a JSON config file with a
+            "columns" list. An empty value selects all columns.
+
+    Returns:
+        set: Selected column names, or None if all columns are selected.
+    """
+    if not value:
+        return None
+    if isinstance(value, (list, tuple, set)):
+        return set(value)
+    if os.path.isfile(value):
+        return parse_columns(load_config(value).get("columns"))
+    columns = set()
+    for name in value.replace(",", ";").split(";"):
+        if name.strip():
+            columns.add(name.strip())
+    return columns or None
+
+
+def wants(columns, names):
+    """Check whether any of a group of columns was selected. Used to skip
+    arcpy calls whose results would not be written.
+
+    Args:
+        columns (set): Selected columns from parse_columns(), or None for
+            all columns.
+        names (list): Columns produced by one arcpy call.
+
+    Returns:
+        bool: True if at least one of the columns is selected.
+    """
+    if columns is None:
+        return True
+    for name in names:
+        if name in columns:
+            return True
+    return False
+
+
+class ExclusionRules(object):
+    """Compiled layer exclusion rules, with a count of the layers excluded
+    by each rule.
+
+    Args:
+        rules (dict): Exclusion rules with optional "name", "longName", and
+            "dataSource" lists of regular expressions and a "layerTypes"
+            list of boolean layer properties (see LAYER_TYPES).
+    """
+
+    def __init__(self, rules):
+        self.layer_types = [t for t in rules.get("layerTypes", []) if t in LAYER_TYPES]
+        self.patterns = []
+        for prop, support in PATTERN_PROPERTIES:
+            for pattern in rules.get(prop, []):
+                self.patterns.append((prop, support, pattern, re.compile(pattern)))
+        self.counts = {}
+
+    @classmethod
+    def from_value(cls, value, defaults):
+        """Create exclusion rules from a toolbox parameter value.
+
+        Args:
+            value (str): Path to a JSON config file with an "exclude"
+                section. An empty value uses the default rules.
+            defaults (dict): Rules used when no config file is given.
+
+        Returns:
+            ExclusionRules: Compiled rules.
+        """
+        if not value:
+            return cls(defaults)
+        return cls(load_config(value).get("exclude", defaults))
+
+    def excluded(self, layer):
+        """Check a layer against the rules. Layer type filters are checked
+        before the regular expressions.
+
+        Args:
+            layer (Layer): arcpy.mp or arcpy.mapping layer.
+
+        Returns:
+            str: Description of the first matching rule, or None if the
+                layer is not excluded.
+        """
+        for layer_type in self.layer_types:
+            if getattr(layer, layer_type, False):
+                return self._count(layer_type)
+        for prop, support, pattern, regex in self.patterns:
+            try:
+                if not layer.supports(support):
+                    continue
+                value = getattr(layer, prop)
+            except Exception:
+                continue
+            if value and regex.search(value):
+                return self._count("{} ~ {}".format(prop, pattern))
+        return None
+
+    def _count(self, rule):
+        self.counts[rule] = self.counts.get(rule, 0) + 1
+        return rule
+
+    def summary(self):
+        """Summarize the layers excluded by each rule.
+
+        Returns:
+            list: One line of text per rule that excluded a layer.
+        """
+        return [
+            "Excluded {} layer(s): {}".format(count, rule)
+            for rule, count in sorted(self.counts.items())
+        ]
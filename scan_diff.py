@@ -0,0 +1,367 @@
+# PURPOSE
+#   Compare two APRX or MXD scan inventories and report the layers that were
+#   added, removed, or changed between them.
+#
+# NOTES
+#   1) Usage:
+#           python scan_diff.py <old inventory> <new inventory>
+#               [-o changes.csv] [--key COLUMN ...] [--partitions N]
+#      Inventories can be the scanners' CSV, PARQUET, ARROW, or SQLITE
+#      output. Parquet and Arrow inputs require pyarrow.
+#   2) Layers are matched on a stable identity: the project path, map or
+#      data frame, layer long name (or name), and layout mapframe columns
+#      present in both inventories, unless --key is given. A layer listed
+#      more than once under the same identity is matched by occurrence.
+#   3) Both inventories are streamed into hash partitions on disk, and each
+#      partition is compared on its own, so memory use is bounded by the
+#      size of one partition rather than of the whole inventory. Changes
+#      are written as each partition is compared, and the summary keeps only
+#      counts, not the keys of the changed layers.
+#   4) This script runs with Python 3 and does not import arcpy.
+#   5) The output has one row per added or removed layer, and one row per
+#      changed column of a changed layer with its old and new values. A
+#      summary of repointed layers, changed definition queries, and newly
+#      broken data sources is printed at the end.
+#
+# HISTORY
+#   DATE            REVISION
+#   ----------      -------------------------------------------------------
+#   2026-10-19      Created.
+# =========================================================================
+
+import argparse
+import ast
+import csv
+import os
+import pickle
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+import zlib
+
+PARTITIONS = 64
+# Identity columns, in order of preference. The first column of each group
+# that is present in both inventories is used.
+KEY_COLUMNS = [
+    ("filePath", "MXD_Path"),
+    ("mapName", "Data_Frame"),
+    ("longName", "layerName", "Layer_Name"),
+    ("layoutName",),
+    ("layoutMapFrame",),
+]
+# Columns that are reported in the summary, for APRX and MXD inventories.
+DATA_SOURCE_COLUMNS = ("dataSource", "Layer_Data_Source")
+BROKEN_COLUMNS = ("isBroken", "Layer_Is_Broken")
+DEFINITION_QUERY_COLUMNS = ("definitionQuery", "Layer_DefinitionQuery")
+# Columns that change on every scan and are not compared.
+IGNORED_COLUMNS = ("Script_User", "Script_Run_Time")
+NUMBER = re.compile(r"^-?(0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?$")
+
+
+def value_text(value) -> str:
+    """Convert a value to canonical text, so that values read from CSV and
+    from typed formats compare equal. Numbers, and text that is a number,
+    are written in one form, with integral values written without a
+    fraction (1.0 and "1.0" both become "1"). Booleans are written as True
+    or False, as in the scanners' CSV output. Lists, such as bandNames,
+    are written as their items joined with semicolons, as in the Parquet
+    and Arrow output, whether they were read as lists or as the Python list
+    text of the CSV and SQLite output."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return ";".join(value_text(item) for item in value)
+    if isinstance(value, str):
+        if value.startswith("[") and value.endswith("]"):
+            try:
+                items = ast.literal_eval(value)
+            except (ValueError, SyntaxError):
+                return value
+            if isinstance(items, list):
+                return value_text(items)
+            return value
+        if not NUMBER.match(value):
+            return value
+        value = int(value) if value.lstrip("-").isdigit() else float(value)
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _read_csv(path: str):
+    with open(path, "r", newline="") as f:
+        reader = csv.reader(f)
+        columns = next(reader, [])
+        yield columns
+        for row in reader:
+            yield dict(zip(columns, row))
+
+
+def _read_arrow(path: str):
+    import pyarrow
+
+    if path.lower().endswith(".parquet"):
+        import pyarrow.parquet
+
+        parquet = pyarrow.parquet.ParquetFile(path)
+        yield parquet.schema_arrow.names
+        batches = parquet.iter_batches()
+    else:
+        reader = pyarrow.ipc.open_file(path)
+        yield reader.schema.names
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    for batch in batches:
+        for row in batch.to_pylist():
+            yield row
+
+
+def _read_sqlite(path: str):
+    conn = sqlite3.connect(path)
+    try:
+        tables = [r[0] for r in conn.execute("SELECT name FROM sqlite_master")]
+        if "mapframes" in tables:
+            query = (
+                "SELECT * FROM layers l JOIN maps m ON m.map_id = l.map_id "
+                "JOIN projects p ON p.project_id = m.project_id "
+                "LEFT JOIN mapframes f ON f.map_id = m.map_id"
+            )
+        else:
+            query = (
+                "SELECT * FROM layers l JOIN maps m ON m.map_id = l.map_id "
+                "JOIN projects p ON p.project_id = m.project_id"
+            )
+        # Booleans are stored as 0 and 1 in BOOLEAN columns (see
+        # scan_output.py), and read back as True and False.
+        booleans = set(
+            column[1]
+            for table in ("layers", "maps", "projects", "mapframes")
+            if table in tables
+            for column in conn.execute(f'PRAGMA table_info("{table}")')
+            if column[2].upper() == "BOOLEAN"
+        )
+        cursor = conn.execute(query)
+        columns = []
+        for description in cursor.description:
+            if description[0] not in columns:
+                columns.append(description[0])
+        yield [c for c in columns if not c.endswith("_id")]
+        for values in cursor:
+            row = {}
+            for description, value in zip(cursor.description, values):
+                if description[0] in booleans and value in (0, 1):
+                    value = bool(value)
+                row.setdefault(description[0], value)
+            yield row
+    finally:
+        conn.close()
+
+
+def read_inventory(path: str):
+    """Stream the layer rows of an inventory.
+
+    Args:
+        path (str): CSV, Parquet, Arrow IPC, or SQLite inventory path.
+
+    Returns:
+        generator: The column names, followed by one dict per row.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".parquet", ".arrow"):
+        return _read_arrow(path)
+    if extension in (".sqlite", ".db"):
+        return _read_sqlite(path)
+    return _read_csv(path)
+
+
+def key_columns(old_columns: list, new_columns: list) -> list:
+    """Pick the identity columns present in both inventories.
+
+    Args:
+        old_columns (list): Old inventory columns.
+        new_columns (list): New inventory columns.
+
+    Returns:
+        list: Identity column names.
+    """
+    keys = []
+    for group in KEY_COLUMNS:
+        for column in group:
+            if column in old_columns and column in new_columns:
+                keys.append(column)
+                break
+    return keys
+
+
+def partition(
+    rows, keys: list, columns: list, directory: str, prefix: str, partitions: int
+) -> int:
+    """Write rows to hash partition files by identity.
+
+    Args:
+        rows (iterable): Row dicts.
+        keys (list): Identity columns.
+        columns (list): Columns to keep.
+        directory (str): Directory for the partition files.
+        prefix (str): Partition file name prefix.
+        partitions (int): Number of partitions.
+
+    Returns:
+        int: Number of rows written.
+    """
+    files = [
+        open(os.path.join(directory, f"{prefix}{i}"), "wb") for i in range(partitions)
+    ]
+    count = 0
+    try:
+        for row in rows:
+            key = tuple(value_text(row.get(column)) for column in keys)
+            values = tuple(value_text(row.get(column)) for column in columns)
+            index = zlib.crc32("\x1f".join(key).encode("utf-8")) % partitions
+            pickle.dump((key, values), files[index], pickle.HIGHEST_PROTOCOL)
+            count += 1
+    finally:
+        for f in files:
+            f.close()
+    return count
+
+
+def _load(path: str) -> dict:
+    """Read a partition file into a dict keyed by identity and occurrence."""
+    rows = {}
+    occurrences = {}
+    with open(path, "rb") as f:
+        while True:
+            try:
+                key, values = pickle.load(f)
+            except EOFError:
+                break
+            n = occurrences.get(key, 0)
+            occurrences[key] = n + 1
+            rows[key + (n,)] = values
+    return rows
+
+
+def diff(old_path: str, new_path: str, keys: list = None, partitions: int = PARTITIONS):
+    """Compare two inventories.
+
+    Args:
+        old_path (str): Old inventory path.
+        new_path (str): New inventory path.
+        keys (list, optional): Identity columns. Defaults to the KEY_COLUMNS
+            present in both inventories.
+        partitions (int, optional): Number of hash partitions. Defaults to
+            PARTITIONS.
+
+    Yields:
+        tuple: (change, key, column, old value, new value), where change is
+            'added', 'removed', or 'changed', and key is the identity values
+            followed by the occurrence of the identity (0 for the first
+            layer with it). The first item yielded is the list of identity
+            columns.
+    """
+    old_rows = read_inventory(old_path)
+    new_rows = read_inventory(new_path)
+    old_columns = next(old_rows)
+    new_columns = next(new_rows)
+    if not keys:
+        keys = key_columns(old_columns, new_columns)
+    if not keys:
+        raise ValueError("No identity columns found in both inventories")
+    columns = [
+        column for column in old_columns if column in new_columns and column not in keys
+    ]
+    columns += [
+        column
+        for column in new_columns
+        if column not in old_columns and column not in keys
+    ]
+    columns = [column for column in columns if column not in IGNORED_COLUMNS]
+    yield keys
+
+    directory = tempfile.mkdtemp(prefix="scan_diff_")
+    try:
+        partition(old_rows, keys, columns, directory, "old", partitions)
+        partition(new_rows, keys, columns, directory, "new", partitions)
+        for i in range(partitions):
+            old = _load(os.path.join(directory, f"old{i}"))
+            with open(os.path.join(directory, f"new{i}"), "rb") as f:
+                occurrences = {}
+                while True:
+                    try:
+                        key, values = pickle.load(f)
+                    except EOFError:
+                        break
+                    n = occurrences.get(key, 0)
+                    occurrences[key] = n + 1
+                    previous = old.pop(key + (n,), None)
+                    if previous is None:
+                        yield ("added", key + (n,), "", "", "")
+                        continue
+                    for column, a, b in zip(columns, previous, values):
+                        if a != b:
+                            yield ("changed", key + (n,), column, a, b)
+            for key in sorted(old):
+                yield ("removed", key, "", "", "")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare two APRX or MXD scan inventories."
+    )
+    parser.add_argument("old", help="Old inventory path.")
+    parser.add_argument("new", help="New inventory path.")
+    parser.add_argument("-o", "--output", help="Output CSV path. Default: stdout.")
+    parser.add_argument("--key", nargs="+", help="Identity columns. Default: detected.")
+    parser.add_argument("--partitions", type=int, default=PARTITIONS)
+    args = parser.parse_args()
+
+    f = open(args.output, "w", newline="") if args.output else sys.stdout
+    counts = {}
+    # Changes are written as they are found, and the changed columns of a
+    # layer are yielded together, so changed layers are counted without
+    # keeping their keys.
+    last_key = None
+    try:
+        changes = diff(args.old, args.new, args.key, args.partitions)
+        keys = next(changes)
+        writer = csv.writer(f)
+        writer.writerow(["Change"] + keys + ["Column", "Old_Value", "New_Value"])
+        for change, key, column, old, new in changes:
+            # The last key value is the occurrence, which is not written.
+            writer.writerow([change] + list(key[:-1]) + [column, old, new])
+            if change != "changed":
+                counts[change] = counts.get(change, 0) + 1
+                continue
+            if key != last_key:
+                counts["changed"] = counts.get("changed", 0) + 1
+                last_key = key
+            if column in DATA_SOURCE_COLUMNS:
+                counts["repointed"] = counts.get("repointed", 0) + 1
+            elif column in DEFINITION_QUERY_COLUMNS:
+                counts["definition query changed"] = (
+                    counts.get("definition query changed", 0) + 1
+                )
+            elif column in BROKEN_COLUMNS and new == "True":
+                counts["newly broken"] = counts.get("newly broken", 0) + 1
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    for change in (
+        "added",
+        "removed",
+        "changed",
+        "repointed",
+        "definition query changed",
+        "newly broken",
+    ):
+        print(f"{change}: {counts.get(change, 0)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
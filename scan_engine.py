@@ -0,0 +1,303 @@
+# PURPOSE
+#   Scan logic shared by the APRX (arcpy.mp) and MXD (arcpy.mapping)
+#   scanners: reading Describe, spatial reference, and Raster properties,
+#   walking layers, and the per-scan exclusion rules, watchdog, per-host
+#   limits, raster statistics, profiler, and repair index.
+#
+# NOTES
+#   1) Every module imported here also runs under ArcMap's Python 2.7.
+#   2) Properties are returned under neutral names, and only for properties
+#      the object has. Each scanner maps them to its own output columns and
+#      fills its own defaults, so existing outputs keep their columns.
+#   3) A ScanContext is created once per run, from the scanner's JSON config
+#      file, and passed to each project scanned. Its caches (per-host
+#      limits, blacklisted hosts, raster statistics, and profiles) are
+#      shared by every project in a batch.
+#   4) Both scanners walk their layers with iter_layers(), so exclusion
+#      rules apply the same way to both. The APRX scanner also gets the
+#      group layers, which its output has always listed as rows.
+#
+# HISTORY
+#   DATE            REVISION
+#   ----------      -------------------------------------------------------
+#   2026-10-19      Created.
+# =========================================================================
+
+from host_limits import HostLimiter
+from layer_profile import LayerProfiler
+from raster_stats import RasterStats
+from scan_config import ExclusionRules
+from source_health import SourceHealth
+from source_watchdog import STATUS_OK, TIMEOUT, SourceTimeout, Watchdog
+
+# (attribute, name) of the properties read from each kind of object.
+SPATIAL_REFERENCE_PROPERTIES = [
+    ("type", "coordType"),
+    ("GCSName", "GCSName"),
+    ("GCSCode", "GCSCode"),
+    ("PCSName", "PCSName"),
+    ("PCSCode", "PCSCode"),
+    ("linearUnitName", "linearUnitName"),
+    ("linearUnitCode", "linearUnitCode"),
+    ("datumName", "datumName"),
+    ("datumCode", "datumCode"),
+    ("spheroidName", "spheroidName"),
+    ("spheroidCode", "spheroidCode"),
+]
+DATASET_PROPERTIES = [
+    ("dataType", "dataType"),
+    ("datasetType", "datasetType"),
+    ("baseName", "baseName"),
+    ("catalogPath", "catalogPath"),
+    ("extension", "extension"),
+    ("featureType", "featureType"),
+    ("shapeType", "shapeType"),
+    ("hasZ", "hasZ"),
+    ("hasSpatialIndex", "hasSpatialIndex"),
+    ("file", "file"),
+    ("path", "path"),
+]
+RASTER_PROPERTIES = [
+    ("format", "format"),
+    ("bandCount", "bandCount"),
+    ("bandNames", "bandNames"),
+    ("compressionType", "compressionType"),
+    ("height", "height"),
+    ("width", "width"),
+    ("uncompressedSize", "uncompressedSize"),
+    ("meanCellWidth", "cellWidth"),
+    ("meanCellHeight", "cellHeight"),
+]
+
+
+def properties(obj, names):
+    """Read the properties an object has.
+
+    Args:
+        obj: arcpy object.
+        names (list): (attribute, name) pairs.
+
+    Returns:
+        dict: Property values by name. Properties that are missing, or that
+            raise when read, are left out.
+    """
+    values = {}
+    for attribute, name in names:
+        try:
+            values[name] = getattr(obj, attribute)
+        except Exception:
+            continue
+    return values
+
+
+def spatial_reference(sr):
+    """Read a spatial reference.
+
+    Args:
+        sr (SpatialReference): Spatial reference, or None.
+
+    Returns:
+        dict: Coordinate system names and codes.
+    """
+    if not sr:
+        return {}
+    return properties(sr, SPATIAL_REFERENCE_PROPERTIES)
+
+
+def extent(ext):
+    """Read an extent.
+
+    Args:
+        ext (Extent): Extent, or None.
+
+    Returns:
+        dict: XMin, YMin, XMax, YMax, and extentJSON.
+    """
+    if not ext:
+        return {}
+    values = properties(
+        ext,
+        [("XMin", "XMin"), ("YMin", "YMin"), ("XMax", "XMax"), ("YMax", "YMax")],
+    )
+    values.update(properties(ext, [("JSON", "extentJSON")]))
+    return values
+
+
+def describe_dataset(desc):
+    """Read the properties of a Describe result.
+
+    Args:
+        desc (Describe): Describe result of a layer or dataset.
+
+    Returns:
+        dict: DATASET_PROPERTIES, fieldNames (semicolon-delimited),
+            'extent' (see extent()), and 'spatialReference' (see
+            spatial_reference()).
+    """
+    values = properties(desc, DATASET_PROPERTIES)
+    try:
+        info = desc.fieldInfo
+        values["fieldNames"] = ";".join(
+            str(info.getFieldName(index)) for index in range(info.count)
+        )
+    except Exception:
+        pass
+    values["extent"] = extent(getattr(desc, "extent", None))
+    values["spatialReference"] = spatial_reference(
+        getattr(desc, "spatialReference", None)
+    )
+    return values
+
+
+def raster_properties(raster):
+    """Read the properties of a raster.
+
+    Args:
+        raster (Raster): arcpy Raster.
+
+    Returns:
+        dict: RASTER_PROPERTIES and 'extent' (see extent()).
+    """
+    values = properties(raster, RASTER_PROPERTIES)
+    values["extent"] = extent(getattr(raster, "extent", None))
+    return values
+
+
+def iter_layers(layers, rules, groups=False):
+    """Iterate the layers to describe.
+
+    arcpy.mapping.ListLayers() and Map.listLayers() already list the layers
+    inside group layers, at any depth, so group layers themselves are not
+    walked.
+
+    Args:
+        layers (list): Layers, including group layers and their contents.
+        rules (ExclusionRules): Layers to skip.
+        groups (bool, optional): Also yield the group layers, which the APRX
+            scanner reports as rows of their own. Defaults to False.
+
+    Yields:
+        Layer: Each layer that is not excluded, and not a group layer unless
+            groups is True.
+    """
+    for layer in layers:
+        if (layer.isGroupLayer and not groups) or rules.excluded(layer):
+            continue
+        yield layer
+
+
+class ScanContext(object):
+    """The components shared by the projects of a scan run.
+
+    Args:
+        rules (ExclusionRules): Layers to skip.
+        watchdog (Watchdog, optional): Server check run before data source
+            probes.
+            Defaults to a Watchdog with the default timeout and per-host
+            limits.
+        raster_stats (RasterStats, optional): Raster statistics. Defaults to
+            RasterStats().
+        profiler (LayerProfiler, optional): Feature layer profiler. Defaults
+            to None (no profile).
+        repair (RepairIndex, optional): Index used to suggest repair paths
+            for broken layers. Defaults to None (no suggestions).
+    """
+
+    def __init__(
+        self, rules, watchdog=None, raster_stats=None, profiler=None, repair=None
+    ):
+        self.rules = rules
+        self.watchdog = watchdog or Watchdog(TIMEOUT, HostLimiter())
+        self.raster_stats = raster_stats or RasterStats()
+        self.profiler = profiler
+        self.repair = repair
+        self.health = SourceHealth(limiter=self.watchdog.limiter)
+
+    @classmethod
+    def from_value(cls, config, default_exclusions, timeout=TIMEOUT, repair=None):
+        """Create a scan context from a toolbox parameter value.
+
+        Args:
+            config (str): Path to a JSON config file with exclusion rules,
+                "hostLimits", "rasterStats", and "profile" sections. An empty
+                value uses the defaults.
+            default_exclusions (dict): Exclusion rules used when the config
+                has none.
+            timeout (float, optional): Seconds to wait for the server of each
+                data source. Defaults to TIMEOUT.
+            repair (RepairIndex, optional): Repair index. Defaults to None.
+
+        Returns:
+            ScanContext: Context.
+        """
+        return cls(
+            ExclusionRules.from_value(config, default_exclusions),
+            Watchdog(timeout, HostLimiter.from_value(config)),
+            RasterStats.from_value(config),
+            LayerProfiler.from_value(config),
+            repair,
+        )
+
+    @property
+    def limiter(self):
+        return self.watchdog.limiter
+
+    def probe(self, data_source, func, *args):
+        """Run a probe once the watchdog has checked its server.
+
+        Args:
+            data_source (str): Data source the probe reads.
+            func (callable): Probe function.
+            *args: Probe function arguments.
+
+        Returns:
+            tuple: (return value, status), where the value is None and the
+                status is the SourceTimeout status if its server did not
+                respond.
+                Other errors are raised.
+        """
+        try:
+            return self.watchdog.call(data_source, func, *args), STATUS_OK
+        except SourceTimeout as e:
+            return None, e.status
+
+    def run(self, data_source, func, *args):
+        """Run a long read, such as raster statistics or a table profile,
+        without the probe deadline. Its host is never blacklisted.
+
+        Args:
+            data_source (str): Data source the function reads.
+            func (callable): Function.
+            *args: Function arguments.
+
+        Returns:
+            tuple: (return value, status), where the value is None and the
+                status is STATUS_HOST_BLACKLISTED if the host was already
+                blacklisted. Other errors are raised.
+        """
+        try:
+            return self.watchdog.run(data_source, func, *args), STATUS_OK
+        except SourceTimeout as e:
+            return None, e.status
+
+    def summary(self):
+        """Summarize exclusions, timeouts, host limits, raster statistics,
+        and profiles.
+
+        Returns:
+            list: Lines of text.
+        """
+        lines = self.rules.summary() + self.watchdog.summary()
+        if self.limiter is not None:
+            lines += self.limiter.summary()
+        lines += self.raster_stats.summary()
+        if self.profiler is not None:
+            lines += self.profiler.summary()
+        return lines
+
+    def close(self):
+        """Close the repair index and profile cache."""
+        if self.repair is not None:
+            self.repair.close()
+        if self.profiler is not None:
+            self.profiler.close()
@@ -0,0 +1,930 @@
+# PURPOSE
+#   Write APRX and MXD scan results as normalized tables (projects, maps,
+#   mapframes, layers, fields) instead of one wide CSV, either as separate
+#   CSV files or into a SQLite inventory database, or as typed columnar
+#   Parquet or Arrow IPC files. Layer extents can also be written as
+#   polygon footprints to a GeoPackage.
+#
+# NOTES
+#   1) Python 2.7 (ArcMap) text and file differences are handled here.
+#   2) Each scanner builds its tables as lists of row dicts with integer
+#      keys that are local to the scan, and a list of TableKey definitions
+#      describing each table's key and parent. When writing to SQLite the
+#      keys are offset past the keys already in the database, so many scans
+#      can be loaded into one inventory.
+#   3) Rescanning a project replaces its rows in the SQLite inventory. Child
+#      rows are removed through ON DELETE CASCADE foreign keys.
+#   4) Columns are added to existing SQLite tables as new columns appear, so
+#      scans with different column selections can share an inventory.
+#   5) Parquet and Arrow IPC output requires pyarrow, which is imported only
+#      when one of these formats is written. Column types are inferred from
+#      every row: full row groups are spooled to a temporary file until the
+#      output is closed, so a later value never has to be coerced to a type
+#      picked from earlier rows. Parquet string columns are dictionary
+#      encoded, so repeated paths and coordinate system names are stored
+#      once per row group.
+#   6) StringPool.intern_row() replaces the string values of scan rows with
+#      a single shared copy of each distinct string, so that coordinate
+#      system names, units, and data source paths repeated across many
+#      layers are stored once. A dict is used rather than intern() because
+#      the Python 2 builtin does not accept unicode strings. Each scan uses
+#      its own pool, so the strings are released with the scan's rows.
+#      The APRX scanner also shares map and project attributes between rows
+#      with ChainMaps, so every writer here reads rows only as mappings and
+#      never copies or pickles them.
+#   7) Output files are written to a temporary file in the same directory and
+#      moved into place when complete (see atomic_open()), so an interrupted
+#      scan never leaves a partially written file behind.
+#   8) Layer extents can be written as polygon features to a GeoPackage,
+#      using only the sqlite3 module. Extents are stored in one feature table
+#      per spatial reference system, each with an R-tree spatial index that
+#      is kept up to date by the standard GeoPackage triggers. The ST_
+#      functions those triggers call are registered on the connection.
+#      Each scan is written in one transaction. Extents without a defined
+#      spatial reference go to layer_extents_srs_m1 (undefined Cartesian,
+#      srs_id -1) or layer_extents_srs_0 (undefined geographic, srs_id 0),
+#      which the GeoPackage specification treats as different systems.
+#
+# HISTORY
+#   DATE            REVISION
+#   ----------      -------------------------------------------------------
+#   2026-10-19      Created.
+# =========================================================================
+
+import collections
+import contextlib
+import csv
+import hashlib
+import os
+import pickle
+import sqlite3
+import struct
+import sys
+import tempfile
+
+INVENTORY_DB = "scan_inventory.sqlite"
+COLUMNAR_FORMATS = {"PARQUET": ".parquet", "ARROW": ".arrow"}
+ROW_GROUP_ROWS = 10000
+COMPRESSION = "zstd"
+
+try:
+    TEXT_TYPES = (str, unicode)
+    INTEGER_TYPES = (int, long)
+except NameError:  # Python 3
+    TEXT_TYPES = (str,)
+    INTEGER_TYPES = (int,)
+
+# Key definition of one table. 'parents' lists the (column, table) of each
+# foreign key to a parent table. 'unique' is the column that identifies a row
+# to replace on rescan (root tables only).
+TableKey = collections.namedtuple("TableKey", ["table", "key", "parents", "unique"])
+
+
+class StringPool(object):
+    """Shared copies of the distinct strings of one scan's rows."""
+
+    def __init__(self):
+        self._strings = {}
+
+    def intern_row(self, row):
+        """Replace the string values of a row with shared copies.
+
+        Args:
+            row (dict): Row values by column name. Updated in place.
+
+        Returns:
+            dict: The same row.
+        """
+        for key, value in list(row.items()):
+            if isinstance(value, TEXT_TYPES):
+                row[key] = self._strings.setdefault(value, value)
+        return row
+
+
+def output_name(project_path, unique=False):
+    """Get the file name prefix of a project's output files.
+
+    Args:
+        project_path (str): APRX or MXD file path.
+        unique (bool, optional): Append a short hash of the full project
+            path, so that projects with the same name in different folders
+            do not write to the same files. Defaults to False.
+
+    Returns:
+        str: Project name, with the hash if unique is True.
+    """
+    name = os.path.splitext(os.path.basename(project_path))[0]
+    if not unique:
+        return name
+    path = os.path.normcase(os.path.abspath(project_path))
+    if not isinstance(path, bytes):
+        path = path.encode("utf-8")
+    return name + "_" + hashlib.sha1(path).hexdigest()[:8]
+
+
+def replace_file(src, dst):
+    """Move a file over another file. os.replace() is used where available
+    (Python 3). On Python 2 the destination is removed first on Windows,
+    where os.rename() does not overwrite.
+
+    Args:
+        src (str): Source path.
+        dst (str): Destination path.
+    """
+    if hasattr(os, "replace"):
+        os.replace(src, dst)
+        return
+    if os.name == "nt" and os.path.exists(dst):
+        os.remove(dst)
+    os.rename(src, dst)
+
+
+@contextlib.contextmanager
+def atomic_path(path):
+    """Give a temporary path beside an output path, and move it over the
+    output path only if the block completes.
+
+    Args:
+        path (str): Output path.
+
+    Yields:
+        str: Temporary path to write to.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        prefix="." + os.path.basename(path) + ".", suffix=".tmp", dir=directory
+    )
+    os.close(fd)
+    try:
+        yield tmp_path
+        replace_file(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@contextlib.contextmanager
+def atomic_open(path):
+    """Open a CSV output file for writing so that it is replaced atomically.
+
+    Args:
+        path (str): Output path.
+
+    Yields:
+        file: File object open for the csv module ("wb" on Python 2, text
+            with newline="" on Python 3).
+    """
+    with atomic_path(path) as tmp_path:
+        if sys.version_info[0] < 3:
+            f = open(tmp_path, "wb")
+        else:
+            f = open(tmp_path, "w", newline="")
+        with f:
+            yield f
+
+
+def table_columns(rows):
+    """Get the unique columns of a table in first-seen order.
+
+    Args:
+        rows (list): Row dicts.
+
+    Returns:
+        list: Column names.
+    """
+    columns = []
+    seen = set()
+    for row in rows:
+        for column in row:
+            if column not in seen:
+                seen.add(column)
+                columns.append(column)
+    return columns
+
+
+def split_fields(field_names):
+    """Split a semicolon-delimited field list into field rows.
+
+    Args:
+        field_names (str): Field names separated by semicolons.
+
+    Returns:
+        list: (position, field name) tuples.
+    """
+    if not field_names:
+        return []
+    names = [name for name in field_names.split(";") if name]
+    return list(enumerate(names, 1))
+
+
+def write_csv(rows, columns, path):
+    """Write rows to one CSV file. Values are written as text, and columns
+    missing from a row are left empty.
+
+    Args:
+        rows (iterable): Row mappings, such as the ChainMaps of shared
+            attributes built by the APRX scanner.
+        columns (list): Column names, in output order.
+        path (str): Output file path.
+
+    Returns:
+        str: Output file path.
+    """
+    with atomic_open(path) as f:
+        writer = csv.writer(f, delimiter=",", quotechar='"', quoting=csv.QUOTE_MINIMAL)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(
+                [str(row[column]) if column in row else None for column in columns]
+            )
+    return path
+
+
+def write_csv_tables(tables, output_dir, prefix):
+    """Write each table to its own CSV file.
+
+    Args:
+        tables (OrderedDict): Row dicts for each table name.
+        output_dir (str): Output directory.
+        prefix (str): File name prefix, usually the project name.
+
+    Returns:
+        list: Output files created.
+    """
+    outputs = []
+    for table, rows in tables.items():
+        path = os.path.join(output_dir, "{}_{}.csv".format(prefix, table))
+        columns = table_columns(rows)
+        with atomic_open(path) as f:
+            writer = csv.writer(
+                f, delimiter=",", quotechar='"', quoting=csv.QUOTE_MINIMAL
+            )
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow([row.get(column) for column in columns])
+        outputs.append(path)
+    return outputs
+
+
+def _sqlite_type(values):
+    """Pick a SQLite column type for a list of Python values. Empty strings,
+    which the MXD scanner uses for missing values, are ignored. Booleans are
+    stored as integers, so BOOLEAN columns let readers convert them back."""
+    types = set(type(value) for value in values if value not in (None, ""))
+    if types == set([bool]):
+        return "BOOLEAN"
+    if types and types <= set([bool, int]):
+        return "INTEGER"
+    if types and types <= set([bool, int, float]):
+        return "REAL"
+    return "TEXT"
+
+
+def _sqlite_value(value):
+    """Convert values SQLite cannot store, such as lists, to text."""
+    if value is None or isinstance(value, (bool, int, float) + TEXT_TYPES):
+        return value
+    return str(value)
+
+
+def _quote(name):
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def _ensure_table(conn, table_key, columns, rows):
+    """Create a table, or add any of its columns that are missing."""
+    existing = [
+        r[1]
+        for r in conn.execute("PRAGMA table_info({})".format(_quote(table_key.table)))
+    ]
+    parents = dict(table_key.parents)
+    definitions = []
+    for column in columns:
+        if column in existing:
+            continue
+        if column == table_key.key:
+            definition = "{} INTEGER PRIMARY KEY".format(_quote(column))
+        elif column in parents:
+            definition = "{} INTEGER REFERENCES {} ({}) ON DELETE CASCADE".format(
+                _quote(column), _quote(parents[column]), _quote(column)
+            )
+        else:
+            definition = "{} {}".format(
+                _quote(column), _sqlite_type([row.get(column) for row in rows])
+            )
+        definitions.append((column, definition))
+    if not existing:
+        conn.execute(
+            "CREATE TABLE {} ({})".format(
+                _quote(table_key.table), ", ".join(d for c, d in definitions)
+            )
+        )
+        indexed = list(parents)
+        if table_key.unique:
+            indexed.append(table_key.unique)
+        for column in indexed:
+            conn.execute(
+                "CREATE INDEX {} ON {} ({})".format(
+                    _quote("{}_{}".format(table_key.table, column)),
+                    _quote(table_key.table),
+                    _quote(column),
+                )
+            )
+    else:
+        for column, definition in definitions:
+            conn.execute(
+                "ALTER TABLE {} ADD COLUMN {}".format(
+                    _quote(table_key.table), definition
+                )
+            )
+
+
+def write_sqlite(tables, keys, db_path):
+    """Load tables into a SQLite inventory database.
+
+    Rows of root tables that match an existing row on their unique column
+    are replaced, along with their child rows.
+
+    Args:
+        tables (OrderedDict): Row dicts for each table name, parents first.
+        keys (list): TableKey for each table.
+        db_path (str): SQLite database path. Created if it does not exist.
+
+    Returns:
+        str: Database path.
+    """
+    keys = dict((table_key.table, table_key) for table_key in keys)
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA foreign_keys = ON")
+        with conn:
+            offsets = {}
+            for table, rows in tables.items():
+                table_key = keys[table]
+                columns = table_columns(rows)
+                for column in (table_key.key, table_key.unique):
+                    if column and column not in columns:
+                        columns.append(column)
+                _ensure_table(conn, table_key, columns, rows)
+                if table_key.unique:
+                    conn.executemany(
+                        "DELETE FROM {} WHERE {} = ?".format(
+                            _quote(table), _quote(table_key.unique)
+                        ),
+                        [(row.get(table_key.unique),) for row in rows],
+                    )
+                offsets[table] = conn.execute(
+                    "SELECT COALESCE(MAX({}), 0) FROM {}".format(
+                        _quote(table_key.key), _quote(table)
+                    )
+                ).fetchone()[0]
+                # Shift the local keys of this table and its parents past the
+                # keys already in the database.
+                shift = dict(
+                    (column, offsets[parent]) for column, parent in table_key.parents
+                )
+                shift[table_key.key] = offsets[table]
+                values = []
+                for row in rows:
+                    value = []
+                    for column in columns:
+                        item = row.get(column)
+                        if item is not None and column in shift:
+                            item += shift[column]
+                        value.append(item)
+                    values.append(value)
+                conn.executemany(
+                    "INSERT INTO {} ({}) VALUES ({})".format(
+                        _quote(table),
+                        ", ".join(_quote(column) for column in columns),
+                        ", ".join("?" * len(columns)),
+                    ),
+                    values,
+                )
+    finally:
+        conn.close()
+    return db_path
+
+
+class ColumnarWriter(object):
+    """Write rows to a Parquet or Arrow IPC file in row group batches.
+
+    Args:
+        path (str): Output file path.
+        columns (list): Column names, in output order.
+        output_format (str, optional): PARQUET or ARROW. Defaults to PARQUET.
+        batch_rows (int, optional): Rows per row group. Defaults to
+            ROW_GROUP_ROWS.
+    """
+
+    def __init__(self, path, columns, output_format="PARQUET", batch_rows=None):
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("pyarrow is required for {} output".format(output_format))
+        self.pa = pyarrow
+        self.path = path
+        self.columns = list(columns)
+        self.output_format = output_format
+        self.batch_rows = batch_rows or ROW_GROUP_ROWS
+        self.rows = []
+        # Types of the non-empty values seen in each column.
+        self.types = dict((column, set()) for column in self.columns)
+        self.spool = None
+        self.schema = None
+        self.writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, row):
+        """Add a row, spooling the batch when it is full.
+
+        Args:
+            row (Mapping): Row values by column name.
+        """
+        # Rows are kept as tuples of plain values, because the rows of a scan
+        # may be views (ChainMap, MappingProxyType) that cannot be pickled.
+        values = tuple(row.get(column) for column in self.columns)
+        for column, value in zip(self.columns, values):
+            if value is not None and value != "":
+                self.types[column].add(type(value))
+        self.rows.append(values)
+        if len(self.rows) >= self.batch_rows:
+            if self.spool is None:
+                self.spool = tempfile.TemporaryFile()
+            pickle.dump(self.rows, self.spool, pickle.HIGHEST_PROTOCOL)
+            self.rows = []
+
+    def _field_type(self, types):
+        """Pick an Arrow type that holds every value type of one column."""
+        pa = self.pa
+        if not types:
+            return pa.string()
+        if types == set([bool]):
+            return pa.bool_()
+        if all(issubclass(t, INTEGER_TYPES) and t is not bool for t in types):
+            return pa.int64()
+        if all(
+            (issubclass(t, INTEGER_TYPES) or issubclass(t, float)) and t is not bool
+            for t in types
+        ):
+            return pa.float64()
+        return pa.string()
+
+    def _open(self):
+        pa = self.pa
+        self.schema = pa.schema(
+            [(column, self._field_type(self.types[column])) for column in self.columns]
+        )
+        if self.output_format == "ARROW":
+            self.writer = pa.ipc.new_file(
+                self.path,
+                self.schema,
+                options=pa.ipc.IpcWriteOptions(compression=COMPRESSION),
+            )
+        else:
+            import pyarrow.parquet
+
+            self.writer = pyarrow.parquet.ParquetWriter(
+                self.path,
+                self.schema,
+                compression=COMPRESSION,
+                use_dictionary=True,
+            )
+
+    def _convert(self, value, field_type):
+        """Convert a value to a column's type. Empty strings are written as
+        nulls. Numbers are only widened (integer to float) or written as
+        text, never narrowed."""
+        pa = self.pa
+        if value is None or value == "":
+            return None
+        if field_type == pa.string():
+            if isinstance(value, (list, tuple)):
+                return ";".join(str(item) for item in value)
+            return value if isinstance(value, TEXT_TYPES) else str(value)
+        if field_type == pa.float64() and not isinstance(value, bool):
+            return float(value)
+        # The schema covers every value type written, so anything else is a
+        # bug rather than data to drop.
+        if (field_type == pa.bool_()) != isinstance(value, bool):
+            raise TypeError(
+                "{!r} does not fit column type {}".format(value, field_type)
+            )
+        return value
+
+    def _write_rows(self, rows):
+        """Write rows (tuples in column order) as one row group."""
+        pa = self.pa
+        arrays = []
+        for index, field in enumerate(self.schema):
+            arrays.append(
+                pa.array(
+                    [self._convert(row[index], field.type) for row in rows],
+                    type=field.type,
+                )
+            )
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        """Write the spooled and remaining rows and close the file."""
+        self._open()
+        try:
+            if self.spool is not None:
+                self.spool.seek(0)
+                while True:
+                    try:
+                        rows = pickle.load(self.spool)
+                    except EOFError:
+                        break
+                    self._write_rows(rows)
+            if self.rows:
+                self._write_rows(self.rows)
+            self.rows = []
+        finally:
+            self.writer.close()
+            if self.spool is not None:
+                self.spool.close()
+
+
+def write_columnar(rows, columns, path, output_format="PARQUET"):
+    """Write rows to a Parquet or Arrow IPC file.
+
+    Args:
+        rows (iterable): Row mappings.
+        columns (list): Column names, in output order.
+        path (str): Output file path.
+        output_format (str, optional): PARQUET or ARROW. Defaults to PARQUET.
+
+    Returns:
+        str: Output file path.
+    """
+    with atomic_path(path) as tmp_path:
+        with ColumnarWriter(tmp_path, columns, output_format) as writer:
+            for row in rows:
+                writer.write(row)
+    return path
+
+
+EXTENTS_GPKG = "scan_extents.gpkg"
+GPKG_APPLICATION_ID = 0x47504B47  # "GPKG"
+GPKG_USER_VERSION = 10300  # GeoPackage 1.3
+WGS84_WKT = (
+    'GEOGCS["WGS 84",DATUM["WGS_1984",SPHEROID["WGS 84",6378137,298.257223563]],'
+    'PRIMEM["Greenwich",0],UNIT["degree",0.0174532925199433]]'
+)
+# R-tree triggers from the GeoPackage specification (Annex F.3), for a
+# table and geometry column.
+RTREE_TRIGGERS = [
+    """CREATE TRIGGER "rtree_{t}_{c}_insert" AFTER INSERT ON "{t}"
+    WHEN (new."{c}" NOT NULL AND NOT ST_IsEmpty(new."{c}"))
+    BEGIN
+        INSERT OR REPLACE INTO "rtree_{t}_{c}" VALUES (
+            new."{i}", ST_MinX(new."{c}"), ST_MaxX(new."{c}"),
+            ST_MinY(new."{c}"), ST_MaxY(new."{c}"));
+    END""",
+    """CREATE TRIGGER "rtree_{t}_{c}_update1" AFTER UPDATE OF "{c}" ON "{t}"
+    WHEN OLD."{i}" = NEW."{i}" AND
+        (NEW."{c}" NOTNULL AND NOT ST_IsEmpty(NEW."{c}"))
+    BEGIN
+        INSERT OR REPLACE INTO "rtree_{t}_{c}" VALUES (
+            NEW."{i}", ST_MinX(NEW."{c}"), ST_MaxX(NEW."{c}"),
+            ST_MinY(NEW."{c}"), ST_MaxY(NEW."{c}"));
+    END""",
+    """CREATE TRIGGER "rtree_{t}_{c}_update2" AFTER UPDATE OF "{c}" ON "{t}"
+    WHEN OLD."{i}" = NEW."{i}" AND
+        (NEW."{c}" ISNULL OR ST_IsEmpty(NEW."{c}"))
+    BEGIN
+        DELETE FROM "rtree_{t}_{c}" WHERE id = OLD."{i}";
+    END""",
+    """CREATE TRIGGER "rtree_{t}_{c}_update3" AFTER UPDATE ON "{t}"
+    WHEN OLD."{i}" != NEW."{i}" AND
+        (NEW."{c}" NOTNULL AND NOT ST_IsEmpty(NEW."{c}"))
+    BEGIN
+        DELETE FROM "rtree_{t}_{c}" WHERE id = OLD."{i}";
+        INSERT OR REPLACE INTO "rtree_{t}_{c}" VALUES (
+            NEW."{i}", ST_MinX(NEW."{c}"), ST_MaxX(NEW."{c}"),
+            ST_MinY(NEW."{c}"), ST_MaxY(NEW."{c}"));
+    END""",
+    """CREATE TRIGGER "rtree_{t}_{c}_update4" AFTER UPDATE ON "{t}"
+    WHEN OLD."{i}" != NEW."{i}" AND
+        (NEW."{c}" ISNULL OR ST_IsEmpty(NEW."{c}"))
+    BEGIN
+        DELETE FROM "rtree_{t}_{c}" WHERE id IN (OLD."{i}", NEW."{i}");
+    END""",
+    """CREATE TRIGGER "rtree_{t}_{c}_delete" AFTER DELETE ON "{t}"
+    WHEN old."{c}" NOT NULL
+    BEGIN
+        DELETE FROM "rtree_{t}_{c}" WHERE id = OLD."{i}";
+    END""",
+]
+
+
+def gpkg_polygon(srs_id, xmin, ymin, xmax, ymax):
+    """Encode an extent as a GeoPackage polygon geometry blob.
+
+    Args:
+        srs_id (int): Spatial reference system id.
+        xmin, ymin, xmax, ymax (float): Extent.
+
+    Returns:
+        bytes: GeoPackage binary header with envelope, followed by a little
+            endian WKB polygon.
+    """
+    ring = [(xmin, ymin), (xmax, ymin), (xmax, ymax), (xmin, ymax), (xmin, ymin)]
+    # Magic, version 0, flags: little endian with a [minx, maxx, miny, maxy]
+    # envelope.
+    header = struct.pack("<2sBBi4d", b"GP", 0, 0x03, srs_id, xmin, xmax, ymin, ymax)
+    wkb = struct.pack("<BIII", 1, 3, 1, len(ring))
+    wkb += b"".join(struct.pack("<2d", x, y) for x, y in ring)
+    return header + wkb
+
+
+def _gpkg_envelope(blob):
+    """Read the envelope of a GeoPackage geometry blob, for the ST_ functions
+    called by the R-tree triggers.
+
+    Returns:
+        tuple: (minx, maxx, miny, maxy), or None if the blob has no envelope
+            or is empty.
+    """
+    if blob is None:
+        return None
+    blob = bytes(blob)
+    flags = bytearray(blob[3:4])[0]
+    if flags & 0x10:  # Empty geometry
+        return None
+    order = "<" if flags & 0x01 else ">"
+    if (flags >> 1) & 0x07 == 0:
+        return None
+    return struct.unpack(order + "4d", blob[8:40])
+
+
+def _register_gpkg_functions(conn):
+    conn.create_function("ST_IsEmpty", 1, lambda g: int(_gpkg_envelope(g) is None))
+    for name, index in (("ST_MinX", 0), ("ST_MaxX", 1), ("ST_MinY", 2), ("ST_MaxY", 3)):
+
+        def envelope_value(g, index=index):
+            envelope = _gpkg_envelope(g)
+            return None if envelope is None else envelope[index]
+
+        conn.create_function(name, 1, envelope_value)
+
+
+class GeoPackageWriter(object):
+    """Write layer extents as polygon features to a GeoPackage, with one
+    feature table per spatial reference system.
+
+    Args:
+        path (str): GeoPackage path. Created if it does not exist.
+        srs_definition (callable): Function returning the (name, WKT
+            definition) of a spatial reference system id.
+        table_prefix (str, optional): Feature table name prefix. Defaults to
+            "layer_extents".
+    """
+
+    def __init__(self, path, srs_definition, table_prefix="layer_extents"):
+        self.path = path
+        self.srs_definition = srs_definition
+        self.table_prefix = table_prefix
+        self.tables = {}
+        self.rtree = True
+        # Transactions are managed here, so that table creation, replace(),
+        # and the inserts of a scan are committed or rolled back together.
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        _register_gpkg_functions(self.conn)
+        self.conn.execute("BEGIN")
+        # A file left empty by an aborted first scan is created again.
+        if not self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'gpkg_contents'"
+        ).fetchone():
+            self._create()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _create(self):
+        conn = self.conn
+        conn.execute("PRAGMA application_id = {}".format(GPKG_APPLICATION_ID))
+        conn.execute("PRAGMA user_version = {}".format(GPKG_USER_VERSION))
+        for statement in """
+            CREATE TABLE gpkg_spatial_ref_sys (
+                srs_name TEXT NOT NULL,
+                srs_id INTEGER NOT NULL PRIMARY KEY,
+                organization TEXT NOT NULL,
+                organization_coordsys_id INTEGER NOT NULL,
+                definition TEXT NOT NULL,
+                description TEXT
+            );
+            CREATE TABLE gpkg_contents (
+                table_name TEXT NOT NULL PRIMARY KEY,
+                data_type TEXT NOT NULL,
+                identifier TEXT UNIQUE,
+                description TEXT DEFAULT '',
+                last_change DATETIME NOT NULL
+                    DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ','now')),
+                min_x DOUBLE,
+                min_y DOUBLE,
+                max_x DOUBLE,
+                max_y DOUBLE,
+                srs_id INTEGER,
+                CONSTRAINT fk_gc_r_srs_id FOREIGN KEY (srs_id)
+                    REFERENCES gpkg_spatial_ref_sys(srs_id)
+            );
+            CREATE TABLE gpkg_geometry_columns (
+                table_name TEXT NOT NULL,
+                column_name TEXT NOT NULL,
+                geometry_type_name TEXT NOT NULL,
+                srs_id INTEGER NOT NULL,
+                z TINYINT NOT NULL,
+                m TINYINT NOT NULL,
+                CONSTRAINT pk_geom_cols PRIMARY KEY (table_name, column_name),
+                CONSTRAINT fk_gc_tn FOREIGN KEY (table_name)
+                    REFERENCES gpkg_contents(table_name),
+                CONSTRAINT fk_gc_srs FOREIGN KEY (srs_id)
+                    REFERENCES gpkg_spatial_ref_sys (srs_id)
+            );
+            CREATE TABLE gpkg_extensions (
+                table_name TEXT,
+                column_name TEXT,
+                extension_name TEXT NOT NULL,
+                definition TEXT NOT NULL,
+                scope TEXT NOT NULL,
+                CONSTRAINT ge_tce UNIQUE (table_name, column_name, extension_name)
+            );
+            """.split(";"):
+            # executescript() would commit the open transaction first.
+            if statement.strip():
+                conn.execute(statement)
+        conn.executemany(
+            "INSERT INTO gpkg_spatial_ref_sys VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                ("Undefined cartesian SRS", -1, "NONE", -1, "undefined", None),
+                ("Undefined geographic SRS", 0, "NONE", 0, "undefined", None),
+                ("WGS 84 geodetic", 4326, "EPSG", 4326, WGS84_WKT, None),
+            ],
+        )
+
+    def _table(self, srs_id, row):
+        """Get (or create) the feature table for a spatial reference system,
+        adding any attribute columns it is missing."""
+        if srs_id > 0:
+            table = "{}_{}".format(self.table_prefix, srs_id)
+        else:
+            table = "{}_srs_{}".format(self.table_prefix, "0" if srs_id == 0 else "m1")
+        conn = self.conn
+        if table not in self.tables:
+            if not conn.execute(
+                "SELECT 1 FROM gpkg_spatial_ref_sys WHERE srs_id = ?", (srs_id,)
+            ).fetchone():
+                name, definition = self.srs_definition(srs_id)
+                conn.execute(
+                    "INSERT INTO gpkg_spatial_ref_sys VALUES (?, ?, ?, ?, ?, ?)",
+                    (name, srs_id, "EPSG", srs_id, definition, None),
+                )
+            existing = [
+                r[1]
+                for r in conn.execute("PRAGMA table_info({})".format(_quote(table)))
+            ]
+            if not existing:
+                self._create_table(table, srs_id)
+                existing = ["fid", "geom"]
+            self.tables[table] = existing
+        columns = self.tables[table]
+        for column in row:
+            if column not in columns:
+                conn.execute(
+                    "ALTER TABLE {} ADD COLUMN {} {}".format(
+                        _quote(table), _quote(column), _sqlite_type([row[column]])
+                    )
+                )
+                columns.append(column)
+        return table
+
+    def _create_table(self, table, srs_id):
+        conn = self.conn
+        conn.execute(
+            "CREATE TABLE {} (fid INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "geom POLYGON)".format(_quote(table))
+        )
+        conn.execute(
+            "INSERT INTO gpkg_contents (table_name, data_type, identifier, srs_id) "
+            "VALUES (?, 'features', ?, ?)",
+            (table, table, srs_id),
+        )
+        conn.execute(
+            "INSERT INTO gpkg_geometry_columns VALUES (?, 'geom', 'POLYGON', ?, 0, 0)",
+            (table, srs_id),
+        )
+        try:
+            conn.execute(
+                'CREATE VIRTUAL TABLE "rtree_{}_geom" USING '
+                "rtree(id, minx, maxx, miny, maxy)".format(table)
+            )
+        except sqlite3.OperationalError:
+            # SQLite was built without the R-tree module.
+            self.rtree = False
+            return
+        for trigger in RTREE_TRIGGERS:
+            conn.execute(trigger.format(t=table, c="geom", i="fid"))
+        conn.execute(
+            "INSERT INTO gpkg_extensions VALUES (?, 'geom', 'gpkg_rtree_index', "
+            "'http://www.geopackage.org/spec120/#extension_rtree', 'write-only')",
+            (table,),
+        )
+
+    def replace(self, column, value):
+        """Delete the features of every table where a column has a value, for
+        example the features of a project that is being scanned again.
+
+        Args:
+            column (str): Attribute column.
+            value: Attribute value.
+        """
+        for (table,) in self.conn.execute(
+            "SELECT table_name FROM gpkg_contents WHERE table_name LIKE ?",
+            (self.table_prefix + "_%",),
+        ).fetchall():
+            columns = [
+                r[1]
+                for r in self.conn.execute(
+                    "PRAGMA table_info({})".format(_quote(table))
+                )
+            ]
+            if column in columns:
+                self.conn.execute(
+                    "DELETE FROM {} WHERE {} = ?".format(_quote(table), _quote(column)),
+                    (value,),
+                )
+
+    def write(self, srs_id, extent, row):
+        """Write one extent as a polygon feature.
+
+        Args:
+            srs_id (int): Spatial reference system id of the extent, 0 for
+                an undefined geographic system, or -1 (or None) for an
+                undefined Cartesian system.
+            extent (tuple): (xmin, ymin, xmax, ymax).
+            row (dict): Attribute values.
+
+        Returns:
+            bool: False if the extent was missing or empty (NaN, as reported
+                for empty datasets) and no feature was written.
+        """
+        # NaN is the only value that is not equal to itself.
+        if any(v is None or v != v for v in extent):
+            return False
+        srs_id = -1 if srs_id in (None, "") else max(int(srs_id), -1)
+        table = self._table(srs_id, row)
+        columns = ["geom"] + list(row)
+        # Bind the geometry as a BLOB, not TEXT, which under Python 2 a str
+        # would be.
+        values = [sqlite3.Binary(gpkg_polygon(srs_id, *extent))] + [
+            _sqlite_value(row[c]) for c in row
+        ]
+        self.conn.execute(
+            "INSERT INTO {} ({}) VALUES ({})".format(
+                _quote(table),
+                ", ".join(_quote(c) for c in columns),
+                ", ".join("?" * len(columns)),
+            ),
+            values,
+        )
+        return True
+
+    def close(self):
+        """Update the table bounds in gpkg_contents, commit, and close."""
+        conn = self.conn
+        for (table,) in conn.execute(
+            "SELECT table_name FROM gpkg_contents WHERE table_name LIKE ?",
+            (self.table_prefix + "_%",),
+        ).fetchall():
+            conn.execute(
+                "UPDATE gpkg_contents SET "
+                "last_change = strftime('%Y-%m-%dT%H:%M:%fZ','now'), "
+                "min_x = (SELECT MIN(ST_MinX(geom)) FROM {t}), "
+                "max_x = (SELECT MAX(ST_MaxX(geom)) FROM {t}), "
+                "min_y = (SELECT MIN(ST_MinY(geom)) FROM {t}), "
+                "max_y = (SELECT MAX(ST_MaxY(geom)) FROM {t}) "
+                "WHERE table_name = ?".format(t=_quote(table)),
+                (table,),
+            )
+        conn.commit()
+        conn.close()
+
+    def abort(self):
+        """Roll back everything written since the writer was opened, and
+        close."""
+        self.conn.rollback()
+        self.conn.close()
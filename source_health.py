@@ -0,0 +1,243 @@
+# PURPOSE
+#   Check that layer data sources exist on disk and report their size and
+#   modified time, listing each parent directory once instead of stat-ing
+#   every path individually.
+#
+# NOTES
+#   1) mxd_metadata.py checks its data sources with this module under ArcMap
+#      (Python 2.7), which has no os.scandir(). There a full listing would
+#      need one stat per directory entry, so only the data source names
+#      wanted in each directory are stat-ed. Directories are listed with
+#      multiprocessing.pool.ThreadPool, as concurrent.futures is not
+#      available in Python 2.7.
+#   2) Directories are listed concurrently, at most MAX_WORKERS at a time.
+#      When a HostLimiter is given, each file server is also held to its
+#      own adaptive limit (see host_limits.py), so that one slow server is
+#      not overloaded while listings on other servers continue.
+#   3) Directory listings are cached by a SourceHealth object, which lives
+#      as long as the scan context of one run (see scan_engine.py), so a
+#      batch scan of many projects lists each directory once while a later
+#      run sees repaired data sources.
+#   4) Data sources inside a file geodatabase (or other folder or file
+#      based workspace) are checked at the workspace level. The size of a
+#      folder workspace is the total size of its files.
+#
+# HISTORY
+#   DATE            REVISION
+#   ----------      -------------------------------------------------------
+#   2026-10-19      Created.
+# =========================================================================
+
+import datetime
+import os
+import re
+import stat
+import threading
+from multiprocessing.pool import ThreadPool
+
+MAX_WORKERS = 16
+# Workspace extensions. A data source path is truncated after the first
+# component with one of these extensions.
+WORKSPACE_EXTENSIONS = (".gdb", ".mdb", ".sde", ".gpkg", ".sqlite")
+WORKSPACE_PATH = re.compile(
+    r"^(.*?(?:{}))(?=[\\/]|$)".format(
+        "|".join(re.escape(ext) for ext in WORKSPACE_EXTENSIONS)
+    ),
+    re.IGNORECASE,
+)
+
+
+def filesystem_path(data_source):
+    """Find the file or folder on disk that holds a data source.
+
+    Args:
+        data_source (str): Layer data source.
+
+    Returns:
+        str: File or folder path, or None if the data source is not a file
+            system path (for example a web service URL).
+    """
+    if not data_source or "://" in data_source:
+        return None
+    match = WORKSPACE_PATH.match(data_source)
+    if match:
+        return os.path.normpath(match.group(1))
+    return os.path.normpath(data_source)
+
+
+def _entry(st):
+    return st.st_size, st.st_mtime, stat.S_ISDIR(st.st_mode)
+
+
+def _list_dir(path, names=None):
+    """List a directory and stat its entries.
+
+    On Windows, os.scandir() returns file sizes and times from the directory
+    listing itself, so no extra request is made per file. Without
+    os.scandir() (Python 2.7) only the given names are stat-ed.
+
+    Args:
+        path (str): Directory path.
+        names (set, optional): Normalized entry names wanted. Defaults to
+            None (every entry).
+
+    Returns:
+        tuple: (entries, complete). entries maps each normalized entry name
+            to (size, mtime, is_dir), or to None for a wanted name that does
+            not exist, and is None if the directory cannot be read. complete
+            is True if every entry of the directory was listed.
+    """
+    entries = {}
+    try:
+        if hasattr(os, "scandir"):
+            for entry in os.scandir(path):
+                try:
+                    entries[os.path.normcase(entry.name)] = _entry(entry.stat())
+                except OSError:
+                    continue
+            return entries, True
+        if names is None:
+            names = os.listdir(path)
+        elif not os.path.isdir(path):
+            return None, True
+        for name in names:
+            try:
+                entries[os.path.normcase(name)] = _entry(
+                    os.stat(os.path.join(path, name))
+                )
+            except OSError:
+                entries[os.path.normcase(name)] = None
+    except OSError:
+        return None, True
+    return entries, names is None
+
+
+class SourceHealth(object):
+    """Check the existence, size, and modified time of layer data sources,
+    caching the directory listings of one scan run.
+
+    Args:
+        max_workers (int, optional): Maximum number of directories listed at
+            the same time. Defaults to MAX_WORKERS.
+        limiter (HostLimiter, optional): Per-host limits. Defaults to None
+            (no per-host limits).
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, limiter=None):
+        self.max_workers = max_workers
+        self.limiter = limiter
+        self._listings = {}
+        self._complete = set()
+        self._lock = threading.Lock()
+
+    def _missing(self, path, names):
+        """Names still to be read for a directory, or None to list it all.
+        Returns an empty set if the cached listing already covers them."""
+        if path in self._complete:
+            return set()
+        if names is None:
+            return None
+        return set(names) - set(self._listings.get(path) or {})
+
+    def _read(self, path, names):
+        if self.limiter is None:
+            entries, complete = _list_dir(path, names)
+        else:
+            with self.limiter.slot(path):
+                entries, complete = _list_dir(path, names)
+        with self._lock:
+            if entries is None or complete:
+                self._listings[path] = entries
+                self._complete.add(path)
+            else:
+                self._listings.setdefault(path, {}).update(entries)
+
+    def list_dirs(self, wanted):
+        """List directories concurrently and cache the results.
+
+        Args:
+            wanted (dict): Normalized entry names wanted in each directory
+                path, or None to list the whole directory.
+
+        Returns:
+            dict: Entries of each path, as returned by _list_dir().
+        """
+        with self._lock:
+            pending = []
+            for path, names in wanted.items():
+                missing = self._missing(path, names)
+                if missing is None or missing:
+                    pending.append((path, missing))
+        if len(pending) == 1:
+            self._read(*pending[0])
+        elif pending:
+            pool = ThreadPool(min(self.max_workers, len(pending)))
+            try:
+                pool.map(lambda item: self._read(*item), pending)
+            finally:
+                pool.close()
+                pool.join()
+        with self._lock:
+            return dict((path, self._listings.get(path)) for path in wanted)
+
+    def check(self, data_sources):
+        """Check the existence, size, and modified time of data sources.
+
+        Unique data source paths are grouped by parent directory and each
+        directory is listed once. Folder workspaces such as file
+        geodatabases are then listed to total their size.
+
+        Args:
+            data_sources (iterable): Layer data sources.
+
+        Returns:
+            dict: For each data source, a dict with 'exists' (bool, or None
+                if the data source is not a file system path), 'size'
+                (bytes), and 'modified' (ISO formatted date and time).
+        """
+        targets = {}
+        for data_source in set(data_sources):
+            if data_source:
+                targets[data_source] = filesystem_path(data_source)
+        paths = set(path for path in targets.values() if path)
+        wanted = {}
+        for path in paths:
+            wanted.setdefault(os.path.dirname(path), set()).add(
+                os.path.normcase(os.path.basename(path))
+            )
+        parents = self.list_dirs(wanted)
+
+        found = {}
+        folders = {}
+        for path in paths:
+            listing = parents.get(os.path.dirname(path))
+            entry = None
+            if listing is not None:
+                entry = listing.get(os.path.normcase(os.path.basename(path)))
+            found[path] = entry
+            if entry is not None and entry[2]:
+                folders[path] = None
+        contents = self.list_dirs(folders)
+
+        results = {}
+        for data_source, path in targets.items():
+            entry = found.get(path) if path else None
+            if path is None:
+                results[data_source] = {"exists": None, "size": "", "modified": ""}
+                continue
+            if entry is None:
+                results[data_source] = {"exists": False, "size": "", "modified": ""}
+                continue
+            size, mtime, is_dir = entry
+            if is_dir and contents.get(path) is not None:
+                files = [e for e in contents[path].values() if e and not e[2]]
+                size = sum(e[0] for e in files)
+                mtime = max([mtime] + [e[1] for e in files])
+            results[data_source] = {
+                "exists": True,
+                "size": size,
+                "modified": datetime.datetime.fromtimestamp(mtime).strftime(
+                    "%Y-%m-%d %H:%M:%S"
+                ),
+            }
+        return results
@@ -0,0 +1,282 @@
+# PURPOSE
+#   Check that the server of a data source responds within a deadline
+#   before slow per-layer probes (Describe, ListFields, Raster) are run on
+#   it, so that a layer on an unreachable server cannot stall a scan.
+#
+# NOTES
+#   1) mxd_metadata.py probes its layers through this module under ArcMap
+#      (Python 2.7), so it only uses socket and threading features that
+#      Python 2.7 also has.
+#   2) arcpy objects are not thread safe and arcpy calls cannot be
+#      cancelled, so probes run on the calling thread. Only the reachability
+#      check runs under the deadline: a TCP connection for URLs, and a stat
+#      of the share root or mapped drive, on a daemon thread, for file
+#      paths. A check that does not finish is abandoned, but it holds no
+#      arcpy object and no per-host slot. A root that responded is checked
+#      again before the next probe once RECHECK_SECONDS have passed, so a
+#      server that stops responding during a run is blacklisted too.
+#   3) Probe hangs are NOT bounded. The probe itself (Describe, ListFields,
+#      Raster) has no deadline, so a server that passes the check and then
+#      stalls within RECHECK_SECONDS still stalls the scan. Data sources
+#      with no root that can be checked (for example .sde connections and
+#      local disks) are probed without any check.
+#   4) The host of a data source that timed out is blacklisted for the rest
+#      of the run, so later layers on the same host fail immediately. Hosts
+#      are read from UNC paths, URLs, and mapped network drives (Windows).
+#   5) Reads that are expected to be slow on a healthy server, such as
+#      computing raster statistics, use Watchdog.run(), which skips
+#      blacklisted hosts but has no deadline, never blacklists a host, and
+#      does not count in the host's average latency.
+#
+# HISTORY
+#   DATE            REVISION
+#   ----------      -------------------------------------------------------
+#   2026-10-19      Created.
+# =========================================================================
+
+import os
+import re
+import socket
+import threading
+import time
+
+TIMEOUT = 30
+# Seconds after which a root that responded is checked again.
+RECHECK_SECONDS = 60
+STATUS_OK = "OK"
+STATUS_TIMEOUT = "TIMEOUT"
+STATUS_HOST_BLACKLISTED = "HOST_BLACKLISTED"
+
+UNC_PATH = re.compile(r"^[\\/]{2}(?P<host>[^\\/]+)")
+URL = re.compile(
+    r"^(?P<scheme>[a-z][a-z0-9+.-]*)://(?:[^@/]*@)?(?P<host>[^:/?#]+)(?::(?P<port>\d+))?",
+    re.IGNORECASE,
+)
+UNC_SHARE = re.compile(r"^[\\/]{2}[^\\/]+[\\/][^\\/]+")
+URL_PORTS = {"http": 80, "https": 443}
+DRIVE = re.compile(r"^(?P<drive>[a-z]:)", re.IGNORECASE)
+
+_drives = {}
+
+
+def _drive_host(drive):
+    """Find the server of a mapped network drive (Windows only).
+
+    Args:
+        drive (str): Drive letter and colon, for example "X:".
+
+    Returns:
+        str: Server name, or None for local or unmapped drives.
+    """
+    drive = drive.upper()
+    if drive not in _drives:
+        host = None
+        if os.name == "nt":
+            try:
+                import ctypes
+
+                buf = ctypes.create_unicode_buffer(1024)
+                size = ctypes.c_ulong(len(buf))
+                if (
+                    ctypes.windll.mpr.WNetGetConnectionW(drive, buf, ctypes.byref(size))
+                    == 0
+                ):
+                    match = UNC_PATH.match(buf.value)
+                    host = match.group("host") if match else None
+            except Exception:
+                host = None
+        _drives[drive] = host
+    return _drives[drive]
+
+
+def host_of(data_source):
+    """Find the server that holds a data source.
+
+    Args:
+        data_source (str): Layer data source, file path, or URL.
+
+    Returns:
+        str: Lower case host name, or None if the data source is local or
+            the host cannot be determined.
+    """
+    if not data_source:
+        return None
+    for pattern in (UNC_PATH, URL):
+        match = pattern.match(data_source)
+        if match:
+            return match.group("host").lower()
+    match = DRIVE.match(data_source)
+    if match:
+        host = _drive_host(match.group("drive"))
+        return host.lower() if host else None
+    return None
+
+
+def source_root(data_source):
+    """Find the root of a data source on a server, which is checked before
+    the data source is probed.
+
+    Args:
+        data_source (str): Layer data source, file path, or URL.
+
+    Returns:
+        tuple: ("url", (host, port)) for URLs or ("path", root) for UNC paths
+            and mapped drives, or None if the data source is local or has no
+            root that can be checked.
+    """
+    if not data_source:
+        return None
+    match = URL.match(data_source)
+    if match:
+        port = match.group("port")
+        if port is None:
+            port = URL_PORTS.get(match.group("scheme").lower())
+        if port is None:
+            return None
+        return "url", (match.group("host"), int(port))
+    match = UNC_SHARE.match(data_source)
+    if match:
+        return "path", match.group(0)
+    match = DRIVE.match(data_source)
+    if match and _drive_host(match.group("drive")):
+        return "path", match.group("drive") + os.sep
+    return None
+
+
+class SourceTimeout(Exception):
+    """Raised when a probe does not finish before its deadline, or when its
+    host has been blacklisted.
+
+    Args:
+        status (str): STATUS_TIMEOUT or STATUS_HOST_BLACKLISTED.
+        host (str): Host of the data source, if known.
+    """
+
+    def __init__(self, status, host=None):
+        Exception.__init__(self, "{} ({})".format(status, host or "local"))
+        self.status = status
+        self.host = host
+
+
+class Watchdog(object):
+    """Check that the server of each data source responds within a deadline
+    before probing it, and blacklist hosts that do not.
+
+    Args:
+        timeout (float, optional): Seconds to wait for the server of each
+            data source to respond. Defaults to TIMEOUT. A timeout of 0 or
+            None probes without checking the server.
+        limiter (HostLimiter, optional): Per-host limits that each probe
+            holds a slot of while it runs. Defaults to None (no per-host
+            limits).
+    """
+
+    def __init__(self, timeout=TIMEOUT, limiter=None):
+        self.timeout = timeout
+        self.limiter = limiter
+        self.blacklist = set()
+        self.timeouts = 0
+        # Time each root last responded to a check.
+        self._reachable = {}
+
+    def call(self, data_source, func, *args):
+        """Check the server of a data source under the deadline, then call a
+        probe function on the calling thread. The probe itself has no
+        deadline.
+
+        Args:
+            data_source (str): Data source the probe reads, used to find its
+                host.
+            func (callable): Probe function.
+            *args: Probe function arguments.
+
+        Raises:
+            SourceTimeout: The server did not respond in time, or its host
+                is blacklisted.
+
+        Returns:
+            The probe function's return value.
+        """
+        if not self.timeout:
+            return self._run(data_source, func, *args)
+        host = host_of(data_source)
+        if host is not None and host in self.blacklist:
+            raise SourceTimeout(STATUS_HOST_BLACKLISTED, host)
+        root = source_root(data_source)
+        now = time.time()
+        if root is not None and now - self._reachable.get(root, 0) > RECHECK_SECONDS:
+            if not self._check(root):
+                self._reachable.pop(root, None)
+                self.timeouts += 1
+                if host is not None:
+                    self.blacklist.add(host)
+                raise SourceTimeout(STATUS_TIMEOUT, host)
+            self._reachable[root] = now
+        return self._run(data_source, func, *args)
+
+    def _check(self, root):
+        """Check that a data source root responds within the deadline.
+
+        Args:
+            root (tuple): Root from source_root().
+
+        Returns:
+            bool: False if the root did not respond in time. A root that
+                responds with an error (for example a missing share) counts
+                as reachable, and the probe reports the error.
+        """
+        kind, target = root
+        if kind == "url":
+            try:
+                socket.create_connection(target, self.timeout).close()
+            except socket.timeout:
+                return False
+            except (socket.error, OSError):
+                pass
+            return True
+        thread = threading.Thread(target=os.path.exists, args=(target,))
+        thread.daemon = True
+        thread.start()
+        thread.join(self.timeout)
+        return not thread.is_alive()
+
+    def run(self, data_source, func, *args):
+        """Call a function without the deadline, holding a per-host slot.
+        Its time is not counted in the host's average latency, since it
+        depends on the size of the data read.
+
+        Args:
+            data_source (str): Data source the function reads, used to find
+                its host.
+            func (callable): Function.
+            *args: Function arguments.
+
+        Raises:
+            SourceTimeout: The host is blacklisted.
+
+        Returns:
+            The function's return value.
+        """
+        host = host_of(data_source)
+        if host is not None and host in self.blacklist:
+            raise SourceTimeout(STATUS_HOST_BLACKLISTED, host)
+        return self._run(data_source, func, *args, adapt=False)
+
+    def _run(self, data_source, func, *args, **kwargs):
+        if self.limiter is None:
+            return func(*args)
+        with self.limiter.slot(data_source, kwargs.get("adapt", True)):
+            return func(*args)
+
+    def summary(self):
+        """Summarize the probes that timed out.
+
+        Returns:
+            list: Lines of text, empty if no probe timed out.
+        """
+        if not self.timeouts:
+            return []
+        lines = ["Timed out probing {} data source(s)".format(self.timeouts)]
+        for host in sorted(self.blacklist):
+            lines.append("Blacklisted unreachable host: {}".format(host))
+        return lines
@@ -0,0 +1,99 @@
+import csv
+from datetime import datetime
+
+import pytest
+
+from csv_ingest import infer_schema, merge_schemas, parse_value
+
+
+def write_csv(path, header, rows):
+    with open(str(path), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(path)
+
+
+def types(schema):
+    return {field["name"]: field["type"] for field in schema}
+
+
+def test_mixed_columns_are_widened(tmp_path):
+    path = write_csv(
+        tmp_path / "mixed.csv",
+        ["small", "large", "number", "date", "dates", "label"],
+        [
+            ["1", "1", "1", "2024-01-31", "2024-01-31", "1"],
+            ["-2", "40000", "2.5", "2024-02-29", "02/29/2024", "A1"],
+            ["3", "", "1e3", "", "", "2024-01-31"],
+        ],
+    )
+    assert types(infer_schema(path)) == {
+        "small": "SHORT",
+        "large": "LONG",
+        "number": "DOUBLE",
+        "date": "DATE",
+        # Two date formats in one column are kept as text.
+        "dates": "TEXT",
+        "label": "TEXT",
+    }
+
+
+def test_leading_zeros_and_special_numbers_stay_text(tmp_path):
+    path = write_csv(
+        tmp_path / "codes.csv",
+        ["zip", "decimal", "missing", "huge", "empty"],
+        [["02134", "0.5", "nan", "9" * 12, ""], ["10001", "00.5", "inf", "1", ""]],
+    )
+    schema = infer_schema(path)
+    assert types(schema) == {
+        "zip": "TEXT",
+        "decimal": "TEXT",
+        "missing": "TEXT",
+        "huge": "DOUBLE",
+        "empty": "TEXT",
+    }
+    assert schema[0]["length"] == 5
+    assert [field["empty"] for field in schema] == [False] * 4 + [True]
+
+
+def test_sample_rows_limits_inference(tmp_path):
+    path = write_csv(tmp_path / "late.csv", ["value"], [["1"], ["2"], ["x"]])
+    assert types(infer_schema(path, sample_rows=2)) == {"value": "SHORT"}
+    assert types(infer_schema(path, sample_rows=None)) == {"value": "TEXT"}
+
+
+def test_merge_schemas(tmp_path):
+    first = infer_schema(
+        write_csv(tmp_path / "a.csv", ["id", "value", "note"], [["1", "2", ""]])
+    )
+    second = infer_schema(
+        write_csv(
+            tmp_path / "b.csv", ["id", "value", "note"], [["", "2.5", "2024-01-31"]]
+        )
+    )
+    merged = merge_schemas([first, second])
+    # An empty column in one file does not change the type from the other.
+    assert types(merged) == {"id": "SHORT", "value": "DOUBLE", "note": "DATE"}
+    assert merged[2]["format"] == "%Y-%m-%d"
+    assert [field["empty"] for field in merged] == [False, False, False]
+
+
+def test_parse_value():
+    assert parse_value("", {"type": "SHORT"}) is None
+    assert parse_value("12", {"type": "LONG"}) == 12
+    assert parse_value("12", {"type": "DOUBLE"}) == 12.0
+    assert parse_value("01/31/2024", {"type": "DATE", "format": None}) == datetime(
+        2024, 1, 31
+    )
+    assert parse_value("0123", {"type": "TEXT", "length": 4}) == "0123"
+    for value, field in (
+        ("2.5", {"type": "SHORT"}),
+        ("40000", {"type": "SHORT"}),
+        ("0123", {"type": "LONG"}),
+        ("nan", {"type": "DOUBLE"}),
+        ("31/01/2024", {"type": "DATE", "format": None}),
+        ("longer", {"type": "TEXT", "length": 4}),
+    ):
+        with pytest.raises(ValueError):
+            parse_value(value, field)
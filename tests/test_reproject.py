@@ -0,0 +1,106 @@
+import pytest
+
+# numpy ships with ArcGIS but may be missing elsewhere.
+np = pytest.importorskip("numpy")
+
+from reproject import (
+    compatible,
+    from_geographic,
+    to_geographic,
+    transform,
+)  # noqa: E402
+
+WGS84 = {"gcs": 4326, "a": 6378137.0, "f": 1 / 298.257223563}
+NAD83 = {"gcs": 4269, "a": 6378137.0, "f": 1 / 298.257222101}
+GEOGRAPHIC = dict(WGS84, type="GEOGRAPHIC")
+UTM_18N = dict(
+    WGS84,
+    type="Transverse_Mercator",
+    lon0=-75.0,
+    lat0=0.0,
+    k0=0.9996,
+    x0=500000.0,
+    y0=0.0,
+    unit=1.0,
+)
+# NAD83 / New York Long Island (ftUS), EPSG:2263.
+NY_LONG_ISLAND = dict(
+    NAD83,
+    type="Lambert_Conformal_Conic",
+    lon0=-74.0,
+    lat0=40 + 10 / 60,
+    lat1=41 + 2 / 60,
+    lat2=40 + 40 / 60,
+    k0=1.0,
+    x0=984250.0,
+    y0=0.0,
+    unit=1200 / 3937,
+)
+WEB_MERCATOR = dict(
+    WGS84,
+    gcs=4326,
+    type="Mercator_Auxiliary_Sphere",
+    lon0=0.0,
+    x0=0.0,
+    y0=0.0,
+    unit=1.0,
+)
+
+# Control points in longitude, latitude, x, y, computed with PROJ.
+CONTROL_POINTS = [
+    (UTM_18N, -75.0, 40.0, 500000.0, 4427757.2187),
+    (UTM_18N, -73.9857, 40.7484, 585628.4091, 4511322.4475),
+    (NY_LONG_ISLAND, -73.9857, 40.7484, 988212.2372, 211939.2786),
+    (WEB_MERCATOR, -73.9857, 40.7484, -8236050.4500, 4975301.2538),
+    (WEB_MERCATOR, 139.6917, 35.6895, 15550408.9120, 4257980.7322),
+    (WEB_MERCATOR, 180.0, 0.0, 20037508.3428, 0.0),
+]
+
+
+@pytest.mark.parametrize("params, lon, lat, x, y", CONTROL_POINTS)
+def test_control_points(params, lon, lat, x, y):
+    px, py = from_geographic(np.array([lon]), np.array([lat]), params)
+    assert px[0] == pytest.approx(x, abs=0.005)
+    assert py[0] == pytest.approx(y, abs=0.005)
+    plon, plat = to_geographic(np.array([x]), np.array([y]), params)
+    assert plon[0] == pytest.approx(lon, abs=1e-8)
+    assert plat[0] == pytest.approx(lat, abs=1e-8)
+
+
+@pytest.mark.parametrize("params", [UTM_18N, NY_LONG_ISLAND, WEB_MERCATOR])
+def test_round_trip(params):
+    # Points up to 3 degrees from the central meridian, and near the edges of
+    # the Long Island zone where the inverse iteration has the most to do.
+    lon = params["lon0"] + np.array([-3.0, -1.5, 0.0, 0.75, 3.0])
+    lat = np.array([39.0, 40.5, 41.25, 42.0, 45.0])
+    x, y = from_geographic(lon, lat, params)
+    plon, plat = to_geographic(x, y, params)
+    np.testing.assert_allclose(plon, lon, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(plat, lat, rtol=0, atol=1e-9)
+
+
+def test_origin_maps_to_false_origin():
+    x, y = from_geographic(
+        np.array([NY_LONG_ISLAND["lon0"]]),
+        np.array([NY_LONG_ISLAND["lat0"]]),
+        NY_LONG_ISLAND,
+    )
+    assert x[0] == pytest.approx(NY_LONG_ISLAND["x0"], abs=1e-6)
+    assert y[0] == pytest.approx(NY_LONG_ISLAND["y0"], abs=1e-6)
+
+
+def test_wgs84_and_nad83_are_compatible():
+    nad27 = dict(GEOGRAPHIC, gcs=4267)
+    assert compatible(GEOGRAPHIC, NY_LONG_ISLAND)
+    assert compatible(NY_LONG_ISLAND, UTM_18N)
+    assert not compatible(nad27, UTM_18N)
+    assert not compatible(None, UTM_18N)
+
+
+def test_transform_between_projections():
+    x, y = transform([988212.2372], [211939.2786], NY_LONG_ISLAND, UTM_18N)
+    assert x[0] == pytest.approx(585628.4091, abs=0.01)
+    assert y[0] == pytest.approx(4511322.4475, abs=0.01)
+    lon, lat = transform([585628.4091], [4511322.4475], UTM_18N, GEOGRAPHIC)
+    assert lon[0] == pytest.approx(-73.9857, abs=1e-8)
+    assert lat[0] == pytest.approx(40.7484, abs=1e-8)
@@ -0,0 +1,51 @@
+from scan_diff import value_text
+
+
+def test_list_values_compare_equal_across_formats():
+    # CSV and SQLite output write the Python list text, Parquet and Arrow
+    # output join the items with semicolons.
+    assert value_text("['Band_1', 'Band_2']") == "Band_1;Band_2"
+    assert value_text(["Band_1", "Band_2"]) == "Band_1;Band_2"
+    assert value_text("Band_1;Band_2") == "Band_1;Band_2"
+    assert value_text("[1.0, 2]") == value_text([1, 2.0]) == "1;2"
+
+
+def test_bracketed_text_is_kept():
+    assert value_text("[draft]") == "[draft]"
+    assert value_text("[") == "["
+
+
+def test_layers_with_the_same_identity_are_counted_apart(tmp_path):
+    import csv
+    import subprocess
+    import sys
+
+    import scan_diff
+
+    columns = ["filePath", "mapName", "layerName", "visible", "definitionQuery"]
+    old = [["p", "m", "Roads", "True", ""], ["p", "m", "Roads", "True", ""]]
+    # The first Roads layer was hidden, the second was given a query.
+    new = [["p", "m", "Roads", "False", ""], ["p", "m", "Roads", "True", "X = 1"]]
+    for name, rows in (("old.csv", old), ("new.csv", new)):
+        with open(str(tmp_path / name), "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows(rows)
+
+    changes = list(
+        scan_diff.diff(str(tmp_path / "old.csv"), str(tmp_path / "new.csv"))
+    )[1:]
+    assert [(c[1], c[2]) for c in changes] == [
+        (("p", "m", "Roads", 0), "visible"),
+        (("p", "m", "Roads", 1), "definitionQuery"),
+    ]
+
+    result = subprocess.run(
+        [sys.executable, scan_diff.__file__, str(tmp_path / "old.csv")]
+        + [str(tmp_path / "new.csv")],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert "changed,p,m,Roads,visible,True,False" in result.stdout.splitlines()
+    assert "changed: 2" in result.stderr.splitlines()
@@ -0,0 +1,107 @@
+from collections import ChainMap
+from types import MappingProxyType
+
+import pytest
+
+from scan_output import ROW_GROUP_ROWS, ColumnarWriter, write_columnar
+
+
+def shared_rows(count):
+    """Rows built the way aprx_metadata.flatten_dict() builds them: a layer
+    dict chained to read-only map and project attributes shared by every
+    row."""
+    project = MappingProxyType({"filePath": "C:\\GIS\\Project.aprx"})
+    map_desc = MappingProxyType({"mapName": "Map", "mapScale": 24000.0})
+    return [
+        ChainMap({"layerName": "Layer {}".format(i), "layerId": i}, map_desc, project)
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("output_format", ["PARQUET", "ARROW"])
+def test_columnar_spools_shared_rows(tmp_path, output_format):
+    pa = pytest.importorskip("pyarrow")
+    rows = shared_rows(25)
+    columns = ["filePath", "mapName", "mapScale", "layerName", "layerId"]
+    path = str(tmp_path / "inventory")
+    writer = ColumnarWriter(path, columns, output_format, batch_rows=10)
+    with writer:
+        for row in rows:
+            writer.write(row)
+
+    if output_format == "ARROW":
+        table = pa.ipc.open_file(path).read_all()
+    else:
+        import pyarrow.parquet
+
+        table = pyarrow.parquet.read_table(path)
+    assert table.num_rows == 25
+    assert table.column("layerId").to_pylist() == list(range(25))
+    assert table.column("mapName").to_pylist() == ["Map"] * 25
+    assert table.schema.field("mapScale").type == pa.float64()
+
+
+def test_write_columnar_more_than_a_row_group(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+
+    path = str(tmp_path / "inventory.parquet")
+    write_columnar(shared_rows(ROW_GROUP_ROWS + 1), ["layerName", "layerId"], path)
+    assert pyarrow.parquet.read_metadata(path).num_rows == ROW_GROUP_ROWS + 1
+
+
+def test_shared_rows_through_each_format(tmp_path):
+    # PARQUET and ARROW are covered by test_columnar_spools_shared_rows.
+    import csv
+    import sqlite3
+
+    from scan_output import (
+        TableKey,
+        GeoPackageWriter,
+        write_csv,
+        write_csv_tables,
+        write_sqlite,
+    )
+
+    rows = shared_rows(3)
+    columns = ["filePath", "mapName", "layerName", "layerId"]
+
+    path = write_csv(rows, columns, str(tmp_path / "Project.csv"))
+    with open(path, newline="") as f:
+        written = list(csv.reader(f))
+    assert written[0] == columns
+    assert written[1] == ["C:\\GIS\\Project.aprx", "Map", "Layer 0", "0"]
+
+    tables = {"layers": rows}
+    outputs = write_csv_tables(tables, str(tmp_path), "Project")
+    assert len(outputs) == 1
+    keys = [TableKey("layers", "layerId", [], None)]
+    db = write_sqlite(tables, keys, str(tmp_path / "inventory.sqlite"))
+    conn = sqlite3.connect(db)
+    assert conn.execute('SELECT COUNT(*), MAX("mapName") FROM layers').fetchone() == (
+        3,
+        "Map",
+    )
+    conn.close()
+
+    gpkg_path = str(tmp_path / "extents.gpkg")
+    with GeoPackageWriter(gpkg_path, lambda srs_id: ("", "")) as gpkg:
+        for row in rows:
+            assert gpkg.write(4326, (0.0, 0.0, 1.0, 1.0), row)
+
+
+def test_geopackage_keeps_undefined_systems_apart(tmp_path):
+    import sqlite3
+
+    from scan_output import GeoPackageWriter
+
+    path = str(tmp_path / "extents.gpkg")
+    with GeoPackageWriter(path, lambda srs_id: ("", "")) as gpkg:
+        for srs_id in (None, -1, 0):
+            assert gpkg.write(srs_id, (0.0, 0.0, 1.0, 1.0), {"layerName": "a"})
+    conn = sqlite3.connect(path)
+    contents = conn.execute(
+        "SELECT table_name, srs_id FROM gpkg_contents ORDER BY srs_id"
+    ).fetchall()
+    conn.close()
+    assert contents == [("layer_extents_srs_m1", -1), ("layer_extents_srs_0", 0)]
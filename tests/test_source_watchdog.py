@@ -0,0 +1,33 @@
+import source_watchdog
+from source_watchdog import STATUS_TIMEOUT, SourceTimeout, Watchdog
+
+
+def test_root_is_checked_again_after_recheck_seconds(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(source_watchdog.time, "time", lambda: clock[0])
+    watchdog = Watchdog(timeout=1)
+    checks = []
+    responding = [True]
+
+    def check(root):
+        checks.append(root)
+        return responding[0]
+
+    monkeypatch.setattr(watchdog, "_check", check)
+    source = r"\\nas01\gis\roads.shp"
+    assert watchdog.call(source, len, "abc") == 3
+    assert watchdog.call(source, len, "abc") == 3
+    assert len(checks) == 1
+
+    # The server stops responding during the run.
+    responding[0] = False
+    clock[0] += source_watchdog.RECHECK_SECONDS + 1
+    try:
+        watchdog.call(source, len, "abc")
+    except SourceTimeout as e:
+        assert e.status == STATUS_TIMEOUT
+        assert e.host == "nas01"
+    else:
+        raise AssertionError("the stalled server was not detected")
+    assert len(checks) == 2
+    assert "nas01" in watchdog.blacklist
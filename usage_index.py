@@ -0,0 +1,197 @@
+# PURPOSE
+#   Consolidated index of the data sources used by scanned APRX and MXD
+#   projects, for finding which projects depend on a dataset before it is
+#   moved.
+#
+# NOTES
+#   1) The command line also runs under ArcMap's Python 2.7.
+#   2) Each (project, map, layer, data source) row is stored once. When a
+#      project is scanned again, only the rows from that project are
+#      replaced.
+#   3) Data sources are matched on a normalized key (case and path
+#      separators), so the same dataset referenced from ArcMap and ArcGIS
+#      Pro is counted once.
+#   4) The index can also be queried from the command line:
+#           python usage_index.py <index> --uses <data source>
+#           python usage_index.py <index> --shared [--min-projects N]
+#
+# HISTORY
+#   DATE            REVISION
+#   ----------      -------------------------------------------------------
+#   2026-10-19      Created.
+# =========================================================================
+
+import argparse
+import datetime
+import sqlite3
+
+
+def source_key(data_source):
+    """Normalize a data source for matching.
+
+    Args:
+        data_source (str): Layer data source.
+
+    Returns:
+        str: Lower case data source with backslash separators, or an empty
+            string if there is no data source.
+    """
+    if not data_source:
+        return ""
+    if "://" in data_source:
+        return data_source.lower()
+    return data_source.replace("/", "\\").rstrip("\\").lower()
+
+
+class UsageIndex(object):
+    """SQLite index of the data sources used by each scanned project.
+
+    Args:
+        path (str): SQLite database path. Created if it does not exist.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS projects (
+                project_id INTEGER PRIMARY KEY,
+                path TEXT NOT NULL UNIQUE,
+                scanned TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS usage (
+                project_id INTEGER NOT NULL REFERENCES projects (project_id),
+                map TEXT NOT NULL,
+                layer TEXT NOT NULL,
+                data_source TEXT NOT NULL,
+                source_key TEXT NOT NULL,
+                PRIMARY KEY (project_id, map, layer, source_key)
+            );
+            CREATE INDEX IF NOT EXISTS usage_source ON usage (source_key);
+            """)
+
+    def close(self):
+        self.conn.close()
+
+    def replace_project(self, project, rows):
+        """Replace the usage rows of one project.
+
+        Args:
+            project (str): Project (APRX or MXD) path.
+            rows (iterable): (map, layer, data source) tuples. Rows without a
+                data source are skipped and duplicates are stored once.
+
+        Returns:
+            int: Number of rows stored.
+        """
+        usage = {}
+        for map_name, layer, data_source in rows:
+            key = source_key(data_source)
+            if key:
+                usage[(map_name or "", layer or "", key)] = data_source
+        scanned = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO projects (path, scanned) VALUES (?, ?)",
+                (project, scanned),
+            )
+            self.conn.execute(
+                "UPDATE projects SET scanned = ? WHERE path = ?", (scanned, project)
+            )
+            project_id = self.conn.execute(
+                "SELECT project_id FROM projects WHERE path = ?", (project,)
+            ).fetchone()[0]
+            self.conn.execute("DELETE FROM usage WHERE project_id = ?", (project_id,))
+            self.conn.executemany(
+                "INSERT INTO usage (project_id, map, layer, data_source, source_key) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (project_id, map_name, layer, data_source, key)
+                    for (map_name, layer, key), data_source in usage.items()
+                ],
+            )
+        return len(usage)
+
+    def users(self, data_source):
+        """Find the projects, maps, and layers that use a data source.
+
+        Args:
+            data_source (str): Data source path.
+
+        Returns:
+            list: (project, map, layer) tuples.
+        """
+        return self.conn.execute(
+            "SELECT p.path, u.map, u.layer FROM usage u "
+            "JOIN projects p ON p.project_id = u.project_id "
+            "WHERE u.source_key = ? ORDER BY p.path, u.map, u.layer",
+            (source_key(data_source),),
+        ).fetchall()
+
+    def shared(self, min_projects=2):
+        """Count the projects that use each data source.
+
+        Args:
+            min_projects (int, optional): Only return data sources used by at
+                least this many projects. Defaults to 2.
+
+        Returns:
+            list: (data source, project count, layer count) tuples, most
+                shared first.
+        """
+        return self.conn.execute(
+            "SELECT MIN(data_source), COUNT(DISTINCT project_id), COUNT(*) "
+            "FROM usage GROUP BY source_key "
+            "HAVING COUNT(DISTINCT project_id) >= ? "
+            "ORDER BY 2 DESC, 1",
+            (min_projects,),
+        ).fetchall()
+
+
+def record_usage(index_path, project, rows):
+    """Replace a project's rows in a usage index.
+
+    Args:
+        index_path (str): SQLite database path. Nothing is recorded if empty.
+        project (str): Project (APRX or MXD) path.
+        rows (iterable): (map, layer, data source) tuples.
+
+    Returns:
+        int: Number of rows stored.
+    """
+    if not index_path:
+        return 0
+    index = UsageIndex(index_path)
+    try:
+        return index.replace_project(project, rows)
+    finally:
+        index.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Query the data source usage index built by the scanners."
+    )
+    parser.add_argument("index", help="Usage index database path.")
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument("--uses", metavar="SOURCE", help="List users of a dataset.")
+    query.add_argument(
+        "--shared", action="store_true", help="Count projects per dataset."
+    )
+    parser.add_argument("--min-projects", type=int, default=2)
+    args = parser.parse_args()
+
+    index = UsageIndex(args.index)
+    try:
+        if args.uses:
+            for project, map_name, layer in index.users(args.uses):
+                print("{}\t{}\t{}".format(project, map_name, layer))
+        else:
+            for data_source, projects, layers in index.shared(args.min_projects):
+                print("{}\t{}\t{}".format(projects, layers, data_source))
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()